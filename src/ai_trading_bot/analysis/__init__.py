@@ -2,10 +2,15 @@ from .sentiment import SentimentAnalyzer
 from .market import MarketAnalyzer
 from .decision import DecisionEngine
 from .manipulation_detector import ManipulationDetector
+from .snapshot import MarketSnapshot
+from .ohlcv import OHLCVBuffer, OHLCVStore
 
 __all__ = [
     'SentimentAnalyzer',
     'MarketAnalyzer',
     'DecisionEngine',
-    'ManipulationDetector'
+    'ManipulationDetector',
+    'MarketSnapshot',
+    'OHLCVBuffer',
+    'OHLCVStore'
 ]
\ No newline at end of file
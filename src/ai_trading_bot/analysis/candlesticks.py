@@ -0,0 +1,141 @@
+from collections import deque
+from typing import Dict, Any, List, Callable, Optional, Union
+import numpy as np
+from .history import overlap_end
+
+
+class OHLC:
+    """Columnar candles: one float array per field, aligned by index."""
+
+    FIELDS = ('open', 'high', 'low', 'close')
+
+    def __init__(self, open: np.ndarray, high: np.ndarray, low: np.ndarray, close: np.ndarray):
+        self.open = np.asarray(open, dtype=float)
+        self.high = np.asarray(high, dtype=float)
+        self.low = np.asarray(low, dtype=float)
+        self.close = np.asarray(close, dtype=float)
+
+    @classmethod
+    def from_candles(
+        cls,
+        candles: Union[List[Dict[str, Any]], Dict[str, Any], 'OHLC']
+    ) -> 'OHLC':
+        # Accepts a list of per-candle dicts or a dict of columns
+        if isinstance(candles, OHLC):
+            return candles
+        if isinstance(candles, dict):
+            return cls(*(candles[field] for field in cls.FIELDS))
+
+        count = len(candles)
+        return cls(*(
+            np.fromiter((candle[field] for candle in candles), dtype=float, count=count)
+            for field in cls.FIELDS
+        ))
+
+    def __len__(self) -> int:
+        return len(self.close)
+
+    def tail(self, n: int) -> 'OHLC':
+        return OHLC(self.open[-n:], self.high[-n:], self.low[-n:], self.close[-n:])
+
+
+def doji_mask(ohlc: OHLC) -> np.ndarray:
+    return np.abs(ohlc.open - ohlc.close) < (ohlc.high - ohlc.low) * 0.1
+
+def hammer_mask(ohlc: OHLC) -> np.ndarray:
+    body = np.abs(ohlc.open - ohlc.close)
+    lower_shadow = np.minimum(ohlc.open, ohlc.close) - ohlc.low
+    upper_shadow = ohlc.high - np.maximum(ohlc.open, ohlc.close)
+    return (lower_shadow > body * 2) & (upper_shadow < body * 0.5)
+
+def bullish_engulfing_mask(ohlc: OHLC) -> np.ndarray:
+    # Flag at index t means candle t engulfs candle t - 1
+    mask = np.zeros(len(ohlc), dtype=bool)
+    if len(ohlc) < 2:
+        return mask
+
+    prev_open, prev_close = ohlc.open[:-1], ohlc.close[:-1]
+    curr_open, curr_close = ohlc.open[1:], ohlc.close[1:]
+    mask[1:] = (
+        (prev_close < prev_open) &    # Previous red
+        (curr_close > curr_open) &    # Current green
+        (curr_open < prev_close) &    # Current opens below prev close
+        (curr_close > prev_open)      # Current closes above prev open
+    )
+    return mask
+
+CANDLESTICK_RULES: Dict[str, Callable[[OHLC], np.ndarray]] = {
+    'doji': doji_mask,
+    'hammer': hammer_mask,
+    'bullish_engulfing': bullish_engulfing_mask
+}
+
+def scan_candlesticks(candles: Any) -> Dict[str, np.ndarray]:
+    ohlc = OHLC.from_candles(candles)
+    return {name: rule(ohlc) for name, rule in CANDLESTICK_RULES.items()}
+
+
+class CandlestickScanner:
+    """Bounded streaming scanner that keeps flags for the last `maxlen` candles.
+
+    Each new candle is evaluated together with its predecessor using the
+    same rules as scan_candlesticks, so the flags always equal the tail of
+    a full-history scan. Like HistoryCursor, `update` finds where the
+    candles it already scanned end in a grown or slid list by matching the
+    last OVERLAP of them, not just the newest one, so repeated identical
+    candles (flat or illiquid bars) don't misalign it. Candles are compared
+    as whole dicts, so bars that carry a timestamp never match another bar.
+    """
+
+    OVERLAP = 16
+
+    def __init__(self, maxlen: int = 5):
+        self.maxlen = maxlen
+        self.reset()
+
+    def reset(self) -> None:
+        self.count = 0
+        self.tail: deque = deque(maxlen=self.OVERLAP)
+        self.flags: Dict[str, deque] = {
+            name: deque(maxlen=self.maxlen) for name in CANDLESTICK_RULES
+        }
+
+    @property
+    def last_candle(self) -> Optional[Dict[str, Any]]:
+        return self.tail[-1] if self.tail else None
+
+    def push(self, candle: Dict[str, Any]) -> Dict[str, bool]:
+        pair = [self.last_candle, candle] if self.tail else [candle]
+        latest = {
+            name: bool(mask[-1])
+            for name, mask in scan_candlesticks(pair).items()
+        }
+
+        for name, flag in latest.items():
+            self.flags[name].append(flag)
+        self.tail.append(candle)
+        self.count += 1
+        return latest
+
+    def update(self, candles: List[Dict[str, Any]]) -> Dict[str, np.ndarray]:
+        # Start over if the candle list was replaced rather than extended
+        start = overlap_end(candles, self.tail, self.count)
+        if start is None:
+            self.reset()
+            start = 0
+
+        # Candles older than the window can't affect the retained flags
+        skip = len(candles) - self.maxlen - 1
+        if skip > start:
+            self.reset()
+            start = skip
+            self.tail.append(candles[start - 1])
+
+        for candle in candles[start:]:
+            self.push(candle)
+        self.count = len(candles)
+
+        return self.recent()
+
+    def recent(self) -> Dict[str, np.ndarray]:
+        return {name: np.array(flags, dtype=bool) for name, flags in self.flags.items()}
@@ -0,0 +1,121 @@
+from collections import deque
+from typing import Optional
+import numpy as np
+
+
+def correlation_matrix(series: np.ndarray) -> np.ndarray:
+    """Pearson correlation of every pair of rows in an (assets x time) array.
+
+    Each row is centred and normalised once, then all pairs come from a
+    single matrix product instead of one corrcoef call per pair.
+    """
+    values = np.atleast_2d(np.asarray(series, dtype=float))
+    centred = values - values.mean(axis=1, keepdims=True)
+    norms = np.sqrt(np.einsum('ij,ij->i', centred, centred))
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        normalised = centred / norms[:, None]
+    return np.clip(normalised @ normalised.T, -1.0, 1.0)
+
+def mean_abs_correlation(matrix: np.ndarray) -> float:
+    # Mean absolute correlation over distinct pairs (upper triangle)
+    upper = np.triu_indices(matrix.shape[0], k=1)
+    if not len(upper[0]):
+        return 0.0
+    return float(np.mean(np.abs(matrix[upper])))
+
+
+class RollingCorrelation:
+    """Correlation matrix maintained from running sums of return rows.
+
+    Each new row of returns (one value per asset) updates the sums and the
+    cross-product matrix in O(assets^2). With a window, the row that falls
+    out of the window is subtracted again, and once per window turnover
+    the sums are rebuilt from the held rows so rounding error cannot build
+    up. Rows are summed as deviations from a reference row (the window
+    mean at the last rebuild), which keeps the variance of a near-constant
+    series from cancelling to zero or below.
+    """
+
+    def __init__(self, n_assets: int, window: Optional[int] = None):
+        self.n_assets = n_assets
+        self.window = window
+        self.reset()
+
+    def reset(self) -> None:
+        self.count = 0
+        self.evicted = 0
+        self.shift = np.zeros(self.n_assets)
+        self.sums = np.zeros(self.n_assets)
+        self.products = np.zeros((self.n_assets, self.n_assets))
+        self.rows: Optional[deque] = deque(maxlen=self.window) if self.window else None
+
+    def update(self, row: np.ndarray) -> None:
+        row = np.asarray(row, dtype=float)
+        if not self.count:
+            self.shift = row.copy()
+
+        if self.rows is not None:
+            if len(self.rows) == self.window:
+                old = self.rows[0] - self.shift
+                self.sums -= old
+                self.products -= np.outer(old, old)
+                self.count -= 1
+                self.evicted += 1
+            self.rows.append(row)
+
+        centred = row - self.shift
+        self.sums += centred
+        self.products += np.outer(centred, centred)
+        self.count += 1
+
+        if self.rows is not None and self.evicted >= self.window:
+            self._rebuild()
+
+    def extend(self, rows: np.ndarray) -> None:
+        rows = np.asarray(rows, dtype=float).reshape(-1, self.n_assets)
+        if self.rows is not None:
+            if len(rows) >= self.window:
+                # Everything currently held falls out of the window
+                self.reset()
+                self.rows.extend(rows[-self.window:])
+                self._rebuild()
+            else:
+                for row in rows:
+                    self.update(row)
+            return
+
+        if not len(rows):
+            return
+        if not self.count:
+            self.shift = rows.mean(axis=0)
+        centred = rows - self.shift
+        self.sums += centred.sum(axis=0)
+        self.products += centred.T @ centred
+        self.count += len(rows)
+
+    def _rebuild(self) -> None:
+        rows = np.array(self.rows, dtype=float).reshape(-1, self.n_assets)
+        self.shift = rows.mean(axis=0) if len(rows) else np.zeros(self.n_assets)
+        centred = rows - self.shift
+        self.sums = centred.sum(axis=0)
+        self.products = centred.T @ centred
+        self.count = len(rows)
+        self.evicted = 0
+
+    def covariance(self) -> np.ndarray:
+        if not self.count:
+            return np.zeros((self.n_assets, self.n_assets))
+        mean = self.sums / self.count
+        return self.products / self.count - np.outer(mean, mean)
+
+    def matrix(self) -> np.ndarray:
+        covariance = self.covariance()
+        std = np.sqrt(np.maximum(np.diag(covariance), 0.0))
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            correlation = covariance / np.outer(std, std)
+        return np.clip(correlation, -1.0, 1.0)
+
+    def mean_abs_correlation(self) -> float:
+        return mean_abs_correlation(self.matrix())
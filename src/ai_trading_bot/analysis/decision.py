@@ -1,17 +1,43 @@
 import logging
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Sequence, Tuple
 from datetime import datetime
+import numpy as np
+from .snapshot import MarketSnapshot, window_matrix
+
+# Feature columns of the batch scoring matrix, in decision_weights order
+FEATURES = ('market_score', 'sentiment_score', 'manipulation_score', 'learned_patterns')
+# Manipulation risk lowers the score; every other feature raises it
+FEATURE_SIGNS = np.array([1.0, 1.0, -1.0, 1.0])
+
 
 class DecisionEngine:
+    """Combines market, sentiment, manipulation and pattern scores into trades.
+
+    make_decisions scores one market per call. make_batch_decisions scores
+    many assets at once: the learner runs once for the whole cycle, so the
+    last trading results are learned from once rather than once per asset,
+    and each asset is scored on its own new patterns and adaptations. The
+    market, sentiment and manipulation features are built as an
+    (assets x features) matrix with one vectorized pass per feature and
+    scored with a single product against the signed decision weights, and
+    a decision is emitted for every asset whose score crosses
+    `buy_threshold` or falls below `sell_threshold`.
+    """
+
+    MARKET_WINDOW = 20
+
     def __init__(self, adaptive_learner):
         self.logger = logging.getLogger('ai_trading_bot.analysis.decision')
         self.adaptive_learner = adaptive_learner
+        self.last_trading_results: Dict[str, Any] = {}
         self.decision_weights = {
             'market_score': 0.3,
             'sentiment_score': 0.2,
             'manipulation_score': 0.2,
             'learned_patterns': 0.3
         }
+        self.buy_threshold = 0.7
+        self.sell_threshold = 0.3
 
     async def make_decisions(
         self,
@@ -58,6 +84,133 @@ class DecisionEngine:
             self.logger.error(f"Decision making failed: {e}")
             return []
 
+    async def make_batch_decisions(
+        self,
+        market_data: Dict[str, Dict[str, Any]],
+        sentiment_data: Optional[Dict[str, Dict[str, Any]]] = None,
+        manipulation_data: Optional[Dict[str, Dict[str, Any]]] = None
+    ) -> List[Dict[str, Any]]:
+        # All three mappings are keyed by asset; assets missing from the
+        # sentiment or manipulation data score as neutral / no risk
+        try:
+            sentiment_data = sentiment_data or {}
+            manipulation_data = manipulation_data or {}
+            pattern_scores, adaptations = await self._learn_batch(
+                market_data,
+                manipulation_data
+            )
+
+            assets, features = self._feature_matrix(
+                market_data,
+                sentiment_data,
+                manipulation_data,
+                pattern_scores
+            )
+            weights = np.array([self.decision_weights[name] for name in FEATURES])
+            scores = features @ (weights * FEATURE_SIGNS)
+
+            return self._batch_trade_decisions(market_data, assets, scores, adaptations)
+
+        except Exception as e:
+            self.logger.error(f"Batch decision making failed: {e}")
+            return []
+
+    async def _learn_batch(
+        self,
+        market_data: Dict[str, Dict[str, Any]],
+        manipulation_data: Dict[str, Dict[str, Any]]
+    ) -> Tuple[np.ndarray, List[List[Dict[str, Any]]]]:
+        # One learner run for every asset: per asset, in market_data order,
+        # its new-pattern score and its adaptations
+        assets = list(market_data)
+        if self.adaptive_learner is None:
+            return np.zeros(len(assets)), [[] for _ in assets]
+
+        learning_results = await self.adaptive_learner.analyze_and_adapt_many(
+            market_data,
+            self.last_trading_results,
+            manipulation_data
+        )
+        self._adjust_weights(learning_results['effectiveness'])
+
+        pattern_scores = np.fromiter(
+            (self._evaluate_patterns(learning_results['new_patterns'][asset]) for asset in assets),
+            dtype=float,
+            count=len(assets)
+        )
+        adaptations = [learning_results['adaptations'][asset] for asset in assets]
+        return pattern_scores, adaptations
+
+    def _feature_matrix(
+        self,
+        market_data: Dict[str, Dict[str, Any]],
+        sentiment_data: Dict[str, Dict[str, Any]],
+        manipulation_data: Dict[str, Dict[str, Any]],
+        pattern_scores: Optional[Sequence[float]] = None
+    ) -> Tuple[List[str], np.ndarray]:
+        assets = list(market_data)
+        snapshots = [MarketSnapshot.of(market_data[asset]) for asset in assets]
+
+        features = np.empty((len(assets), len(FEATURES)))
+        features[:, 0] = self._market_scores(snapshots)
+        features[:, 1] = self._sentiment_scores(
+            [sentiment_data.get(asset, {}) for asset in assets]
+        )
+        features[:, 2] = np.fromiter(
+            (manipulation_data.get(asset, {}).get('manipulation_score', 0.0) for asset in assets),
+            dtype=float,
+            count=len(assets)
+        )
+        features[:, 3] = 0.0 if pattern_scores is None else pattern_scores
+        return assets, features
+
+    def _market_scores(self, snapshots: Sequence[MarketSnapshot]) -> np.ndarray:
+        # Mean over volatility of recent returns, squashed into [0, 1];
+        # 0.5 when there is too little history or no movement
+        prices = window_matrix([s.prices for s in snapshots], self.MARKET_WINDOW + 1)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            returns = np.diff(prices, axis=1) / prices[:, :-1]
+            counts = np.sum(~np.isnan(returns), axis=1)
+            mean = np.nansum(returns, axis=1) / counts
+            std = np.sqrt(np.nansum((returns - mean[:, None]) ** 2, axis=1) / counts)
+            signal = np.where((counts >= 2) & (std > 0), mean / std, 0.0)
+        return 0.5 * (1 + np.tanh(np.nan_to_num(signal)))
+
+    def _sentiment_scores(self, sentiments: Sequence[Dict[str, Any]]) -> np.ndarray:
+        # Overall sentiment in [-1, 1] mapped to [0, 1]
+        overall = np.fromiter(
+            (sentiment.get('overall', 0.0) for sentiment in sentiments),
+            dtype=float,
+            count=len(sentiments)
+        )
+        return np.clip((overall + 1) / 2, 0.0, 1.0)
+
+    def _batch_trade_decisions(
+        self,
+        market_data: Dict[str, Dict[str, Any]],
+        assets: List[str],
+        scores: np.ndarray,
+        adaptations: List[List[Dict[str, Any]]]
+    ) -> List[Dict[str, Any]]:
+        selected = np.flatnonzero((scores > self.buy_threshold) | (scores < self.sell_threshold))
+
+        return [
+            {
+                'asset': assets[i],
+                **self._create_trade_decision(market_data[assets[i]], float(scores[i]), adaptations[i])
+            }
+            for i in selected
+        ]
+
+    def _evaluate_market(self, market_data: Dict[str, Any]) -> float:
+        return float(self._market_scores([MarketSnapshot.of(market_data)])[0])
+
+    def _evaluate_sentiment(self, sentiment_data: Dict[str, Any]) -> float:
+        return float(self._sentiment_scores([sentiment_data])[0])
+
+    def _should_trade(self, score: float) -> bool:
+        return score > self.buy_threshold or score < self.sell_threshold
+
     def _adjust_weights(self, strategy_effectiveness: Dict[str, float]) -> None:
         # Dynamically adjust decision weights based on strategy performance
         total_effectiveness = sum(strategy_effectiveness.values())
@@ -113,7 +266,7 @@ class DecisionEngine:
     ) -> Dict[str, Any]:
         decision = {
             'timestamp': datetime.now().isoformat(),
-            'action': 'buy' if score > 0.7 else 'sell',
+            'action': 'buy' if score > self.buy_threshold else 'sell',
             'confidence': score,
             'adaptations_applied': [
                 adaptation['pattern_id']
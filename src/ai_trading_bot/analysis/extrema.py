@@ -0,0 +1,175 @@
+from collections import deque
+from typing import List, Optional, Sequence, Tuple
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from .history import HistoryCursor
+
+
+class SlidingExtrema:
+    """Local minima or maxima over a centred window, found with a monotonic deque.
+
+    A price at index i is an extremum when it equals the min (or max) of
+    prices[i - window_size:i + window_size + 1]. Each price is pushed and
+    popped at most once, so a series of n prices costs O(n) regardless of
+    the window width. Calling `update` again with a longer (or slid) copy
+    of the same series only processes the new tail, located by a
+    HistoryCursor; long tails (a first call on a full history) are scanned
+    with a strided NumPy window instead.
+    """
+
+    BULK_THRESHOLD = 256
+
+    def __init__(self, window_size: int = 10, mode: str = 'min', max_levels: int = 3):
+        if mode not in ('min', 'max'):
+            raise ValueError(f"Unknown extremum mode: {mode}")
+
+        self.window_size = window_size
+        self.mode = mode
+        self.max_levels = max_levels
+        self.cursor = HistoryCursor()
+        self.reset()
+
+    def reset(self, start: int = 0) -> None:
+        self.count = start
+        self.window: deque = deque(maxlen=2 * self.window_size + 1)
+        self.candidates: deque = deque()
+        self.levels: deque = deque(maxlen=self.max_levels)
+        self.positions: deque = deque(maxlen=self.max_levels)
+
+    def update(self, prices: Sequence[float], total: Optional[int] = None) -> List[float]:
+        # `total` is the number of prices ever appended when `prices` is only
+        # the most recent window of a longer series (e.g. an OHLCVBuffer)
+        fresh, continued = self.cursor.advance(prices, total)
+
+        # Start over if the series was replaced rather than extended
+        if not continued:
+            self.reset(0 if total is None else total - len(prices))
+
+        self.extend(fresh)
+        return list(self.levels)
+
+    def extend(self, values: Sequence[float]) -> None:
+        if len(values) > self.BULK_THRESHOLD:
+            self._extend_bulk(values)
+        else:
+            for price in values:
+                self.push(price)
+
+    def _extend_bulk(self, new_values: Sequence[float]) -> None:
+        span = 2 * self.window_size
+
+        # Prepend the retained tail so windows can straddle the boundary
+        history = list(self.window)[-span:] if span else []
+        values = np.concatenate([np.asarray(history, dtype=float), np.asarray(new_values, dtype=float)])
+        base = self.count - len(history)
+
+        # Every full window here ends on a new value, so each centre is tested once
+        if len(values) > span:
+            windows = sliding_window_view(values, span + 1)
+            extremes = windows.min(axis=1) if self.mode == 'min' else windows.max(axis=1)
+            centres = values[self.window_size:len(values) - self.window_size]
+            hits = np.flatnonzero(centres == extremes)[-self.max_levels:]
+
+            for hit in hits:
+                self.levels.append(values[self.window_size + int(hit)])
+                self.positions.append(base + self.window_size + int(hit))
+
+        # Replay the last window so the deques continue from the new end
+        replay = values[-(span + 1):]
+        self.window.clear()
+        self.candidates.clear()
+        self.count = base + len(values) - len(replay)
+        for price in replay:
+            self.push(price, detect=False)
+
+    def push(self, price: float, detect: bool = True) -> None:
+        index = self.count
+        span = 2 * self.window_size
+
+        # Drop candidates that can never be the window extremum again
+        if self.mode == 'min':
+            while self.candidates and self.candidates[-1][1] > price:
+                self.candidates.pop()
+        else:
+            while self.candidates and self.candidates[-1][1] < price:
+                self.candidates.pop()
+        self.candidates.append((index, price))
+
+        if self.candidates[0][0] < index - span:
+            self.candidates.popleft()
+
+        self.window.append(price)
+        self.count += 1
+
+        # Once the window around the centre is complete, test the centre
+        if detect and len(self.window) == self.window.maxlen:
+            centre = self.window[self.window_size]
+            if centre == self.candidates[0][1]:
+                self.levels.append(centre)
+                self.positions.append(index - self.window_size)
+
+
+class PeakTroughIndex:
+    """Strict three-point peaks and troughs of a series, built in one pass.
+
+    Positions are kept in time order and, separately, sorted by price so
+    that "other extrema within x% of this one" is a binary search instead
+    of a scan over every later index.
+    """
+
+    def __init__(self, prices: Sequence[float]):
+        values = np.asarray(prices, dtype=float)
+        self.prices = values
+        self.is_peak = np.zeros(len(values), dtype=bool)
+        self.is_trough = np.zeros(len(values), dtype=bool)
+
+        if len(values) >= 3:
+            inner = values[1:-1]
+            self.is_peak[1:-1] = (inner > values[:-2]) & (inner > values[2:])
+            self.is_trough[1:-1] = (inner < values[:-2]) & (inner < values[2:])
+
+        self.peaks = np.flatnonzero(self.is_peak)
+        self.troughs = np.flatnonzero(self.is_trough)
+
+    def matching_pairs(
+        self,
+        kind: str,
+        min_distance: int,
+        tolerance: float
+    ) -> List[Tuple[int, int]]:
+        # Pairs (i, j) of the same kind with j >= i + min_distance and
+        # |p[i] - p[j]| < p[i] * tolerance, ordered by i then j
+        positions = self.peaks if kind == 'peak' else self.troughs
+        n = len(self.prices)
+        starts = positions[(positions >= min_distance) & (positions < n - min_distance)]
+        if not len(starts):
+            return []
+
+        order = np.argsort(self.prices[positions], kind='stable')
+        by_price = positions[order]
+        sorted_prices = self.prices[by_price]
+
+        # Widen the search slightly and re-check exactly, so rounding in
+        # p +/- tol never changes which pairs match
+        levels = self.prices[starts]
+        margins = np.abs(levels) * tolerance
+        lows = np.searchsorted(sorted_prices, levels - margins * 1.001, side='left')
+        highs = np.searchsorted(sorted_prices, levels + margins * 1.001, side='right')
+
+        pairs = []
+        for i, price, margin, lo, hi in zip(starts, levels, levels * tolerance, lows, highs):
+            candidates = by_price[lo:hi]
+            candidates = candidates[candidates >= i + min_distance]
+            matched = candidates[np.abs(price - self.prices[candidates]) < margin]
+            pairs.extend((int(i), int(j)) for j in np.sort(matched))
+
+        return pairs
+
+    def peak_triples(self, spacing: int) -> np.ndarray:
+        # Start positions i where i, i + spacing and i + 2 * spacing are all peaks
+        n = len(self.prices)
+        if n <= 2 * spacing:
+            return np.array([], dtype=int)
+
+        starts = self.peaks[(self.peaks >= spacing) & (self.peaks < n - 2 * spacing)]
+        return starts[self.is_peak[starts + spacing] & self.is_peak[starts + 2 * spacing]]
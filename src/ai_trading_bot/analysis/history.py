@@ -0,0 +1,96 @@
+from collections import deque
+from typing import Any, Optional, Sequence, Tuple
+import numpy as np
+
+
+def overlap_end(items: Sequence[Any], tail: Sequence[Any], limit: int) -> Optional[int]:
+    """Where `tail` ends in `items`, for histories of arbitrary records.
+
+    Returns the largest end <= limit at which items[:end] ends with the
+    records of `tail` (all of them, or the last `end` when the list slid
+    further than that), i.e. plain growth first and then the smallest
+    slide; None when no end matches. Records are compared with ==, so this
+    is the list counterpart of HistoryCursor's search over price arrays.
+    """
+    tail = list(tail)
+    if not tail:
+        return 0
+    for end in range(min(limit, len(items)), 0, -1):
+        size = min(end, len(tail))
+        if items[end - 1] == tail[-1] and list(items[end - size:end]) == tail[-size:]:
+            return end
+    return None
+
+
+class HistoryCursor:
+    """How far a consumer has read into a price history it follows across calls.
+
+    When `total` (prices ever appended, e.g. OHLCVBuffer.total or a
+    'price_total' sent with the market data) is given, unread values are
+    found by position. For a plain list without one, the last OVERLAP
+    values read are looked up in the new list, so a bounded list that
+    dropped its oldest values is followed by its shift rather than read
+    again from the start. In both cases the overlap has to match exactly,
+    otherwise the history is treated as replaced.
+
+    Without a total, a shift is ambiguous when the last OVERLAP values
+    repeat at an earlier position (e.g. a flat run of ticks); the smallest
+    matching shift is taken. Callers that slide a list over flat markets
+    should send 'price_total'.
+    """
+
+    OVERLAP = 16
+
+    def __init__(self):
+        self.count = 0
+        self.tail: deque = deque(maxlen=self.OVERLAP)
+
+    def advance(
+        self,
+        values: Sequence[float],
+        total: Optional[int] = None
+    ) -> Tuple[np.ndarray, bool]:
+        # Values not read yet, and whether they continue what was read
+        # before. If not, all of `values` is returned and the caller should
+        # start over from them
+        values = np.asarray(values, dtype=float)
+        start = self._continuation(values, total)
+        continued = start is not None
+        if not continued:
+            start = 0
+            self.tail.clear()
+
+        fresh = values[start:]
+        self.tail.extend(fresh[-self.OVERLAP:])
+        self.count = len(values) if total is None else total
+        return fresh, continued
+
+    def _continuation(self, values: np.ndarray, total: Optional[int]) -> Optional[int]:
+        # Index in `values` of the first unread value, or None
+        if not self.count:
+            return 0
+
+        tail = np.fromiter(self.tail, dtype=float, count=len(self.tail))
+
+        if total is not None:
+            start = self.count - (total - len(values))
+            if start < 0 or start > len(values):
+                return None
+            overlap = min(len(tail), start)
+            if not overlap or not np.array_equal(values[start - overlap:start], tail[-overlap:]):
+                return None
+            return start
+
+        if len(values) < len(tail):
+            return None
+
+        # Plain growth first, then the smallest shift whose overlap matches
+        limit = min(self.count, len(values))
+        if np.array_equal(values[limit - len(tail):limit], tail):
+            return limit
+
+        ends = np.flatnonzero(values[len(tail) - 1:limit - 1] == tail[-1]) + len(tail)
+        for end in ends[::-1]:
+            if np.array_equal(values[end - len(tail):end], tail):
+                return int(end)
+        return None
@@ -0,0 +1,400 @@
+import math
+from collections import deque
+from typing import Dict, Any, Optional, Sequence, Tuple, Union
+import numpy as np
+
+ArrayLike = Union[Sequence[float], np.ndarray]
+
+
+class SMA:
+    """Simple moving average over the last `period` prices, O(1) per update."""
+
+    def __init__(self, period: int):
+        self.period = period
+        self.window: deque = deque(maxlen=period)
+        self.total = 0.0
+
+    @property
+    def ready(self) -> bool:
+        return len(self.window) == self.period
+
+    @property
+    def value(self) -> float:
+        return self.total / len(self.window) if self.window else 0.0
+
+    def update(self, price: float) -> float:
+        if len(self.window) == self.period:
+            self.total -= self.window[0]
+        self.window.append(price)
+        self.total += price
+        return self.value
+
+
+class EMA:
+    """Exponential moving average seeded with the first price seen."""
+
+    def __init__(self, period: int):
+        self.period = period
+        self.multiplier = 2 / (period + 1)
+        self.count = 0
+        self.ema: Optional[float] = None
+
+    @property
+    def ready(self) -> bool:
+        return self.count >= self.period
+
+    @property
+    def value(self) -> float:
+        return float(self.ema) if self.ready else 0.0
+
+    def update(self, price: float) -> float:
+        if self.ema is None:
+            self.ema = price
+        else:
+            self.ema = (price - self.ema) * self.multiplier + self.ema
+        self.count += 1
+        return self.value
+
+
+class RSI:
+    """RSI from the average gain/loss of the last `period` price deltas."""
+
+    def __init__(self, period: int = 14):
+        self.period = period
+        self.count = 0
+        self.last_price: Optional[float] = None
+        self.gains: deque = deque(maxlen=period)
+        self.losses: deque = deque(maxlen=period)
+        self.gain_total = 0.0
+        self.loss_total = 0.0
+
+    @property
+    def ready(self) -> bool:
+        return self.count >= self.period
+
+    @property
+    def value(self) -> float:
+        if not self.ready or not self.gains:
+            return 0.0
+
+        avg_gain = self.gain_total / len(self.gains)
+        avg_loss = self.loss_total / len(self.losses)
+
+        if avg_loss == 0:
+            return 100.0
+
+        rs = avg_gain / avg_loss
+        return float(100 - (100 / (1 + rs)))
+
+    def update(self, price: float) -> float:
+        if self.last_price is not None:
+            delta = price - self.last_price
+            if len(self.gains) == self.period:
+                self.gain_total -= self.gains[0]
+                self.loss_total -= self.losses[0]
+            gain = delta if delta > 0 else 0.0
+            loss = -delta if delta < 0 else 0.0
+            self.gains.append(gain)
+            self.losses.append(loss)
+            self.gain_total += gain
+            self.loss_total += loss
+        self.last_price = price
+        self.count += 1
+        return self.value
+
+
+class MACD:
+    """MACD line, signal line and histogram from fast/slow/signal EMAs."""
+
+    def __init__(self, fast: int = 12, slow: int = 26, signal: int = 9):
+        self.fast = EMA(fast)
+        self.slow = EMA(slow)
+        self.signal = EMA(signal)
+
+    @property
+    def ready(self) -> bool:
+        return self.slow.ready
+
+    @property
+    def value(self) -> Dict[str, float]:
+        if not self.ready:
+            return {}
+
+        macd_line = self.fast.ema - self.slow.ema
+        signal_line = self.signal.value
+
+        return {
+            'macd_line': float(macd_line),
+            'signal_line': float(signal_line),
+            'histogram': float(macd_line - signal_line)
+        }
+
+    def update(self, price: float) -> Dict[str, float]:
+        self.fast.update(price)
+        self.slow.update(price)
+        if self.slow.ready:
+            self.signal.update(self.fast.ema - self.slow.ema)
+        return self.value
+
+
+class BollingerBands:
+    """Bollinger bands over the last `period` prices, O(1) per update.
+
+    The mean and sum of squared deviations are updated Welford-style as
+    prices enter and leave the window, so the width stays accurate for
+    high-priced series with small moves. Both are recomputed from the
+    window once per `period` updates to keep rounding from building up.
+    """
+
+    def __init__(self, period: int = 20, std_dev: float = 2):
+        self.period = period
+        self.std_dev = std_dev
+        self.window: deque = deque(maxlen=period)
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.updates = 0
+
+    @property
+    def ready(self) -> bool:
+        return len(self.window) == self.period
+
+    @property
+    def value(self) -> Dict[str, float]:
+        if not self.ready:
+            return {}
+
+        std = math.sqrt(max(self.m2 / self.period, 0.0))
+
+        return {
+            'middle': float(self.mean),
+            'upper': float(self.mean + (self.std_dev * std)),
+            'lower': float(self.mean - (self.std_dev * std))
+        }
+
+    def update(self, price: float) -> Dict[str, float]:
+        if len(self.window) == self.period:
+            # Replace the oldest price in one step
+            old = self.window[0]
+            old_mean = self.mean
+            self.mean += (price - old) / self.period
+            self.m2 += (price - old) * (price - self.mean + old - old_mean)
+        else:
+            delta = price - self.mean
+            self.mean += delta / (len(self.window) + 1)
+            self.m2 += delta * (price - self.mean)
+        self.window.append(price)
+
+        self.updates += 1
+        if self.updates % self.period == 0:
+            window = np.fromiter(self.window, dtype=float, count=len(self.window))
+            self.mean = float(window.mean())
+            self.m2 = float(((window - self.mean) ** 2).sum())
+        return self.value
+
+
+class IndicatorState:
+    """Per-symbol set of streaming indicators fed one price at a time."""
+
+    def __init__(self):
+        self.count = 0
+        self.last_price: Optional[float] = None
+        self.sma_20 = SMA(20)
+        self.sma_50 = SMA(50)
+        self.ema_20 = EMA(20)
+        self.ema_50 = EMA(50)
+        self.rsi = RSI(14)
+        self.macd = MACD(12, 26, 9)
+        self.bollinger = BollingerBands(20, 2)
+
+    def update(self, price: float) -> None:
+        price = float(price)
+        self.sma_20.update(price)
+        self.sma_50.update(price)
+        self.ema_20.update(price)
+        self.ema_50.update(price)
+        self.rsi.update(price)
+        self.macd.update(price)
+        self.bollinger.update(price)
+        self.last_price = price
+        self.count += 1
+
+    def moving_averages(self) -> Dict[str, float]:
+        if not self.sma_50.ready:
+            return {}
+
+        return {
+            'sma_20': self.sma_20.value,
+            'sma_50': self.sma_50.value,
+            'ema_20': self.ema_20.value,
+            'ema_50': self.ema_50.value
+        }
+
+    def indicators(self) -> Dict[str, Any]:
+        return {
+            'moving_averages': self.moving_averages(),
+            'rsi': self.rsi.value,
+            'macd': self.macd.value,
+            'bollinger_bands': self.bollinger.value
+        }
+
+
+# Full-series indicators. Every function accepts a 1-D price series (or a
+# stack of series with time on the last axis) and returns arrays aligned to
+# the input, with NaN during each indicator's warm-up period.
+
+# Values bollinger_series centres on one shared mean
+BOLLINGER_BLOCK = 1024
+
+def _rolling_sum(values: np.ndarray, period: int) -> np.ndarray:
+    # Shift by the first value so the running sum stays small
+    shifted = values - values[..., :1]
+    csum = np.cumsum(shifted, axis=-1)
+    out = csum.copy()
+    out[..., period:] -= csum[..., :-period]
+    return out + values[..., :1] * np.minimum(np.arange(1, values.shape[-1] + 1), period)
+
+def sma_series(prices: ArrayLike, period: int) -> np.ndarray:
+    values = np.asarray(prices, dtype=float)
+    out = np.full(values.shape, np.nan)
+    if values.shape[-1] >= period:
+        out[..., period - 1:] = _rolling_sum(values, period)[..., period - 1:] / period
+    return out
+
+def ema_series(prices: ArrayLike, period: int, warmup: Optional[int] = None) -> np.ndarray:
+    """EMA seeded with the first price, evaluated block-wise in closed form.
+
+    Within a block ema[j] = d^j * (ema[0] + a * cumsum(x[i] / d^i)), which
+    is exact; the block length keeps d^-j well inside float range.
+    """
+    values = np.asarray(prices, dtype=float)
+    n = values.shape[-1]
+    out = np.empty(values.shape)
+    if n == 0:
+        return out
+
+    alpha = 2 / (period + 1)
+    decay = 1 - alpha
+    if decay == 0:
+        # Period 1 follows the price exactly (and log(0) is undefined)
+        out[...] = values
+    else:
+        block = max(1, int(500 / -math.log(decay)))
+        out[..., 0] = values[..., 0]
+        start = 1
+        while start < n:
+            end = min(start + block, n)
+            powers = decay ** np.arange(1, end - start + 1)
+            prev = out[..., start - 1:start]
+            out[..., start:end] = powers * (
+                prev + alpha * np.cumsum(values[..., start:end] / powers, axis=-1)
+            )
+            start = end
+
+    out[..., :(period if warmup is None else warmup) - 1] = np.nan
+    return out
+
+def rsi_series(prices: ArrayLike, period: int = 14) -> np.ndarray:
+    values = np.asarray(prices, dtype=float)
+    n = values.shape[-1]
+    out = np.full(values.shape, np.nan)
+    if n < max(period, 2):
+        return out
+
+    deltas = np.diff(values, axis=-1)
+    gains = np.where(deltas > 0, deltas, 0.0)
+    losses = np.where(deltas < 0, -deltas, 0.0)
+
+    # Windows hold the last `period` deltas, fewer while the series is short
+    counts = np.minimum(np.arange(1, n), period)
+    avg_gain = _rolling_sum(gains, period) / counts
+    avg_loss = _rolling_sum(losses, period) / counts
+    loss_events = _rolling_sum((deltas < 0).astype(float), period)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rsi = 100 - (100 / (1 + avg_gain / avg_loss))
+    rsi = np.where(loss_events < 0.5, 100.0, rsi)
+
+    out[..., period - 1:] = rsi[..., period - 2:]
+    return out
+
+def macd_series(
+    prices: ArrayLike,
+    fast: int = 12,
+    slow: int = 26,
+    signal: int = 9
+) -> Dict[str, np.ndarray]:
+    values = np.asarray(prices, dtype=float)
+    macd_line = ema_series(values, fast, warmup=1) - ema_series(values, slow)
+    signal_line = np.full(values.shape, np.nan)
+
+    # The signal EMA starts once the slow EMA is warmed up and reads 0.0
+    # until it has seen `signal` values, as in the streaming MACD
+    if values.shape[-1] >= slow:
+        signal_line[..., slow - 1:] = np.nan_to_num(
+            ema_series(macd_line[..., slow - 1:], signal)
+        )
+
+    return {
+        'macd_line': macd_line,
+        'signal_line': signal_line,
+        'histogram': macd_line - signal_line
+    }
+
+def _rolling_moments(values: np.ndarray, period: int, block: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Rolling mean and sum of squared deviations, O(n) from cumulative sums.
+
+    Each block of values is centred on its own mean before summing, and
+    the part of a window that falls in the previous block is re-centred
+    exactly, so rounding depends on how far prices move within a block
+    rather than on their level or on the length of the series.
+    """
+    n = values.shape[-1]
+    block = max(block, period)
+    blocks = -(-n // block)
+    pad = [(0, 0)] * (values.ndim - 1) + [(0, blocks * block - n)]
+    x = np.pad(values, pad, mode='edge').reshape(values.shape[:-1] + (blocks, block))
+
+    ref = x.mean(axis=-1, keepdims=True)
+    dev = x - ref
+    zeros = np.zeros(x.shape[:-1] + (1,))
+    s1 = np.concatenate([zeros, np.cumsum(dev, axis=-1)], axis=-1)
+    s2 = np.concatenate([zeros, np.cumsum(dev * dev, axis=-1)], axis=-1)
+
+    # Part of each window inside its own block
+    ends = np.arange(1, block + 1)
+    starts = np.maximum(ends - period, 0)
+    sum1 = s1[..., ends] - s1[..., starts]
+    sum2 = s2[..., ends] - s2[..., starts]
+
+    # Windows ending early in a block reach back into the previous one
+    if period > 1 and blocks > 1:
+        back = np.arange(period - 1, 0, -1)
+        prev1 = s1[..., :-1, block:] - s1[..., :-1, block - back]
+        prev2 = s2[..., :-1, block:] - s2[..., :-1, block - back]
+        shift = ref[..., :-1, :] - ref[..., 1:, :]
+        sum1[..., 1:, :period - 1] += prev1 + back * shift
+        sum2[..., 1:, :period - 1] += prev2 + 2 * shift * prev1 + back * shift * shift
+
+    mean = (ref + sum1 / period).reshape(values.shape[:-1] + (-1,))[..., :n]
+    m2 = (sum2 - sum1 * sum1 / period).reshape(values.shape[:-1] + (-1,))[..., :n]
+    return mean, m2
+
+def bollinger_series(
+    prices: ArrayLike,
+    period: int = 20,
+    std_dev: float = 2
+) -> Dict[str, np.ndarray]:
+    values = np.asarray(prices, dtype=float)
+    middle = np.full(values.shape, np.nan)
+    std = np.full(values.shape, np.nan)
+
+    if values.shape[-1] >= period:
+        mean, m2 = _rolling_moments(values, period, BOLLINGER_BLOCK)
+        middle[..., period - 1:] = mean[..., period - 1:]
+        std[..., period - 1:] = np.sqrt(np.maximum(m2[..., period - 1:] / period, 0.0))
+
+    return {
+        'middle': middle,
+        'upper': middle + std_dev * std,
+        'lower': middle - std_dev * std
+    }
@@ -1,27 +1,56 @@
 import logging
-import pandas as pd
+import numpy as np
 from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Iterable, List, Optional, Sequence, Tuple, Union
+
+BehaviorKey = Tuple[str, str]
+BehaviorRecord = Union[Tuple[str, str, float], Dict[str, Any]]
 
 class LearnedBehaviorModule:
-    def __init__(self):
+    """Behavior scores per (behavior_type, identifier).
+
+    A dict maps each key to a row in preallocated NumPy score and timestamp
+    columns, which double in size when full, so lookups and updates are O(1)
+    and decay is one vectorized pass. Given a ContextManager, update_many
+    upserts the rows each batch touched, so persistence costs grow with
+    the batch rather than the table.
+    """
+
+    INITIAL_CAPACITY = 1024
+    DEFAULT_SCORE = 0.5
+
+    def __init__(self, context: Optional[Any] = None):
         self.logger = logging.getLogger('ai_trading_bot.analysis.learned_behavior')
-        self.behavior_scores = pd.DataFrame(
-            columns=['behavior_type', 'identifier', 'score', 'last_updated']
-        )
+        self.context = context
+        self.index: Dict[BehaviorKey, int] = {}
+        self.keys: List[BehaviorKey] = []
+        self.scores = np.zeros(self.INITIAL_CAPACITY)
+        self.last_updated = np.zeros(self.INITIAL_CAPACITY)
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def _add_row(self, key: BehaviorKey, score: float, timestamp: float) -> int:
+        row = len(self.keys)
+        if row == len(self.scores):
+            self.scores = np.concatenate([self.scores, np.zeros(len(self.scores))])
+            self.last_updated = np.concatenate([self.last_updated, np.zeros(len(self.last_updated))])
+
+        self.index[key] = row
+        self.keys.append(key)
+        self.scores[row] = score
+        self.last_updated[row] = timestamp
+        return row
 
     async def get_behavior_score(
         self,
         behavior_type: str,
         identifier: str
     ) -> float:
-        record = self.behavior_scores[
-            (self.behavior_scores['behavior_type'] == behavior_type) &
-            (self.behavior_scores['identifier'] == identifier)
-        ]
-        if not record.empty:
-            return float(record.iloc[0]['score'])
-        return 0.5  # Default neutral score
+        row = self.index.get((behavior_type, identifier))
+        if row is not None:
+            return float(self.scores[row])
+        return self.DEFAULT_SCORE  # Default neutral score
 
     async def update_behavior_score(
         self,
@@ -30,39 +59,25 @@ class LearnedBehaviorModule:
         outcome: float
     ) -> None:
         try:
-            current_time = datetime.now()
-            record = self.behavior_scores[
-                (self.behavior_scores['behavior_type'] == behavior_type) &
-                (self.behavior_scores['identifier'] == identifier)
-            ]
+            current_time = datetime.now().timestamp()
+            adjustment = (outcome - 0.5) * 0.1
+            row = self.index.get((behavior_type, identifier))
 
-            if not record.empty:
-                index = record.index[0]
-                old_score = self.behavior_scores.at[index, 'score']
-                adjustment = (outcome - 0.5) * 0.1
+            if row is not None:
+                old_score = self.scores[row]
                 new_score = max(0, min(1, old_score + adjustment))
-                
-                self.behavior_scores.at[index, 'score'] = new_score
-                self.behavior_scores.at[index, 'last_updated'] = current_time
-                
+
+                self.scores[row] = new_score
+                self.last_updated[row] = current_time
+
                 self.logger.info(
                     f"Updated behavior score for {behavior_type} '{identifier}': "
                     f"{old_score:.2f} -> {new_score:.2f}"
                 )
             else:
-                new_score = 0.5 + ((outcome - 0.5) * 0.1)
-                new_score = max(0, min(1, new_score))
-                new_record = {
-                    'behavior_type': behavior_type,
-                    'identifier': identifier,
-                    'score': new_score,
-                    'last_updated': current_time
-                }
-                self.behavior_scores = pd.concat([
-                    self.behavior_scores,
-                    pd.DataFrame([new_record])
-                ], ignore_index=True)
-                
+                new_score = max(0, min(1, self.DEFAULT_SCORE + adjustment))
+                self._add_row((behavior_type, identifier), new_score, current_time)
+
                 self.logger.info(
                     f"Created new behavior score for {behavior_type} "
                     f"'{identifier}': {new_score:.2f}"
@@ -71,37 +86,127 @@ class LearnedBehaviorModule:
         except Exception as e:
             self.logger.error(f"Failed to update behavior score: {e}")
 
+    async def get_many(self, keys: Sequence[BehaviorKey]) -> np.ndarray:
+        rows = np.fromiter((self.index.get(key, -1) for key in keys), dtype=int, count=len(keys))
+        known = rows >= 0
+        scores = np.full(len(keys), self.DEFAULT_SCORE)
+        scores[known] = self.scores[rows[known]]
+        return scores
+
+    async def update_many(self, records: Iterable[BehaviorRecord]) -> None:
+        # Records are (behavior_type, identifier, outcome) tuples or dicts
+        # with those keys
+        try:
+            current_time = datetime.now().timestamp()
+            rows, outcomes, passes = [], [], []
+            seen: Dict[int, int] = {}
+            created = 0
+
+            for record in records:
+                if isinstance(record, dict):
+                    key = (record['behavior_type'], record['identifier'])
+                    outcome = record['outcome']
+                else:
+                    key, outcome = (record[0], record[1]), record[2]
+
+                row = self.index.get(key)
+                if row is None:
+                    row = self._add_row(key, self.DEFAULT_SCORE, current_time)
+                    created += 1
+                rows.append(row)
+                outcomes.append(outcome)
+                passes.append(seen.get(row, 0))
+                seen[row] = passes[-1] + 1
+
+            if not rows:
+                return
+
+            rows = np.asarray(rows)
+            adjustments = (np.asarray(outcomes, dtype=float) - 0.5) * 0.1
+            passes = np.asarray(passes)
+
+            # A key repeated in the batch is applied in order, one pass per
+            # repeat, so clipping matches one-at-a-time updates
+            for step in range(int(passes.max()) + 1):
+                selected = passes == step
+                targets = rows[selected]
+                self.scores[targets] = np.clip(self.scores[targets] + adjustments[selected], 0, 1)
+            self.last_updated[rows] = current_time
+
+            self.logger.info(
+                f"Updated {len(rows)} behavior scores ({created} new, "
+                f"{len(seen)} identifiers)"
+            )
+
+            if self.context is not None:
+                self.context.upsert_behavior_scores([
+                    self._record(row, iso_timestamps=True) for row in seen
+                ])
+
+        except Exception as e:
+            self.logger.error(f"Failed to update behavior scores: {e}")
+
     async def decay_behavior_scores(self) -> None:
         try:
-            current_time = datetime.now()
-            for index, row in self.behavior_scores.iterrows():
-                last_updated = pd.to_datetime(row['last_updated'])
-                time_delta = (current_time - last_updated).total_seconds()
-                
-                if time_delta > 86400:  # 1 day
-                    decay_factor = 0.99 ** (time_delta / 86400)
-                    old_score = row['score']
-                    new_score = old_score * decay_factor
-                    
-                    self.behavior_scores.at[index, 'score'] = new_score
-                    self.behavior_scores.at[index, 'last_updated'] = current_time
-                    
-                    self.logger.info(
-                        f"Decayed behavior score for {row['behavior_type']} "
-                        f"'{row['identifier']}': {old_score:.2f} -> {new_score:.2f}"
-                    )
+            current_time = datetime.now().timestamp()
+            n = len(self.keys)
+            time_delta = current_time - self.last_updated[:n]
+
+            stale = time_delta > 86400  # 1 day
+            if not stale.any():
+                return
+
+            self.scores[:n][stale] *= 0.99 ** (time_delta[stale] / 86400)
+            self.last_updated[:n][stale] = current_time
+
+            self.logger.info(f"Decayed {int(stale.sum())} behavior scores")
 
         except Exception as e:
             self.logger.error(f"Failed to decay behavior scores: {e}")
 
-    def to_dict(self) -> Dict[str, Any]:
+    def _record(self, row: int, iso_timestamps: bool = False) -> Dict[str, Any]:
+        # ISO timestamps make the record JSON-serializable for persistence
+        behavior_type, identifier = self.keys[row]
+        last_updated = datetime.fromtimestamp(self.last_updated[row])
+        return {
+            'behavior_type': behavior_type,
+            'identifier': identifier,
+            'score': float(self.scores[row]),
+            'last_updated': last_updated.isoformat() if iso_timestamps else last_updated
+        }
+
+    def to_dict(self, iso_timestamps: bool = False) -> Dict[str, Any]:
         return {
-            'behavior_scores': self.behavior_scores.to_dict(orient='records')
+            'behavior_scores': [
+                self._record(row, iso_timestamps) for row in range(len(self.keys))
+            ]
         }
 
     @classmethod
-    def from_dict(cls, data: Dict[str, Any]) -> 'LearnedBehaviorModule':
-        instance = cls()
-        if 'behavior_scores' in data:
-            instance.behavior_scores = pd.DataFrame(data['behavior_scores'])
-        return instance
\ No newline at end of file
+    def from_dict(
+        cls,
+        data: Dict[str, Any],
+        context: Optional[Any] = None
+    ) -> 'LearnedBehaviorModule':
+        instance = cls(context)
+        for record in data.get('behavior_scores', []):
+            key = (record['behavior_type'], record['identifier'])
+            timestamp = cls._to_timestamp(record.get('last_updated'))
+            if key in instance.index:
+                row = instance.index[key]
+                instance.scores[row] = record['score']
+                instance.last_updated[row] = timestamp
+            else:
+                instance._add_row(key, record['score'], timestamp)
+        return instance
+
+    @staticmethod
+    def _to_timestamp(value: Any) -> float:
+        # Records hold datetimes (or pandas Timestamps) or ISO strings
+        if isinstance(value, datetime):
+            return value.timestamp()
+        if isinstance(value, str):
+            return datetime.fromisoformat(value).timestamp()
+        if isinstance(value, (int, float)) and np.isfinite(value):
+            return float(value)
+        return datetime.now().timestamp()
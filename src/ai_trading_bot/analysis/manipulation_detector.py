@@ -1,11 +1,61 @@
 import logging
-from typing import Dict, Any, List
+import asyncio
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Set, Tuple
 from datetime import datetime
-import numpy as np
+from .trade_graph import TradeGraph
+from .order_flow import FloorSweepDetector
+from .mempool import MempoolTracker
+
+# Order data keys holding only the events since the previous call
+DELTA_KEYS = ('order_events', 'mempool_events')
 
 class ManipulationDetector:
-    def __init__(self):
+    """Runs the floor sweep, wash trading and RBF detectors side by side.
+
+    Each detector runs on a thread pool under its own deadline, so one
+    slow detector cannot hold up the others. The detectors keep their
+    incremental state (trade graph, order index, mempool chains) on this
+    object, so they need a pool that shares its memory: only a
+    ThreadPoolExecutor is accepted. Being pure Python, they gain deadlines
+    and overlap with I/O from the pool, not parallel CPU time.
+
+    A pool created here is shut down by `close()`, or on leaving a
+    `with` block.
+    """
+
+    def __init__(
+        self,
+        trade_window_seconds: float = 3600.0,
+        max_cycle_length: int = 3,
+        executor: Optional[ThreadPoolExecutor] = None,
+        deadline_seconds: float = 5.0,
+        deadlines: Optional[Dict[str, float]] = None
+    ):
         self.logger = logging.getLogger('ai_trading_bot.analysis.manipulation')
+        if executor is not None and not isinstance(executor, ThreadPoolExecutor):
+            raise TypeError(
+                f"ManipulationDetector needs a ThreadPoolExecutor, got {type(executor).__name__}"
+            )
+        # Deadlines are per detector name
+        self._owns_executor = executor is None
+        self.executor = executor or ThreadPoolExecutor(
+            max_workers=3,
+            thread_name_prefix='manipulation'
+        )
+        self.deadline_seconds = deadline_seconds
+        self.deadlines = deadlines or {}
+        self._pending: Dict[str, Future] = {}
+        # Detectors whose pending run missed its deadline; that run's
+        # result is reported with the next call instead of being dropped
+        self._unreported: Set[str] = set()
+        # Event deltas a detector has not consumed yet, per detector and
+        # (argument position, key)
+        self._backlog: Dict[str, Dict[Tuple[int, str], List[Any]]] = {}
+        self.trade_graph = TradeGraph(trade_window_seconds, max_cycle_length)
+        self.floor_sweep = FloorSweepDetector()
+        self.mempool = MempoolTracker()
         self.known_patterns = {
             'floor_sweep': {
                 'indicators': ['sudden_volume_spike', 'quick_cancellation'],
@@ -27,53 +77,139 @@ class ManipulationDetector:
         order_data: Dict[str, Any]
     ) -> Dict[str, Any]:
         try:
-            floor_sweep = self._detect_floor_sweep(market_data, order_data)
-            wash_trading = self._detect_wash_trading(market_data)
-            rbf_manipulation = self._detect_rbf_manipulation(order_data)
+            detectors = {
+                'floor_sweep': (self._detect_floor_sweep, market_data, order_data),
+                'wash_trading': (self._detect_wash_trading, market_data),
+                'rbf_manipulation': (self._detect_rbf_manipulation, order_data)
+            }
+            results = await asyncio.gather(*(
+                self._run_detector(name, *call)
+                for name, call in detectors.items()
+            ))
+            detections = {name: result[0] for name, result in zip(detectors, results)}
 
-            risk_score = self._calculate_risk_score([
-                floor_sweep,
-                wash_trading,
-                rbf_manipulation
-            ])
+            risk_score = self._calculate_risk_score(list(detections.values()))
 
             return {
                 'timestamp': datetime.now().isoformat(),
                 'risk_score': risk_score,
-                'detections': {
-                    'floor_sweep': floor_sweep,
-                    'wash_trading': wash_trading,
-                    'rbf_manipulation': rbf_manipulation
-                }
+                'detections': detections,
+                'timings': {name: result[1] for name, result in zip(detectors, results)}
             }
         except Exception as e:
             self.logger.error(f"Manipulation detection failed: {e}")
             return {}
 
+    def close(self) -> None:
+        # Shut down the thread pool if this detector created it
+        if self._owns_executor:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def __enter__(self) -> 'ManipulationDetector':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _queue_deltas(self, name: str, args: Tuple[Any, ...], front: bool = False) -> None:
+        backlog = self._backlog.setdefault(name, {})
+        for position, arg in enumerate(args):
+            if isinstance(arg, dict):
+                for key in DELTA_KEYS:
+                    if key in arg:
+                        queued = backlog.get((position, key), [])
+                        events = list(arg[key])
+                        backlog[(position, key)] = events + queued if front else queued + events
+
+    def _take_deltas(self, name: str, args: Tuple[Any, ...]) -> Tuple[Any, ...]:
+        # This call's event deltas go behind any the detector has not
+        # consumed yet, and the whole queue is handed to this run
+        self._queue_deltas(name, args)
+        args = list(args)
+        for (position, key), events in self._backlog.pop(name, {}).items():
+            args[position] = {**args[position], key: events}
+        return tuple(args)
+
+    async def _run_detector(self, name: str, detector, *args) -> Tuple[Dict[str, Any], float]:
+        deadline = self.deadlines.get(name, self.deadline_seconds)
+
+        # A detector still running past an earlier deadline is not started
+        # again, so its state is never updated from two threads at once;
+        # this call's event deltas wait for the next run instead
+        pending = self._pending.get(name)
+        if pending is not None and not pending.done():
+            self._queue_deltas(name, args)
+            self.logger.warning(f"Skipping {name} detection, previous run still active")
+            return {'detected': False, 'confidence': 0, 'timed_out': True}, 0.0
+
+        late = self._late_result(name)
+        args = self._take_deltas(name, args)
+        future = self.executor.submit(self._timed, detector, *args)
+        self._pending[name] = future
+        try:
+            result, elapsed = await asyncio.wait_for(asyncio.wrap_future(future), deadline)
+        except asyncio.TimeoutError:
+            # A run cancelled before it started gives its events back, ahead
+            # of any queued since; one already running still consumes them
+            # and its result is picked up by the next call
+            if future.cancelled():
+                self._queue_deltas(name, args, front=True)
+            else:
+                self._unreported.add(name)
+            self.logger.warning(f"{name} detection exceeded its {deadline}s deadline")
+            result, elapsed = {'detected': False, 'confidence': 0, 'timed_out': True}, deadline
+
+        if late is not None:
+            result = self._merge_results(late, result)
+        return result, elapsed
+
+    def _late_result(self, name: str) -> Optional[Dict[str, Any]]:
+        # The result of a finished run that missed its deadline, if any
+        if name not in self._unreported:
+            return None
+        self._unreported.discard(name)
+        try:
+            return self._pending[name].result()[0]
+        except Exception as e:
+            self.logger.error(f"Late {name} detection failed: {e}")
+            return None
+
+    @staticmethod
+    def _merge_results(late: Dict[str, Any], result: Dict[str, Any]) -> Dict[str, Any]:
+        # Evidence lists are combined without repeats; the flags and
+        # confidence take the stronger of the two runs
+        merged = dict(result)
+        merged['detected'] = bool(late.get('detected')) or bool(result.get('detected'))
+        merged['confidence'] = max(late.get('confidence', 0), result.get('confidence', 0))
+        for key, value in late.items():
+            if isinstance(value, list):
+                combined = list(value)
+                combined.extend(item for item in result.get(key, []) if item not in value)
+                merged[key] = combined
+        return merged
+
+    @staticmethod
+    def _timed(detector, *args) -> Tuple[Dict[str, Any], float]:
+        start = time.perf_counter()
+        result = detector(*args)
+        return result, time.perf_counter() - start
+
     def _detect_floor_sweep(
         self,
         market_data: Dict[str, Any],
         order_data: Dict[str, Any]
     ) -> Dict[str, Any]:
         try:
-            # Check for sudden large orders
-            orders = order_data.get('orders', [])
-            volumes = [order['volume'] for order in orders]
-            mean_vol = np.mean(volumes) if volumes else 0
-            std_vol = np.std(volumes) if volumes else 0
-
-            suspicious_orders = []
-            for order in orders:
-                # Check for orders significantly larger than average
-                if order['volume'] > mean_vol + (3 * std_vol):
-                    # Check if order was quickly cancelled
-                    if order.get('cancelled_at'):
-                        time_diff = (
-                            datetime.fromisoformat(order['cancelled_at']) -
-                            datetime.fromisoformat(order['created_at'])
-                        ).total_seconds()
-                        if time_diff < 60:  # Less than 1 minute
-                            suspicious_orders.append(order)
+            # Large orders cancelled within a minute, tracked across calls
+            # from order events or by syncing the current order list
+            if 'order_events' in order_data:
+                self.floor_sweep.process_events(order_data['order_events'])
+            else:
+                self.floor_sweep.update(order_data.get('orders', []))
+
+            # Flags age out against the data's own clock ('timestamp' when
+            # the order data carries one, else the latest order event)
+            suspicious_orders = self.floor_sweep.suspicious_orders(order_data.get('timestamp'))
 
             return {
                 'detected': len(suspicious_orders) > 0,
@@ -87,20 +223,17 @@ class ManipulationDetector:
     def _detect_wash_trading(self, market_data: Dict[str, Any]) -> Dict[str, Any]:
         try:
             trades = market_data.get('trades', [])
-            suspicious_trades = []
-            addresses = set()
 
-            for trade in trades:
-                # Check for circular trading
-                if trade['buyer'] in addresses and trade['seller'] in addresses:
-                    suspicious_trades.append(trade)
-                addresses.add(trade['buyer'])
-                addresses.add(trade['seller'])
+            # Only trades that close a buyer/seller cycle within the time
+            # window count as circular trading
+            evidence = self.trade_graph.update(trades)
+            suspicious_trades = [item['trade'] for item in evidence]
 
             return {
                 'detected': len(suspicious_trades) > 0,
                 'confidence': min(len(suspicious_trades) * 0.2, 1.0),
-                'suspicious_trades': suspicious_trades
+                'suspicious_trades': suspicious_trades,
+                'cycles': [item['cycle'] for item in evidence]
             }
         except Exception as e:
             self.logger.error(f"Wash trading detection failed: {e}")
@@ -122,6 +255,11 @@ class ManipulationDetector:
                             'fee_increase': tx.get('fee_increase', 0)
                         })
 
+            # Replacement chains tracked from raw mempool events
+            if 'mempool_events' in order_data:
+                self.mempool.process_events(order_data['mempool_events'])
+            suspicious_txs.extend(self.mempool.suspicious_chains())
+
             return {
                 'detected': len(suspicious_txs) > 0,
                 'confidence': min(len(suspicious_txs) * 0.2, 1.0),
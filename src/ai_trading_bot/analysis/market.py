@@ -2,6 +2,7 @@ import logging
 from typing import Dict, Any, List
 from datetime import datetime
 import numpy as np
+from .snapshot import MarketSnapshot
 
 class MarketAnalyzer:
     def __init__(self):
@@ -9,6 +10,7 @@ class MarketAnalyzer:
 
     async def analyze_market(self, market_data: Dict[str, Any]) -> Dict[str, Any]:
         try:
+            market_data = MarketSnapshot.of(market_data)
             volatility = self._calculate_volatility(market_data)
             trend = self._analyze_trend(market_data)
             volume = self._analyze_volume(market_data)
@@ -27,13 +29,12 @@ class MarketAnalyzer:
 
     def _calculate_volatility(self, data: Dict[str, Any]) -> Dict[str, float]:
         try:
-            prices = data.get('prices', [])
-            if not prices:
+            snapshot = MarketSnapshot.of(data)
+            if not len(snapshot.prices):
                 return {'current': 0, 'average': 0, 'trend': 0}
 
-            returns = np.diff(prices) / prices[:-1]
-            current_vol = float(np.std(returns[-20:]) * np.sqrt(365))
-            avg_vol = float(np.std(returns) * np.sqrt(365))
+            current_vol = float(snapshot.returns_std(20) * np.sqrt(365))
+            avg_vol = float(snapshot.returns_std() * np.sqrt(365))
             vol_trend = float(current_vol - avg_vol)
 
             return {
@@ -47,12 +48,12 @@ class MarketAnalyzer:
 
     def _analyze_trend(self, data: Dict[str, Any]) -> Dict[str, Any]:
         try:
-            prices = data.get('prices', [])
-            if not prices:
+            snapshot = MarketSnapshot.of(data)
+            if not len(snapshot.prices):
                 return {'direction': 'neutral', 'strength': 0}
 
-            ma20 = np.mean(prices[-20:])
-            ma50 = np.mean(prices[-50:])
+            ma20 = snapshot.price_mean(20)
+            ma50 = snapshot.price_mean(50)
             
             if ma20 > ma50:
                 direction = 'uptrend'
@@ -76,12 +77,12 @@ class MarketAnalyzer:
 
     def _analyze_volume(self, data: Dict[str, Any]) -> Dict[str, Any]:
         try:
-            volumes = data.get('volumes', [])
-            if not volumes:
+            snapshot = MarketSnapshot.of(data)
+            if not len(snapshot.volumes):
                 return {'profile': 'neutral', 'strength': 0}
 
-            avg_volume = np.mean(volumes)
-            recent_volume = np.mean(volumes[-5:])
+            avg_volume = snapshot.volume_mean()
+            recent_volume = snapshot.volume_mean(5)
             
             if recent_volume > avg_volume * 1.5:
                 profile = 'increasing'
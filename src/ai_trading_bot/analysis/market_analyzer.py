@@ -2,10 +2,14 @@ import logging
 from typing import Dict, Any, List, Optional
 from datetime import datetime
 import numpy as np
+from .extrema import SlidingExtrema
+from .snapshot import MarketSnapshot
 
 class MarketAnalyzer:
-    def __init__(self):
+    def __init__(self, window_size: int = 10):
         self.logger = logging.getLogger('ai_trading_bot.analysis.market')
+        self.window_size = window_size
+        self.extrema_trackers: Dict[str, Dict[str, SlidingExtrema]] = {}
 
     async def analyze_market(
         self,
@@ -13,6 +17,7 @@ class MarketAnalyzer:
         timeframe: str = '1h'
     ) -> Dict[str, Any]:
         try:
+            market_data = MarketSnapshot.of(market_data)
             volatility = self._calculate_volatility(market_data)
             trend = self._analyze_trend(market_data)
             support_resistance = self._find_support_resistance(market_data)
@@ -34,13 +39,12 @@ class MarketAnalyzer:
 
     def _calculate_volatility(self, data: Dict[str, Any]) -> Dict[str, float]:
         try:
-            prices = data.get('price_history', [])
-            if not prices:
+            snapshot = MarketSnapshot.of(data)
+            if not len(snapshot.prices):
                 return {'current': 0, 'average': 0, 'trend': 0}
 
-            returns = np.diff(prices) / prices[:-1]
-            current_vol = float(np.std(returns[-20:]) * np.sqrt(365))
-            avg_vol = float(np.std(returns) * np.sqrt(365))
+            current_vol = float(snapshot.returns_std(20) * np.sqrt(365))
+            avg_vol = float(snapshot.returns_std() * np.sqrt(365))
             vol_trend = float(current_vol - avg_vol)
 
             return {
@@ -54,13 +58,13 @@ class MarketAnalyzer:
 
     def _analyze_trend(self, data: Dict[str, Any]) -> Dict[str, Any]:
         try:
-            prices = data.get('price_history', [])
-            if not prices:
+            snapshot = MarketSnapshot.of(data)
+            if not len(snapshot.prices):
                 return {'direction': 'neutral', 'strength': 0}
 
             # Calculate moving averages
-            ma20 = np.mean(prices[-20:])
-            ma50 = np.mean(prices[-50:])
+            ma20 = snapshot.price_mean(20)
+            ma50 = snapshot.price_mean(50)
             
             # Determine trend direction
             if ma20 > ma50:
@@ -88,13 +92,14 @@ class MarketAnalyzer:
         data: Dict[str, Any]
     ) -> Dict[str, List[float]]:
         try:
-            prices = data.get('price_history', [])
-            if not prices:
+            snapshot = MarketSnapshot.of(data)
+            if not len(snapshot.prices):
                 return {'support': [], 'resistance': []}
 
-            # Find local minima and maxima
-            support_levels = self._find_local_minima(prices)
-            resistance_levels = self._find_local_maxima(prices)
+            # Find local minima and maxima, reusing the per-symbol trackers
+            trackers = self._get_extrema_trackers(snapshot.get('symbol') or 'default')
+            support_levels = trackers['support'].update(snapshot.prices, snapshot.sequence)
+            resistance_levels = trackers['resistance'].update(snapshot.prices, snapshot.sequence)
 
             return {
                 'support': support_levels,
@@ -106,12 +111,12 @@ class MarketAnalyzer:
 
     def _analyze_volume(self, data: Dict[str, Any]) -> Dict[str, Any]:
         try:
-            volumes = data.get('volume_history', [])
-            if not volumes:
+            snapshot = MarketSnapshot.of(data)
+            if not len(snapshot.volumes):
                 return {'profile': 'neutral', 'strength': 0}
 
-            avg_volume = np.mean(volumes)
-            recent_volume = np.mean(volumes[-5:])
+            avg_volume = snapshot.volume_mean()
+            recent_volume = snapshot.volume_mean(5)
             
             if recent_volume > avg_volume * 1.5:
                 profile = 'increasing'
@@ -133,24 +138,10 @@ class MarketAnalyzer:
             self.logger.error(f"Volume analysis failed: {e}")
             return {'profile': 'neutral', 'strength': 0}
 
-    def _find_local_minima(self, prices: List[float]) -> List[float]:
-        minima = []
-        window_size = 10
-
-        for i in range(window_size, len(prices) - window_size):
-            window = prices[i-window_size:i+window_size+1]
-            if prices[i] == min(window):
-                minima.append(prices[i])
-
-        return minima[-3:] if minima else []  # Return last 3 support levels
-
-    def _find_local_maxima(self, prices: List[float]) -> List[float]:
-        maxima = []
-        window_size = 10
-
-        for i in range(window_size, len(prices) - window_size):
-            window = prices[i-window_size:i+window_size+1]
-            if prices[i] == max(window):
-                maxima.append(prices[i])
-
-        return maxima[-3:] if maxima else []  # Return last 3 resistance levels
\ No newline at end of file
+    def _get_extrema_trackers(self, symbol: str) -> Dict[str, SlidingExtrema]:
+        if symbol not in self.extrema_trackers:
+            self.extrema_trackers[symbol] = {
+                'support': SlidingExtrema(self.window_size, 'min'),
+                'resistance': SlidingExtrema(self.window_size, 'max')
+            }
+        return self.extrema_trackers[symbol]
@@ -0,0 +1,198 @@
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Tuple
+import heapq
+import itertools
+import json
+import math
+from .trade_graph import to_timestamp
+
+Outpoint = Tuple[str, int]
+
+
+def outpoint(value: Any) -> Outpoint:
+    # Accepts "txid:vout", [txid, vout] or {'txid': ..., 'vout': ...}
+    if isinstance(value, str):
+        txid, vout = value.rsplit(':', 1)
+        return txid, int(vout)
+    if isinstance(value, dict):
+        return value['txid'], int(value['vout'])
+    txid, vout = value
+    return txid, int(vout)
+
+def read_mempool_events(path: str) -> Iterator[Dict[str, Any]]:
+    # One JSON event per line; blank lines are skipped
+    with open(path) as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+class ReplacementChain:
+    """A transaction and every fee-bumped replacement of it."""
+
+    __slots__ = ('root', 'head', 'replacements', 'fee_bump', 'started_at', 'updated_at')
+
+    def __init__(self, txid: str, timestamp: float):
+        self.root = txid
+        self.head = txid
+        self.replacements = 0
+        self.fee_bump = 0.0
+        self.started_at = timestamp
+        self.updated_at = timestamp
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'tx_id': self.head,
+            'root_tx_id': self.root,
+            'replacements': self.replacements,
+            'fee_increase': self.fee_bump
+        }
+
+
+class MempoolTracker:
+    """Unconfirmed transactions indexed by the outpoints they spend.
+
+    A new transaction that spends an outpoint already claimed by other
+    unconfirmed transactions replaces all of them: the lookup is one dict
+    access per input. The longest replaced chain carries on with its
+    length and cumulative fee bump, measured against the combined fee of
+    everything replaced. Confirmed transactions and chains idle for longer
+    than `expiry_seconds` before the latest transaction are evicted, in
+    timestamp order whatever order transactions arrive in; a transaction
+    already older than that when it arrives is ignored. An untimed
+    transaction is stamped with the latest timestamp seen (or, before
+    any, with the first one to arrive). `replacement_count` and
+    `total_fee_bump` cover the chains still in the mempool: a chain's
+    replacements are subtracted when it is evicted, expires or is merged
+    into a longer one.
+    """
+
+    def __init__(self, expiry_seconds: float = 3600.0, min_replacements: int = 3):
+        self.expiry_seconds = expiry_seconds
+        self.min_replacements = min_replacements
+        self.reset()
+
+    def reset(self) -> None:
+        self.spends: Dict[Outpoint, str] = {}
+        self.transactions: Dict[str, Dict[str, Any]] = {}
+        self.flagged: Dict[str, ReplacementChain] = {}
+        # Min-heap of (chain updated_at, arrival, txid, chain)
+        self.expiry: List[tuple] = []
+        self.arrivals = itertools.count()
+        self.latest = -math.inf
+        self.replacement_count = 0
+        self.total_fee_bump = 0.0
+
+    def __len__(self) -> int:
+        return len(self.transactions)
+
+    def add_transaction(self, tx: Dict[str, Any]) -> Optional[ReplacementChain]:
+        # Returns the chain when the transaction replaced another one
+        txid = tx['txid']
+        if txid in self.transactions:
+            return None
+        fee = float(tx.get('fee', 0.0))
+        timestamp = self.latest if tx.get('timestamp') is None else to_timestamp(tx['timestamp'])
+        if self.latest == -math.inf and timestamp > -math.inf:
+            self._stamp_untimed(timestamp)
+        # A late transaction does not move the clock back
+        self.latest = max(self.latest, timestamp)
+        self.expire(self.latest)
+        if timestamp < self.latest - self.expiry_seconds:
+            return None
+        inputs = [outpoint(value) for value in tx.get('inputs', [])]
+
+        # Every unconfirmed transaction spending one of our inputs is
+        # replaced, in input order without repeats
+        predecessors = list(dict.fromkeys(
+            self.spends[point] for point in inputs
+            if point in self.spends and self.spends[point] != txid
+        ))
+
+        if predecessors:
+            replaced = [self._remove(predecessor) for predecessor in predecessors]
+            # The longest chain carries on; the other chains end here
+            chain = max((previous['chain'] for previous in replaced), key=lambda c: c.replacements)
+            for previous in replaced:
+                if previous['chain'] is not chain:
+                    self._end_chain(previous['chain'])
+
+            fee_bump = fee - sum(previous['fee'] for previous in replaced)
+            chain.replacements += 1
+            chain.fee_bump += fee_bump
+            chain.head = txid
+            chain.updated_at = max(chain.updated_at, timestamp)
+            self.replacement_count += 1
+            self.total_fee_bump += fee_bump
+            if chain.replacements >= self.min_replacements:
+                self.flagged[chain.root] = chain
+        else:
+            chain = ReplacementChain(txid, timestamp)
+
+        self.transactions[txid] = {'inputs': inputs, 'fee': fee, 'chain': chain}
+        for point in inputs:
+            self.spends[point] = txid
+        heapq.heappush(self.expiry, (chain.updated_at, next(self.arrivals), txid, chain))
+        return chain if predecessors else None
+
+    def _stamp_untimed(self, timestamp: float) -> None:
+        # Transactions added before the clock started take the first
+        # timestamp; they are the only ones in the mempool then
+        for _, _, _, chain in self.expiry:
+            chain.started_at = chain.updated_at = timestamp
+        self.expiry = [(timestamp,) + entry[1:] for entry in self.expiry]
+        heapq.heapify(self.expiry)
+
+    def evict(self, txid: str) -> None:
+        # Drop a confirmed or removed transaction together with its chain
+        if txid in self.transactions:
+            self._end_chain(self._remove(txid)['chain'])
+
+    def _end_chain(self, chain: ReplacementChain) -> None:
+        # The chain's replacements no longer describe the current mempool
+        self.flagged.pop(chain.root, None)
+        self.replacement_count -= chain.replacements
+        self.total_fee_bump -= chain.fee_bump
+        if not self.replacement_count:
+            self.total_fee_bump = 0.0
+
+    def _remove(self, txid: str) -> Dict[str, Any]:
+        tx = self.transactions.pop(txid)
+        for point in tx['inputs']:
+            if self.spends.get(point) == txid:
+                del self.spends[point]
+        return tx
+
+    def expire(self, now: float) -> None:
+        cutoff = now - self.expiry_seconds
+        while self.expiry and self.expiry[0][0] < cutoff:
+            _, _, txid, chain = heapq.heappop(self.expiry)
+            # Skip entries for transactions already replaced or confirmed
+            if txid in self.transactions and chain.head == txid and chain.updated_at < cutoff:
+                self._remove(txid)
+                self._end_chain(chain)
+
+    def process_event(self, event: Dict[str, Any]) -> None:
+        # {'type': 'add', 'tx': {...}}, {'type': 'confirm', 'txid': ...}
+        # or {'type': 'remove', 'txid': ...}
+        kind = event['type']
+        if kind == 'add':
+            self.add_transaction(event['tx'])
+        elif kind in ('confirm', 'remove'):
+            self.evict(event['txid'])
+
+    def process_events(self, events: Iterable[Dict[str, Any]]) -> int:
+        count = 0
+        for event in events:
+            self.process_event(event)
+            count += 1
+        return count
+
+    def replay(self, path: str) -> int:
+        return self.process_events(read_mempool_events(path))
+
+    def suspicious_chains(self) -> List[Dict[str, Any]]:
+        return [chain.to_dict() for chain in self.flagged.values()]
+
+    @property
+    def average_fee_bump(self) -> float:
+        return self.total_fee_bump / self.replacement_count if self.replacement_count else 0.0
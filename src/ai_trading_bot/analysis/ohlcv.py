@@ -0,0 +1,106 @@
+from typing import Dict, Any, Optional, Sequence
+import numpy as np
+from .candlesticks import OHLC
+
+
+class OHLCVBuffer:
+    """Fixed-capacity OHLCV history for one symbol, backed by NumPy.
+
+    Every row is written twice, at position i and i + capacity, so the most
+    recent n values of any field are always one contiguous slice. Appends
+    are O(1) and windows are zero-copy, read-only views; a view reflects the
+    buffer at the time it was taken only until the next append.
+    """
+
+    FIELDS = ('open', 'high', 'low', 'close', 'volume')
+
+    def __init__(self, capacity: int = 10000, symbol: Optional[str] = None):
+        if capacity <= 0:
+            raise ValueError("Buffer capacity must be positive")
+
+        self.capacity = capacity
+        self.symbol = symbol
+        self.total = 0
+        self._data = np.zeros((len(self.FIELDS), 2 * capacity))
+        self._rows = {field: i for i, field in enumerate(self.FIELDS)}
+
+    def __len__(self) -> int:
+        return min(self.total, self.capacity)
+
+    def append(
+        self,
+        close: float,
+        volume: float = 0.0,
+        open: Optional[float] = None,
+        high: Optional[float] = None,
+        low: Optional[float] = None
+    ) -> None:
+        row = (
+            close if open is None else open,
+            close if high is None else high,
+            close if low is None else low,
+            close,
+            volume
+        )
+        position = self.total % self.capacity
+        self._data[:, position] = row
+        self._data[:, position + self.capacity] = row
+        self.total += 1
+
+    def append_candle(self, candle: Dict[str, Any]) -> None:
+        self.append(
+            candle['close'],
+            candle.get('volume', 0.0),
+            candle.get('open'),
+            candle.get('high'),
+            candle.get('low')
+        )
+
+    def extend(self, closes: Sequence[float], volumes: Optional[Sequence[float]] = None) -> None:
+        # Bulk append of close-only rows; only the last `capacity` can survive
+        closes = np.asarray(closes, dtype=float)
+        volumes = np.zeros(len(closes)) if volumes is None else np.asarray(volumes, dtype=float)
+        if len(closes) > self.capacity:
+            self.total += len(closes) - self.capacity
+            closes = closes[-self.capacity:]
+            volumes = volumes[-self.capacity:]
+
+        positions = (self.total + np.arange(len(closes))) % self.capacity
+        rows = np.vstack([closes, closes, closes, closes, volumes])
+        self._data[:, positions] = rows
+        self._data[:, positions + self.capacity] = rows
+        self.total += len(closes)
+
+    def window(self, field: str, n: Optional[int] = None) -> np.ndarray:
+        size = len(self) if n is None else min(n, len(self))
+        end = (self.total - 1) % self.capacity + self.capacity + 1 if self.total else self.capacity
+        view = self._data[self._rows[field], end - size:end]
+        view.flags.writeable = False
+        return view
+
+    @property
+    def closes(self) -> np.ndarray:
+        return self.window('close')
+
+    @property
+    def volumes(self) -> np.ndarray:
+        return self.window('volume')
+
+    def ohlc(self, n: Optional[int] = None) -> OHLC:
+        return OHLC(*(self.window(field, n) for field in OHLC.FIELDS))
+
+
+class OHLCVStore:
+    """One OHLCVBuffer per symbol, created on first use."""
+
+    def __init__(self, capacity: int = 10000):
+        self.capacity = capacity
+        self.buffers: Dict[str, OHLCVBuffer] = {}
+
+    def get(self, symbol: str) -> OHLCVBuffer:
+        if symbol not in self.buffers:
+            self.buffers[symbol] = OHLCVBuffer(self.capacity, symbol)
+        return self.buffers[symbol]
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self.buffers
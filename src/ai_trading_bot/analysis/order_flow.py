@@ -0,0 +1,292 @@
+from collections import deque
+from typing import Dict, Any, Hashable, List, Optional
+import heapq
+import itertools
+import math
+from .trade_graph import to_timestamp
+
+
+class WindowStats:
+    """Mean and (population) standard deviation of the last `window_seconds`.
+
+    Values enter and leave with Welford updates; the aggregates are
+    re-summed from the window each time as many values have left as it
+    holds, so rounding error cannot build up. Values leave in timestamp
+    order, whatever order they were added in. Values added before the
+    clock starts (timestamp -inf) take the first time passed to `advance`.
+    """
+
+    def __init__(self, window_seconds: float = 3600.0):
+        self.window_seconds = window_seconds
+        # Min-heap of (timestamp, arrival, value)
+        self.values: List[tuple] = []
+        self.arrivals = itertools.count()
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self._removed = 0
+
+    def add(self, timestamp: float, value: float) -> None:
+        heapq.heappush(self.values, (timestamp, next(self.arrivals), value))
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+
+    def advance(self, now: float) -> None:
+        if now > -math.inf and self.values and self.values[0][0] == -math.inf:
+            self._stamp_untimed(now)
+
+        cutoff = now - self.window_seconds
+        while self.values and self.values[0][0] < cutoff:
+            _, _, value = heapq.heappop(self.values)
+            self.count -= 1
+            self._removed += 1
+            if not self.count:
+                self.mean = self._m2 = 0.0
+                continue
+            delta = value - self.mean
+            self.mean -= delta / self.count
+            self._m2 -= delta * (value - self.mean)
+
+        if self._removed >= max(1, self.count):
+            self._resum()
+
+    def _stamp_untimed(self, timestamp: float) -> None:
+        self.values = [
+            (timestamp if stamp == -math.inf else stamp, arrival, value)
+            for stamp, arrival, value in self.values
+        ]
+        heapq.heapify(self.values)
+
+    def _resum(self) -> None:
+        values = [value for _, _, value in self.values]
+        self.mean = math.fsum(values) / len(values) if values else 0.0
+        self._m2 = math.fsum((value - self.mean) ** 2 for value in values)
+        self._removed = 0
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(max(self._m2, 0.0) / self.count) if self.count else 0.0
+
+
+def order_key(order: Dict[str, Any]) -> Hashable:
+    # The order id, or a key derived from the order's immutable fields so
+    # the same order keeps its key across lists
+    if order.get('id') is not None:
+        return order['id']
+    return (
+        'derived', str(order.get('created_at')), order.get('volume'),
+        order.get('price'), order.get('side'), order.get('maker', order.get('address'))
+    )
+
+def is_filled(order: Dict[str, Any]) -> bool:
+    return bool(order.get('filled_at')) or order.get('status') == 'filled'
+
+
+class OrderLifecycleIndex:
+    """Open orders by id, bounded by age.
+
+    Orders leave the index as soon as they are filled or cancelled, and
+    any order created more than `window_seconds` before the latest event
+    is dropped, in creation-time order whatever order they arrived in.
+    Closed ids are remembered for the same window, so an order list that
+    still contains them does not re-create them. The clock only follows
+    event timestamps: an order without 'created_at' is stamped with the
+    latest one seen (or, before any, with the first one to arrive).
+    """
+
+    def __init__(self, window_seconds: float = 3600.0):
+        self.window_seconds = window_seconds
+        self.orders: Dict[Hashable, Dict[str, Any]] = {}
+        self.closed: Dict[Hashable, float] = {}
+        # Min-heap of (created_at, arrival, order id)
+        self.expiry: List[tuple] = []
+        self.arrivals = itertools.count()
+        self.latest = -math.inf
+
+    def __contains__(self, order_id: Hashable) -> bool:
+        return order_id in self.orders or order_id in self.closed
+
+    def __len__(self) -> int:
+        return len(self.orders)
+
+    def _advance(self, timestamp: float) -> None:
+        if self.latest == -math.inf and timestamp > -math.inf:
+            self._stamp_untimed(timestamp)
+        self.latest = max(self.latest, timestamp)
+        cutoff = self.latest - self.window_seconds
+        while self.expiry and self.expiry[0][0] < cutoff:
+            _, _, order_id = heapq.heappop(self.expiry)
+            self.orders.pop(order_id, None)
+            self.closed.pop(order_id, None)
+
+    def _stamp_untimed(self, timestamp: float) -> None:
+        # Orders created before the clock started take the first event
+        # timestamp; they are the only orders in the index then
+        self.expiry = [(timestamp,) + entry[1:] for entry in self.expiry]
+        heapq.heapify(self.expiry)
+        for record in self.orders.values():
+            record['created_at'] = timestamp
+
+    def create(self, order_id: Hashable, order: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        created_at = order.get('created_at')
+        created_at = self.latest if created_at is None else to_timestamp(created_at)
+        if created_at < self.latest - self.window_seconds:
+            return None
+
+        record = {
+            'order': order,
+            'volume': float(order['volume']),
+            'created_at': created_at,
+            'cancelled_at': None
+        }
+        self.orders[order_id] = record
+        heapq.heappush(self.expiry, (created_at, next(self.arrivals), order_id))
+        self._advance(created_at)
+        return record
+
+    def _close(self, order_id: Hashable) -> Optional[Dict[str, Any]]:
+        record = self.orders.pop(order_id, None)
+        if record is not None:
+            self.closed[order_id] = record['created_at']
+        return record
+
+    def cancel(self, order_id: Hashable, cancelled_at: Any) -> Optional[Dict[str, Any]]:
+        if order_id not in self.orders:
+            return None
+        # The clock moves first, so an order created before it started is
+        # stamped before its lifetime is measured
+        cancelled_at = self.latest if cancelled_at is None else to_timestamp(cancelled_at)
+        self._advance(cancelled_at)
+        record = self._close(order_id)
+        if record is not None:
+            record['cancelled_at'] = cancelled_at
+        return record
+
+    def fill(self, order_id: Hashable, filled_at: Any = None) -> Optional[Dict[str, Any]]:
+        if filled_at is not None and order_id in self.orders:
+            self._advance(to_timestamp(filled_at))
+        return self._close(order_id)
+
+
+class FloorSweepDetector:
+    """Streaming detector for large orders that are cancelled quickly.
+
+    Volume statistics cover the orders created in the last
+    `window_seconds`, like the order index, and each cancel is checked
+    against the statistics at that point, so the work per call is
+    proportional to the new events. Flagged orders are kept in a window
+    bounded both by count and by age, measured from the latest event time
+    or the time passed to `suspicious_orders`.
+    """
+
+    def __init__(
+        self,
+        std_multiplier: float = 3.0,
+        max_cancel_seconds: float = 60.0,
+        window_seconds: float = 3600.0,
+        max_recent: int = 100
+    ):
+        self.std_multiplier = std_multiplier
+        self.max_cancel_seconds = max_cancel_seconds
+        self.window_seconds = window_seconds
+        self.max_recent = max_recent
+        self.reset()
+
+    def reset(self) -> None:
+        self.stats = WindowStats(self.window_seconds)
+        self.index = OrderLifecycleIndex(self.window_seconds)
+        self.recent: deque = deque(maxlen=self.max_recent)
+        # List positions of open orders from the last synced order list
+        self.positions: Dict[Hashable, int] = {}
+        self.synced = 0
+        self.synced_last: Optional[Dict[str, Any]] = None
+
+    def on_create(self, order_id: Hashable, order: Dict[str, Any]) -> bool:
+        record = self.index.create(order_id, order)
+        if record is None:
+            return False
+        self.stats.add(record['created_at'], record['volume'])
+        self.stats.advance(self.index.latest)
+        return True
+
+    def on_fill(self, order_id: Hashable, filled_at: Any = None) -> None:
+        self.index.fill(order_id, filled_at)
+        self.stats.advance(self.index.latest)
+
+    def on_cancel(self, order_id: Hashable, cancelled_at: Any) -> bool:
+        record = self.index.cancel(order_id, cancelled_at)
+        if record is None:
+            return False
+
+        self.stats.advance(self.index.latest)
+        threshold = self.stats.mean + self.std_multiplier * self.stats.std
+        lifetime = record['cancelled_at'] - record['created_at']
+        if record['volume'] > threshold and lifetime < self.max_cancel_seconds:
+            self.recent.append(record)
+            return True
+        return False
+
+    def process_events(self, events: List[Dict[str, Any]]) -> None:
+        # Events: {'type': 'create', 'order': {...}},
+        # {'type': 'cancel', 'order_id': ..., 'cancelled_at': ...} or
+        # {'type': 'fill', 'order_id': ..., 'filled_at': ...}
+        for event in events:
+            if event['type'] == 'create':
+                order = event['order']
+                if order_key(order) not in self.index:
+                    self.on_create(order_key(order), order)
+            elif event['type'] == 'cancel':
+                self.on_cancel(event['order_id'], event['cancelled_at'])
+            elif event['type'] == 'fill':
+                self.on_fill(event['order_id'], event.get('filled_at'))
+
+    def update(self, orders: List[Dict[str, Any]]) -> None:
+        # Sync from a full order list: unseen orders become creates and
+        # newly cancelled or filled ones are closed. When the list only grew
+        # since the last call, just the appended orders and the positions
+        # of still-open ones are read; a replaced list is scanned in full.
+        # All creates in a batch are counted before its cancels are checked.
+        start = self.synced
+        if start > len(orders) or (start and orders[start - 1] != self.synced_last):
+            start = 0
+        open_positions = dict(self.positions) if start else {}
+
+        for position in range(start, len(orders)):
+            order = orders[position]
+            key = order_key(order)
+            if key not in self.index and not self.on_create(key, order):
+                continue
+            if key in self.index.orders:
+                open_positions[key] = position
+
+        cancels = []
+        for key, position in open_positions.items():
+            order = orders[position]
+            if order.get('cancelled_at'):
+                cancels.append((key, order['cancelled_at']))
+            elif is_filled(order):
+                self.on_fill(key, order.get('filled_at'))
+
+        for key, cancelled_at in cancels:
+            self.on_cancel(key, cancelled_at)
+
+        self.positions = {
+            key: position for key, position in open_positions.items()
+            if key in self.index.orders
+        }
+        self.synced = len(orders)
+        self.synced_last = orders[-1] if orders else None
+
+    def suspicious_orders(self, now: Any = None) -> List[Dict[str, Any]]:
+        # Age out flagged orders relative to `now`, or to the latest event
+        # time when it is not given
+        now = self.index.latest if now is None else max(self.index.latest, to_timestamp(now))
+        cutoff = now - self.window_seconds
+        # Cancels can arrive out of time order, so every flag is checked
+        self.recent = deque(
+            (record for record in self.recent if record['cancelled_at'] >= cutoff),
+            maxlen=self.max_recent
+        )
+        return [record['order'] for record in self.recent]
@@ -2,16 +2,21 @@ import logging
 from typing import Dict, Any, List, Optional
 from datetime import datetime
 import numpy as np
+from .extrema import PeakTroughIndex
+from .candlesticks import OHLC, CandlestickScanner, scan_candlesticks
+from .snapshot import MarketSnapshot
 
 class PatternRecognizer:
     def __init__(self):
         self.logger = logging.getLogger('ai_trading_bot.analysis.pattern')
+        self.candlestick_scanners: Dict[str, CandlestickScanner] = {}
 
     async def identify_patterns(
         self,
         market_data: Dict[str, Any]
     ) -> Dict[str, Any]:
         try:
+            market_data = MarketSnapshot.of(market_data)
             candlestick_patterns = self._identify_candlestick_patterns(market_data)
             chart_patterns = self._identify_chart_patterns(market_data)
             
@@ -32,15 +37,26 @@ class PatternRecognizer:
     ) -> List[Dict[str, Any]]:
         try:
             patterns = []
-            candles = data.get('candles', [])
+            data = MarketSnapshot.of(data)
+            buffer = data.buffer
+            candles = buffer.ohlc(5) if buffer is not None else data.get('candles', [])
             
-            if len(candles) < 3:
+            if len(buffer if buffer is not None else candles) < 3:
                 return patterns
 
+            if buffer is not None:
+                # The buffer tail is a zero-copy view, so scan it directly
+                flags = scan_candlesticks(candles)
+            else:
+                # Only candles appended since the last call are evaluated
+                symbol = data.get('symbol') or 'default'
+                scanner = self.candlestick_scanners.setdefault(symbol, CandlestickScanner(5))
+                flags = scanner.update(candles)
+
             # Check for common candlestick patterns
-            patterns.extend(self._find_doji(candles))
-            patterns.extend(self._find_hammer(candles))
-            patterns.extend(self._find_engulfing(candles))
+            patterns.extend(self._find_doji(candles, flags))
+            patterns.extend(self._find_hammer(candles, flags))
+            patterns.extend(self._find_engulfing(candles, flags))
             
             return patterns
         except Exception as e:
@@ -53,57 +69,82 @@ class PatternRecognizer:
     ) -> List[Dict[str, Any]]:
         try:
             patterns = []
-            prices = data.get('price_history', [])
+            prices = MarketSnapshot.of(data).prices
             
             if len(prices) < 20:
                 return patterns
 
-            # Check for common chart patterns
-            patterns.extend(self._find_double_bottom(prices))
-            patterns.extend(self._find_double_top(prices))
-            patterns.extend(self._find_head_and_shoulders(prices))
+            # Build the peak/trough index once and share it between patterns
+            index = PeakTroughIndex(prices)
+            patterns.extend(self._find_double_bottom(prices, index))
+            patterns.extend(self._find_double_top(prices, index))
+            patterns.extend(self._find_head_and_shoulders(prices, index))
             
             return patterns
         except Exception as e:
             self.logger.error(f"Chart pattern recognition failed: {e}")
             return []
 
-    def _find_doji(self, candles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        patterns = []
-        for i, candle in enumerate(candles[-5:]):  # Check last 5 candles
-            if abs(candle['open'] - candle['close']) < (candle['high'] - candle['low']) * 0.1:
-                patterns.append({
-                    'type': 'doji',
-                    'position': i,
-                    'confidence': 0.8
-                })
-        return patterns
+    def scan_candlesticks(self, market_data: Dict[str, Any]) -> Dict[str, np.ndarray]:
+        # Boolean mask per candlestick rule over the whole candle history
+        try:
+            buffer = MarketSnapshot.of(market_data).buffer
+            if buffer is not None:
+                return scan_candlesticks(buffer.ohlc())
+            return scan_candlesticks(market_data.get('candles', []))
+        except Exception as e:
+            self.logger.error(f"Candlestick scan failed: {e}")
+            return {}
 
-    def _find_hammer(self, candles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        patterns = []
-        for i, candle in enumerate(candles[-5:]):
-            body = abs(candle['open'] - candle['close'])
-            lower_shadow = min(candle['open'], candle['close']) - candle['low']
-            upper_shadow = candle['high'] - max(candle['open'], candle['close'])
-            
-            if (lower_shadow > body * 2) and (upper_shadow < body * 0.5):
-                patterns.append({
-                    'type': 'hammer',
-                    'position': i,
-                    'confidence': 0.7
-                })
-        return patterns
+    def _recent_flags(
+        self,
+        candles: List[Dict[str, Any]],
+        flags: Optional[Dict[str, np.ndarray]]
+    ) -> Dict[str, np.ndarray]:
+        if flags is not None:
+            return flags
+        return scan_candlesticks(OHLC.from_candles(candles[-5:]))
+
+    def _find_doji(
+        self,
+        candles: List[Dict[str, Any]],
+        flags: Optional[Dict[str, np.ndarray]] = None
+    ) -> List[Dict[str, Any]]:
+        mask = self._recent_flags(candles, flags)['doji']  # Check last 5 candles
+        return [
+            {
+                'type': 'doji',
+                'position': int(i),
+                'confidence': 0.8
+            }
+            for i in np.flatnonzero(mask)
+        ]
+
+    def _find_hammer(
+        self,
+        candles: List[Dict[str, Any]],
+        flags: Optional[Dict[str, np.ndarray]] = None
+    ) -> List[Dict[str, Any]]:
+        mask = self._recent_flags(candles, flags)['hammer']
+        return [
+            {
+                'type': 'hammer',
+                'position': int(i),
+                'confidence': 0.7
+            }
+            for i in np.flatnonzero(mask)
+        ]
 
-    def _find_engulfing(self, candles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def _find_engulfing(
+        self,
+        candles: List[Dict[str, Any]],
+        flags: Optional[Dict[str, np.ndarray]] = None
+    ) -> List[Dict[str, Any]]:
+        mask = self._recent_flags(candles, flags)['bullish_engulfing']
         patterns = []
-        for i in range(1, min(5, len(candles))):
-            prev = candles[-i-1]
-            curr = candles[-i]
-            
-            if (prev['close'] < prev['open'] and  # Previous red
-                curr['close'] > curr['open'] and  # Current green
-                curr['open'] < prev['close'] and  # Current opens below prev close
-                curr['close'] > prev['open']):    # Current closes above prev open
+        # Position i counts back from the newest candle
+        for i in range(1, min(5, len(mask))):
+            if mask[-i]:
                 patterns.append({
                     'type': 'bullish_engulfing',
                     'position': i,
@@ -111,60 +152,67 @@ class PatternRecognizer:
                 })
         return patterns
 
-    def _find_double_bottom(self, prices: List[float]) -> List[Dict[str, Any]]:
-        patterns = []
+    def _find_double_bottom(
+        self,
+        prices: List[float],
+        index: Optional[PeakTroughIndex] = None
+    ) -> List[Dict[str, Any]]:
+        index = index or PeakTroughIndex(prices)
         min_distance = 10  # Minimum distance between bottoms
         
-        for i in range(min_distance, len(prices)-min_distance):
-            if self._is_local_minimum(prices, i):
-                for j in range(i+min_distance, len(prices)):
-                    if self._is_local_minimum(prices, j):
-                        if abs(prices[i] - prices[j]) < prices[i] * 0.02:  # 2% tolerance
-                            patterns.append({
-                                'type': 'double_bottom',
-                                'positions': [i, j],
-                                'confidence': 0.7
-                            })
-        return patterns
+        return [
+            {
+                'type': 'double_bottom',
+                'positions': [i, j],
+                'confidence': 0.7
+            }
+            for i, j in index.matching_pairs('trough', min_distance, 0.02)  # 2% tolerance
+        ]
 
-    def _find_double_top(self, prices: List[float]) -> List[Dict[str, Any]]:
-        patterns = []
+    def _find_double_top(
+        self,
+        prices: List[float],
+        index: Optional[PeakTroughIndex] = None
+    ) -> List[Dict[str, Any]]:
+        index = index or PeakTroughIndex(prices)
         min_distance = 10
         
-        for i in range(min_distance, len(prices)-min_distance):
-            if self._is_local_maximum(prices, i):
-                for j in range(i+min_distance, len(prices)):
-                    if self._is_local_maximum(prices, j):
-                        if abs(prices[i] - prices[j]) < prices[i] * 0.02:
-                            patterns.append({
-                                'type': 'double_top',
-                                'positions': [i, j],
-                                'confidence': 0.7
-                            })
-        return patterns
+        return [
+            {
+                'type': 'double_top',
+                'positions': [i, j],
+                'confidence': 0.7
+            }
+            for i, j in index.matching_pairs('peak', min_distance, 0.02)
+        ]
 
-    def _find_head_and_shoulders(self, prices: List[float]) -> List[Dict[str, Any]]:
-        patterns = []
+    def _find_head_and_shoulders(
+        self,
+        prices: List[float],
+        index: Optional[PeakTroughIndex] = None
+    ) -> List[Dict[str, Any]]:
+        index = index or PeakTroughIndex(prices)
         min_distance = 5
-        
-        for i in range(min_distance, len(prices)-2*min_distance):
-            if (self._is_local_maximum(prices, i) and
-                self._is_local_maximum(prices, i+min_distance) and
-                self._is_local_maximum(prices, i+2*min_distance)):
-                
-                head = prices[i+min_distance]
-                left_shoulder = prices[i]
-                right_shoulder = prices[i+2*min_distance]
-                
-                if (head > left_shoulder and
-                    head > right_shoulder and
-                    abs(left_shoulder - right_shoulder) < left_shoulder * 0.05):
-                    patterns.append({
-                        'type': 'head_and_shoulders',
-                        'positions': [i, i+min_distance, i+2*min_distance],
-                        'confidence': 0.8
-                    })
-        return patterns
+
+        starts = index.peak_triples(min_distance)
+        left_shoulder = index.prices[starts]
+        head = index.prices[starts + min_distance]
+        right_shoulder = index.prices[starts + 2 * min_distance]
+
+        matched = starts[
+            (head > left_shoulder) &
+            (head > right_shoulder) &
+            (np.abs(left_shoulder - right_shoulder) < left_shoulder * 0.05)
+        ]
+
+        return [
+            {
+                'type': 'head_and_shoulders',
+                'positions': [int(i), int(i) + min_distance, int(i) + 2 * min_distance],
+                'confidence': 0.8
+            }
+            for i in matched
+        ]
 
     def _is_local_minimum(self, prices: List[float], index: int) -> bool:
         if index == 0 or index == len(prices) - 1:
@@ -1,11 +1,20 @@
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, Optional, Tuple
 from datetime import datetime
 import numpy as np
+from .snapshot import MarketSnapshot
+from .history import HistoryCursor
+from .correlation import RollingCorrelation, correlation_matrix, mean_abs_correlation
 
 class RiskAnalyzer:
-    def __init__(self):
+    def __init__(self, correlation_window: Optional[int] = None):
         self.logger = logging.getLogger('ai_trading_bot.analysis.risk')
+        # With a window, correlation risk is tracked incrementally across
+        # calls from the returns appended since the previous call
+        self.correlation_window = correlation_window
+        self.rolling_correlation: Optional[RollingCorrelation] = None
+        self._correlation_assets: Tuple[str, ...] = ()
+        self._correlation_cursors: Dict[str, HistoryCursor] = {}
 
     async def analyze_risk(
         self,
@@ -13,6 +22,7 @@ class RiskAnalyzer:
         portfolio_data: Dict[str, Any]
     ) -> Dict[str, Any]:
         try:
+            market_data = MarketSnapshot.of(market_data)
             volatility_risk = self._calculate_volatility_risk(market_data)
             exposure_risk = self._calculate_exposure_risk(portfolio_data)
             correlation_risk = self._calculate_correlation_risk(market_data)
@@ -41,12 +51,11 @@ class RiskAnalyzer:
 
     def _calculate_volatility_risk(self, data: Dict[str, Any]) -> float:
         try:
-            prices = data.get('price_history', [])
-            if not prices:
+            snapshot = MarketSnapshot.of(data)
+            if not len(snapshot.prices):
                 return 0.0
                 
-            returns = np.diff(prices) / prices[:-1]
-            volatility = np.std(returns) * np.sqrt(365)
+            volatility = snapshot.returns_std() * np.sqrt(365)
             
             # Normalize volatility to 0-1 scale
             return float(min(1.0, volatility))
@@ -83,33 +92,61 @@ class RiskAnalyzer:
             assets = data.get('assets', {})
             if not assets:
                 return 0.0
-                
-            correlations = []
-            prices = {
-                asset: data['price_history']
-                for asset, data in assets.items()
+
+            snapshots = {
+                asset: MarketSnapshot.of(asset_data)
+                for asset, asset_data in assets.items()
             }
-            
-            for asset1 in prices:
-                for asset2 in prices:
-                    if asset1 < asset2:
-                        corr = np.corrcoef(prices[asset1], prices[asset2])[0, 1]
-                        correlations.append(abs(corr))
-            
-            return float(np.mean(correlations)) if correlations else 0.0
-            
+            if self.correlation_window:
+                return self._rolling_correlation_risk(snapshots)
+
+            returns = np.vstack([snapshot.returns for snapshot in snapshots.values()])
+            return mean_abs_correlation(correlation_matrix(returns))
+
         except Exception as e:
             self.logger.error(f"Correlation risk calculation failed: {e}")
             return 0.0
 
+    def _rolling_correlation_risk(self, snapshots: Dict[str, MarketSnapshot]) -> float:
+        assets = tuple(sorted(snapshots))
+        count = snapshots[assets[0]].total
+        if any(snapshots[asset].total != count for asset in assets):
+            raise ValueError("Asset price histories differ in length")
+
+        # Only the returns appended since the last call are fed in, unless
+        # the asset set changed or a history no longer continues
+        if assets != self._correlation_assets:
+            self._correlation_cursors = {asset: HistoryCursor() for asset in assets}
+        fresh = [
+            snapshots[asset].unread_prices(self._correlation_cursors[asset])
+            for asset in assets
+        ]
+        if (self.rolling_correlation is None or
+            assets != self._correlation_assets or
+            not all(continued for _, continued in fresh) or
+            len({len(prices) for prices, _ in fresh}) > 1):
+            self.rolling_correlation = RollingCorrelation(len(assets), self.correlation_window)
+            self._correlation_assets = assets
+            new_rows = len(snapshots[assets[0]].returns)
+        else:
+            new_rows = min(len(fresh[0][0]), len(snapshots[assets[0]].returns))
+
+        if new_rows:
+            rows = np.column_stack([
+                snapshots[asset].returns[-new_rows:] for asset in assets
+            ])
+            self.rolling_correlation.extend(rows)
+
+        return self.rolling_correlation.mean_abs_correlation()
+
     def _calculate_liquidity_risk(self, data: Dict[str, Any]) -> float:
         try:
-            volume = data.get('volume_history', [])
-            if not volume:
+            snapshot = MarketSnapshot.of(data)
+            if not len(snapshot.volumes):
                 return 0.0
                 
-            avg_volume = np.mean(volume)
-            recent_volume = np.mean(volume[-5:])
+            avg_volume = snapshot.volume_mean()
+            recent_volume = snapshot.volume_mean(5)
             
             # Higher score means higher liquidity risk
             liquidity_risk = 1 - (recent_volume / avg_volume)
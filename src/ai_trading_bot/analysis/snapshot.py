@@ -0,0 +1,161 @@
+import hashlib
+from collections.abc import Mapping
+from functools import cached_property
+from typing import Dict, Any, Iterator, Optional, Sequence, Tuple
+import numpy as np
+from .ohlcv import OHLCVBuffer
+from .history import HistoryCursor
+
+
+def window_matrix(series: Sequence[np.ndarray], n: int) -> np.ndarray:
+    # The last n values of each series as rows, left-padded with NaN
+    matrix = np.full((len(series), n), np.nan)
+    for row, values in enumerate(series):
+        tail = values[-n:]
+        if len(tail):
+            matrix[row, n - len(tail):] = tail
+    return matrix
+
+
+class MarketSnapshot(Mapping):
+    """Read-only view of one symbol's market data for a single cycle.
+
+    Derived series (returns, log returns, diffs, window means) are computed
+    on first use and memoized, so every analyzer handed the same snapshot
+    shares one copy. The snapshot is also a mapping over the raw data, so
+    it can be passed anywhere a market_data dict is expected.
+
+    When the data carries an OHLCVBuffer (directly, or under the 'ohlcv'
+    key) prices and volumes are zero-copy views into that buffer instead of
+    arrays converted from lists. A plain list that only holds the most
+    recent prices can say how many were ever appended with 'price_total'.
+    """
+
+    PRICE_KEYS = ('price_history', 'prices')
+    VOLUME_KEYS = ('volume_history', 'volumes')
+
+    def __init__(
+        self,
+        data: Optional[Dict[str, Any]] = None,
+        buffer: Optional[OHLCVBuffer] = None
+    ):
+        self.data = data if data is not None else {}
+        self.buffer = buffer if buffer is not None else self.data.get('ohlcv')
+        self._stats: Dict[Tuple[str, Optional[int]], float] = {}
+
+    @classmethod
+    def of(cls, data: Any) -> 'MarketSnapshot':
+        if isinstance(data, cls):
+            return data
+        if isinstance(data, OHLCVBuffer):
+            return cls({'symbol': data.symbol}, buffer=data)
+        return cls(data)
+
+    def __getitem__(self, key: str) -> Any:
+        return self.data[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.data)
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def _series(self, keys: Tuple[str, ...]) -> np.ndarray:
+        for key in keys:
+            if key in self.data:
+                return np.asarray(self.data[key], dtype=float)
+        return np.empty(0)
+
+    @cached_property
+    def _price_history(self) -> Tuple[np.ndarray, Optional[int]]:
+        # Prices and, when the source knows it, how many were ever
+        # appended; read together so a buffer appended to later in the
+        # cycle cannot pair one with the other's successor
+        if self.buffer is not None:
+            return self.buffer.closes, self.buffer.total
+        total = self.data.get('price_total')
+        return self._series(self.PRICE_KEYS), None if total is None else int(total)
+
+    @property
+    def prices(self) -> np.ndarray:
+        return self._price_history[0]
+
+    @cached_property
+    def volumes(self) -> np.ndarray:
+        if self.buffer is not None:
+            return self.buffer.volumes
+        return self._series(self.VOLUME_KEYS)
+
+    @cached_property
+    def fingerprint(self) -> str:
+        # Identifies the price and volume history, so results computed from
+        # it can be reused while it is unchanged. A 'data_version' supplied
+        # by the data source is used as is instead of hashing the series
+        if 'data_version' in self.data:
+            return f"version:{self.data['data_version']}"
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(str(self.data.get('symbol')).encode())
+        for series in (self.prices, self.volumes):
+            digest.update(len(series).to_bytes(8, 'little'))
+            digest.update(np.ascontiguousarray(series, dtype=float).tobytes())
+        return digest.hexdigest()
+
+    @property
+    def sequence(self) -> Optional[int]:
+        # Prices ever appended when the source knows it, otherwise None
+        return self._price_history[1]
+
+    @property
+    def total(self) -> int:
+        # Prices ever appended; larger than len(prices) once a buffer wraps
+        sequence = self.sequence
+        return len(self.prices) if sequence is None else sequence
+
+    def unread_prices(self, cursor: HistoryCursor) -> Tuple[np.ndarray, bool]:
+        # Prices the cursor has not read yet, and whether they continue
+        # the history it read before (see HistoryCursor.advance)
+        return cursor.advance(self.prices, self.sequence)
+
+    @cached_property
+    def price_changes(self) -> np.ndarray:
+        return np.diff(self.prices)
+
+    @cached_property
+    def volume_changes(self) -> np.ndarray:
+        return np.diff(self.volumes)
+
+    @cached_property
+    def returns(self) -> np.ndarray:
+        return self.price_changes / self.prices[:-1]
+
+    @cached_property
+    def log_returns(self) -> np.ndarray:
+        return np.log(self.prices[1:] / self.prices[:-1])
+
+    def price_window(self, window: int) -> np.ndarray:
+        return self.prices[-window:]
+
+    def volume_window(self, window: int) -> np.ndarray:
+        return self.volumes[-window:]
+
+    def _memo(self, name: str, window: Optional[int], compute) -> float:
+        key = (name, window)
+        if key not in self._stats:
+            self._stats[key] = float(compute())
+        return self._stats[key]
+
+    def price_mean(self, window: Optional[int] = None) -> float:
+        values = self.prices if window is None else self.prices[-window:]
+        return self._memo('price_mean', window, lambda: np.mean(values))
+
+    def volume_mean(self, window: Optional[int] = None) -> float:
+        values = self.volumes if window is None else self.volumes[-window:]
+        return self._memo('volume_mean', window, lambda: np.mean(values))
+
+    def returns_std(self, window: Optional[int] = None) -> float:
+        values = self.returns if window is None else self.returns[-window:]
+        return self._memo('returns_std', window, lambda: np.std(values))
+
+    def returns_mean(self, window: Optional[int] = None) -> float:
+        values = self.returns if window is None else self.returns[-window:]
+        return self._memo('returns_mean', window, lambda: np.mean(values))
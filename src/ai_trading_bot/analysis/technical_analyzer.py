@@ -2,19 +2,27 @@ import logging
 from typing import Dict, Any, List, Optional
 from datetime import datetime
 import numpy as np
+from .indicators import (
+    IndicatorState,
+    sma_series,
+    ema_series,
+    rsi_series,
+    macd_series,
+    bollinger_series
+)
+from .snapshot import MarketSnapshot
+from .history import HistoryCursor
 
 class TechnicalAnalyzer:
     def __init__(self):
         self.logger = logging.getLogger('ai_trading_bot.analysis.technical')
+        self.indicator_states: Dict[str, IndicatorState] = {}
+        self.cursors: Dict[str, HistoryCursor] = {}
 
     async def analyze(self, market_data: Dict[str, Any]) -> Dict[str, Any]:
         try:
-            indicators = {
-                'moving_averages': self._calculate_moving_averages(market_data),
-                'rsi': self._calculate_rsi(market_data),
-                'macd': self._calculate_macd(market_data),
-                'bollinger_bands': self._calculate_bollinger_bands(market_data)
-            }
+            state = self._sync_state(market_data)
+            indicators = state.indicators()
             
             signals = self._generate_signals(indicators)
             
@@ -27,81 +35,171 @@ class TechnicalAnalyzer:
             self.logger.error(f"Technical analysis failed: {e}")
             return {}
 
-    def _calculate_moving_averages(self, data: Dict[str, Any]) -> Dict[str, float]:
-        prices = data.get('price_history', [])
-        if not len(prices) >= 50:
+    def analyze_series(self, market_data: Dict[str, Any]) -> Dict[str, Any]:
+        # Every indicator over the whole history, aligned to price_history
+        try:
+            prices = MarketSnapshot.of(market_data).prices
+            indicators = self._calculate_indicator_series(prices)
+
+            return {
+                'timestamp': datetime.now().isoformat(),
+                'indicators': indicators,
+                'signals': self._generate_signal_series(indicators)
+            }
+        except Exception as e:
+            self.logger.error(f"Technical series analysis failed: {e}")
             return {}
-            
+
+    async def analyze_many(
+        self,
+        price_matrix: Any,
+        symbols: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        # One vectorized pass over a (symbols x time) matrix of equal-length histories
+        try:
+            prices = np.atleast_2d(np.asarray(price_matrix, dtype=float))
+            if symbols is None:
+                symbols = [str(i) for i in range(prices.shape[0])]
+            if len(symbols) != prices.shape[0]:
+                raise ValueError(
+                    f"Got {len(symbols)} symbols for {prices.shape[0]} price rows"
+                )
+
+            latest = self._calculate_latest_indicators(prices)
+            signals = self._generate_signal_series(latest)
+
+            results = {}
+            for i, symbol in enumerate(symbols):
+                indicators = self._indicators_at(latest, i, prices.shape[1])
+                results[symbol] = {
+                    'indicators': indicators,
+                    'signals': {
+                        name: str(labels[i])
+                        for name, labels in signals.items()
+                        if labels[i]
+                    }
+                }
+
+            return {
+                'timestamp': datetime.now().isoformat(),
+                'symbols': results
+            }
+        except Exception as e:
+            self.logger.error(f"Batched technical analysis failed: {e}")
+            return {}
+
+    def update(self, symbol: str, price: float) -> Dict[str, Any]:
+        # Feed a single new tick without passing the full history
+        state = self.indicator_states.setdefault(symbol, IndicatorState())
+        state.update(price)
+        return state.indicators()
+
+    def _sync_state(self, data: Dict[str, Any]) -> IndicatorState:
+        snapshot = MarketSnapshot.of(data)
+        symbol = snapshot.get('symbol') or 'default'
+        cursor = self.cursors.setdefault(symbol, HistoryCursor())
+
+        # Rebuild if the history was replaced, otherwise only feed the
+        # prices appended (or slid in) since the last call
+        new_prices, continued = snapshot.unread_prices(cursor)
+        state = self.indicator_states.get(symbol)
+        if state is None or not continued:
+            state = IndicatorState()
+            self.indicator_states[symbol] = state
+
+        for price in new_prices:
+            state.update(price)
+
+        return state
+
+    def reset(self, symbol: Optional[str] = None) -> None:
+        if symbol is None:
+            self.indicator_states.clear()
+            self.cursors.clear()
+        else:
+            self.indicator_states.pop(symbol, None)
+            self.cursors.pop(symbol, None)
+
+    def _calculate_indicator_series(self, prices: np.ndarray) -> Dict[str, Any]:
         return {
-            'sma_20': float(np.mean(prices[-20:])),
-            'sma_50': float(np.mean(prices[-50:])),
-            'ema_20': self._calculate_ema(prices, 20),
-            'ema_50': self._calculate_ema(prices, 50)
+            'moving_averages': {
+                'sma_20': sma_series(prices, 20),
+                'sma_50': sma_series(prices, 50),
+                'ema_20': ema_series(prices, 20),
+                'ema_50': ema_series(prices, 50)
+            },
+            'rsi': rsi_series(prices, 14),
+            'macd': macd_series(prices, 12, 26, 9),
+            'bollinger_bands': bollinger_series(prices, 20, 2)
         }
 
-    def _calculate_ema(self, prices: List[float], period: int) -> float:
-        if not len(prices) >= period:
-            return 0.0
-            
-        multiplier = 2 / (period + 1)
-        ema = prices[0]
-        
-        for price in prices[1:]:
-            ema = (price - ema) * multiplier + ema
-            
-        return float(ema)
+    def _calculate_latest_indicators(self, prices: np.ndarray) -> Dict[str, Any]:
+        # Window indicators only need the tail; EMAs need the full recursion
+        def tail(period: int) -> np.ndarray:
+            if prices.shape[1] < period:
+                return np.full((prices.shape[0], 1), np.nan)
+            return prices[:, -period:]
 
-    def _calculate_rsi(self, data: Dict[str, Any], period: int = 14) -> float:
-        prices = data.get('price_history', [])
-        if not len(prices) >= period:
-            return 0.0
-            
-        deltas = np.diff(prices)
-        gain = np.where(deltas > 0, deltas, 0)
-        loss = np.where(deltas < 0, -deltas, 0)
-        
-        avg_gain = np.mean(gain[-period:])
-        avg_loss = np.mean(loss[-period:])
-        
-        if avg_loss == 0:
-            return 100.0
-            
-        rs = avg_gain / avg_loss
-        return float(100 - (100 / (1 + rs)))
+        macd = macd_series(prices, 12, 26, 9)
+        window = tail(20)
+        middle = window.mean(axis=1)
+        std = window.std(axis=1)
 
-    def _calculate_macd(self, data: Dict[str, Any]) -> Dict[str, float]:
-        prices = data.get('price_history', [])
-        if not len(prices) >= 26:
-            return {}
-            
-        ema_12 = self._calculate_ema(prices, 12)
-        ema_26 = self._calculate_ema(prices, 26)
-        macd_line = ema_12 - ema_26
-        signal_line = self._calculate_ema([macd_line], 9)
-        
         return {
-            'macd_line': float(macd_line),
-            'signal_line': float(signal_line),
-            'histogram': float(macd_line - signal_line)
+            'moving_averages': {
+                'sma_20': middle,
+                'sma_50': tail(50).mean(axis=1),
+                'ema_20': ema_series(prices, 20)[:, -1],
+                'ema_50': ema_series(prices, 50)[:, -1]
+            },
+            'rsi': rsi_series(prices[:, -15:], 14)[:, -1],
+            'macd': {key: values[:, -1] for key, values in macd.items()},
+            'bollinger_bands': {
+                'middle': middle,
+                'upper': middle + 2 * std,
+                'lower': middle - 2 * std
+            }
         }
 
-    def _calculate_bollinger_bands(
+    def _indicators_at(
         self,
-        data: Dict[str, Any],
-        period: int = 20,
-        std_dev: int = 2
-    ) -> Dict[str, float]:
-        prices = data.get('price_history', [])
-        if not len(prices) >= period:
-            return {}
-            
-        sma = np.mean(prices[-period:])
-        std = np.std(prices[-period:])
-        
+        latest: Dict[str, Any],
+        row: int,
+        length: int
+    ) -> Dict[str, Any]:
+        # Same shape and warm-up rules as IndicatorState.indicators()
+        def row_values(group: Dict[str, np.ndarray]) -> Dict[str, float]:
+            return {key: float(values[row]) for key, values in group.items()}
+
+        return {
+            'moving_averages': row_values(latest['moving_averages']) if length >= 50 else {},
+            'rsi': float(latest['rsi'][row]) if length >= 14 else 0.0,
+            'macd': row_values(latest['macd']) if length >= 26 else {},
+            'bollinger_bands': row_values(latest['bollinger_bands']) if length >= 20 else {}
+        }
+
+    def _generate_signal_series(self, indicators: Dict[str, Any]) -> Dict[str, np.ndarray]:
+        # Same rules as _generate_signals, one label per bar ('' while warming up)
+        ma = indicators['moving_averages']
+        rsi = indicators['rsi']
+        histogram = indicators['macd']['histogram']
+
         return {
-            'middle': float(sma),
-            'upper': float(sma + (std_dev * std)),
-            'lower': float(sma - (std_dev * std))
+            'ma_trend': np.select(
+                [np.isnan(ma['sma_50']), ma['sma_20'] > ma['sma_50']],
+                ['', 'bullish'],
+                'bearish'
+            ),
+            'rsi': np.select(
+                [np.isnan(rsi) | (rsi == 0), rsi > 70, rsi < 30],
+                ['', 'overbought', 'oversold'],
+                'neutral'
+            ),
+            'macd': np.select(
+                [np.isnan(indicators['macd']['macd_line']), histogram > 0],
+                ['', 'bullish'],
+                'bearish'
+            )
         }
 
     def _generate_signals(self, indicators: Dict[str, Any]) -> Dict[str, str]:
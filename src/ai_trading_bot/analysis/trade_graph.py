@@ -0,0 +1,156 @@
+import heapq
+import itertools
+from collections import defaultdict, deque
+from datetime import datetime
+from typing import Dict, Any, Hashable, List, Optional
+from .history import overlap_end
+
+
+def trade_timestamp(trade: Dict[str, Any]) -> Optional[float]:
+    # None for untimed trades; the graph stamps them with its data clock
+    if trade.get('timestamp') is None:
+        return None
+    return to_timestamp(trade['timestamp'])
+
+def trade_key(trade: Dict[str, Any], arrival: Optional[int] = None) -> Hashable:
+    # Identity used to skip trades already in the graph: the trade id when
+    # there is one, else its timed contents. An untimed trade without an
+    # id can't be told from a repeated identical leg, so it is keyed by
+    # its arrival and only skipped when a list overlap shows it was seen
+    for field in ('id', 'trade_id', 'txid'):
+        if trade.get(field) is not None:
+            return (field, trade[field])
+    if trade.get('timestamp') is None:
+        return ('arrival', arrival)
+    return (
+        trade['seller'], trade['buyer'], str(trade['timestamp']),
+        trade.get('volume', trade.get('amount')), trade.get('price')
+    )
+
+def to_timestamp(value: Any) -> float:
+    # Epoch seconds from an ISO string, datetime or number
+    if isinstance(value, str):
+        return datetime.fromisoformat(value).timestamp()
+    if isinstance(value, datetime):
+        return value.timestamp()
+    return float(value)
+
+
+class TradeGraph:
+    """Directed seller -> buyer graph of recent trades.
+
+    Edges older than `window_seconds` before the latest trade expire in
+    timestamp order, whatever order they arrived in; a trade already older
+    than the window when it arrives is not added. The clock only follows
+    trade timestamps: an untimed trade is stamped with the latest one seen
+    (or, before any, with the first one to arrive). Each new
+    edge is checked only for the cycles it closes, up to `max_cycle_length`
+    addresses (A -> B -> A, A -> B -> C -> A), so the cost per trade depends
+    on the local degree rather than on the length of the tape. A trade
+    already in the window (same id, or same timed contents) is ignored,
+    and `update` follows a grown or slid trade list by matching the last
+    OVERLAP trades it read, so overlapping batches never add duplicate
+    edges while repeated identical legs are all kept.
+    """
+
+    OVERLAP = 16
+
+    def __init__(self, window_seconds: float = 3600.0, max_cycle_length: int = 3):
+        self.window_seconds = window_seconds
+        self.max_cycle_length = max_cycle_length
+        self.reset()
+
+    def reset(self) -> None:
+        self.edges: Dict[str, Dict[str, int]] = defaultdict(dict)
+        # Min-heap of (timestamp, arrival, seller, buyer, key)
+        self.expiry: List[tuple] = []
+        self.arrivals = itertools.count()
+        self.latest = float('-inf')
+        self.seen: set = set()
+        self.count = 0
+        self.tail: deque = deque(maxlen=self.OVERLAP)
+
+    def __len__(self) -> int:
+        return len(self.expiry)
+
+    def expire(self, now: float) -> None:
+        cutoff = now - self.window_seconds
+        while self.expiry and self.expiry[0][0] < cutoff:
+            _, _, seller, buyer, key = heapq.heappop(self.expiry)
+            self.seen.discard(key)
+            targets = self.edges[seller]
+            targets[buyer] -= 1
+            if not targets[buyer]:
+                del targets[buyer]
+                if not targets:
+                    del self.edges[seller]
+
+    def add_trade(self, trade: Dict[str, Any]) -> Optional[List[str]]:
+        # Returns the addresses of a cycle closed by this trade, if any
+        seller, buyer = trade['seller'], trade['buyer']
+        timestamp = trade_timestamp(trade)
+        if timestamp is None:
+            timestamp = self.latest
+        elif self.latest == float('-inf') and self.expiry:
+            self._stamp_untimed(timestamp)
+        # A late trade does not move the clock back
+        self.latest = max(self.latest, timestamp)
+        self.expire(self.latest)
+        if timestamp < self.latest - self.window_seconds:
+            return None
+
+        arrival = next(self.arrivals)
+        key = trade_key(trade, arrival)
+        if key in self.seen:
+            return None
+        self.seen.add(key)
+
+        cycle = [seller] if seller == buyer else self._find_cycle(seller, buyer)
+
+        targets = self.edges[seller]
+        targets[buyer] = targets.get(buyer, 0) + 1
+        heapq.heappush(self.expiry, (timestamp, arrival, seller, buyer, key))
+        return cycle
+
+    def _stamp_untimed(self, timestamp: float) -> None:
+        # Untimed trades that arrived before the clock started take the
+        # first trade timestamp; they are the only edges in the graph then
+        self.expiry = [(timestamp,) + entry[1:] for entry in self.expiry]
+        heapq.heapify(self.expiry)
+
+    def _find_cycle(self, seller: str, buyer: str) -> Optional[List[str]]:
+        # Depth-limited search for a path buyer -> ... -> seller
+        return self._search([seller, buyer])
+
+    def _search(self, path: List[str]) -> Optional[List[str]]:
+        targets = self.edges.get(path[-1], {})
+        if path[0] in targets:
+            return path
+        if len(path) >= self.max_cycle_length:
+            return None
+
+        for target in targets:
+            if target not in path:
+                cycle = self._search(path + [target])
+                if cycle:
+                    return cycle
+        return None
+
+    def update(self, trades: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        # Feed only the trades appended (or slid in) since the last call; a
+        # replaced list is fed from the start, and trades it shares with
+        # the old one are skipped as duplicates where their key allows
+        start = overlap_end(trades, self.tail, self.count)
+        if start is None:
+            start = 0
+            self.tail.clear()
+
+        evidence = []
+        for trade in trades[start:]:
+            cycle = self.add_trade(trade)
+            if cycle:
+                evidence.append({'trade': trade, 'cycle': cycle})
+
+        self.count = len(trades)
+        self.tail.extend(trades[start:][-self.OVERLAP:])
+        return evidence
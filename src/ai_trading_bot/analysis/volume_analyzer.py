@@ -1,7 +1,7 @@
 import logging
 from typing import Dict, Any
-import numpy as np
 from datetime import datetime
+from .snapshot import MarketSnapshot
 
 class VolumeAnalyzer:
     def __init__(self):
@@ -9,6 +9,7 @@ class VolumeAnalyzer:
 
     async def analyze_volume(self, market_data: Dict[str, Any]) -> Dict[str, Any]:
         try:
+            market_data = MarketSnapshot.of(market_data)
             volume_profile = self._calculate_volume_profile(market_data)
             liquidity_analysis = self._analyze_liquidity(market_data)
             
@@ -22,14 +23,14 @@ class VolumeAnalyzer:
             return {}
 
     def _calculate_volume_profile(self, data: Dict[str, Any]) -> Dict[str, float]:
-        volumes = data.get('volume_history', [])
-        if not volumes:
+        snapshot = MarketSnapshot.of(data)
+        if not len(snapshot.volumes):
             return {}
             
         return {
-            'average_volume': float(np.mean(volumes)),
-            'recent_volume': float(np.mean(volumes[-24:])),
-            'volume_trend': float(np.mean(volumes[-24:]) / np.mean(volumes))
+            'average_volume': snapshot.volume_mean(),
+            'recent_volume': snapshot.volume_mean(24),
+            'volume_trend': float(snapshot.volume_mean(24) / snapshot.volume_mean())
         }
 
     def _analyze_liquidity(self, data: Dict[str, Any]) -> Dict[str, Any]:
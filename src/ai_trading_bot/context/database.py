@@ -53,5 +53,13 @@ class Database:
             self.logger.error(f"Database error: {e}")
             raise
 
+    def executemany(self, query, rows):
+        try:
+            self.cursor.executemany(query, rows)
+            self.conn.commit()
+        except sqlite3.Error as e:
+            self.logger.error(f"Database error: {e}")
+            raise
+
     def close(self):
         self.conn.close()
\ No newline at end of file
@@ -1,7 +1,7 @@
 import json
 import logging
 from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from pathlib import Path
 import sqlite3
 from .database import Database
@@ -22,6 +22,15 @@ class ContextManager:
                 updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             )
         ''')
+        self.db.execute('''
+            CREATE TABLE IF NOT EXISTS behavior_score_rows (
+                behavior_type TEXT NOT NULL,
+                identifier TEXT NOT NULL,
+                score REAL NOT NULL,
+                last_updated TEXT,
+                PRIMARY KEY (behavior_type, identifier)
+            )
+        ''')
 
     def save_behavior_scores(self, behavior_scores: Dict[str, Any]) -> None:
         try:
@@ -30,21 +39,50 @@ class ContextManager:
                 INSERT OR REPLACE INTO behavior_scores (id, data, updated_at)
                 VALUES (?, ?, CURRENT_TIMESTAMP)
             ''', (1, behavior_scores_json))
+            # The full table supersedes any rows upserted before it
+            self.db.execute('DELETE FROM behavior_score_rows')
             self.logger.info("Behavior scores saved successfully")
         except Exception as e:
             self.logger.error(f"Failed to save behavior scores: {e}")
             raise
 
+    def upsert_behavior_scores(self, records: List[Dict[str, Any]]) -> None:
+        # One row per (behavior_type, identifier), so a batch writes only
+        # the scores it changed
+        try:
+            self.db.executemany('''
+                INSERT OR REPLACE INTO behavior_score_rows
+                    (behavior_type, identifier, score, last_updated)
+                VALUES (?, ?, ?, ?)
+            ''', [
+                (record['behavior_type'], record['identifier'], record['score'], record['last_updated'])
+                for record in records
+            ])
+            self.logger.info(f"Upserted {len(records)} behavior scores")
+        except Exception as e:
+            self.logger.error(f"Failed to upsert behavior scores: {e}")
+            raise
+
     def get_behavior_scores(self) -> Optional[Dict[str, Any]]:
+        # The saved table, followed by the upserted rows that supersede it
         try:
             result = self.db.execute(
                 'SELECT data FROM behavior_scores WHERE id = ?',
                 (1,)
             )
-            if result:
-                behavior_scores_json = result[0][0]
-                return json.loads(behavior_scores_json)
-            return None
+            rows = self.db.execute(
+                'SELECT behavior_type, identifier, score, last_updated FROM behavior_score_rows'
+            )
+            if not result and not rows:
+                return None
+
+            behavior_scores = json.loads(result[0][0]) if result else {'behavior_scores': []}
+            behavior_scores['behavior_scores'] = behavior_scores.get('behavior_scores', []) + [
+                {'behavior_type': behavior_type, 'identifier': identifier,
+                 'score': score, 'last_updated': last_updated}
+                for behavior_type, identifier, score, last_updated in rows
+            ]
+            return behavior_scores
         except Exception as e:
             self.logger.error(f"Failed to retrieve behavior scores: {e}")
             return None
@@ -1,9 +1,13 @@
 from .adaptive_learner import AdaptiveLearner
 from .pattern_recognizer import PatternRecognizer
 from .strategy_optimizer import StrategyOptimizer
+from .checkpoint import Checkpointer
+from .population import StrategyPopulation
 
 __all__ = [
     'AdaptiveLearner',
     'PatternRecognizer',
-    'StrategyOptimizer'
+    'StrategyOptimizer',
+    'Checkpointer',
+    'StrategyPopulation'
 ]
\ No newline at end of file
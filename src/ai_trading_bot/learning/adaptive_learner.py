@@ -1,9 +1,14 @@
 import logging
-from typing import Dict, Any, List
+import hashlib
+import json
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
 import numpy as np
-from dataclasses import dataclass
-from collections import defaultdict
+from dataclasses import dataclass, asdict
+from collections import defaultdict, OrderedDict
+from ..analysis.snapshot import MarketSnapshot, window_matrix
+from .conditions import ConditionIndex
+from .pattern_keys import PatternQuantizer
 
 @dataclass
 class LearningPattern:
@@ -16,13 +21,44 @@ class LearningPattern:
     outcomes: List[Dict[str, Any]]
 
 class AdaptiveLearner:
-    def __init__(self):
+    """Learns market patterns and how well trading on them worked.
+
+    analyze_and_adapt runs one learning step for one market.
+    analyze_and_adapt_many runs it for many markets keyed by asset in a
+    single step: the price and volume patterns of every market come from
+    one pass over a window matrix, each market's new patterns are
+    registered in order, trading results update the pattern and strategy
+    effectiveness once, and adaptations for every market come from one
+    pattern x market similarity matrix.
+    """
+
+    PATTERN_WINDOW = 10
+
+    def __init__(
+        self,
+        max_patterns: int = 5000,
+        eviction: str = 'least_effective',
+        quantizer: Optional[PatternQuantizer] = None
+    ):
+        if eviction not in ('lru', 'least_effective'):
+            raise ValueError(f"Unknown eviction policy: {eviction}")
+
         self.logger = logging.getLogger('ai_trading_bot.learning.adaptive')
-        self.patterns: Dict[str, LearningPattern] = {}
+        # Kept in least- to most-recently-seen order for eviction
+        self.patterns: Dict[str, LearningPattern] = OrderedDict()
+        self.max_patterns = max_patterns
+        self.eviction = eviction
+        self.quantizer = quantizer or PatternQuantizer()
+        self.condition_index = ConditionIndex()
+        # The pattern table and index version the index was last synced
+        # with; pattern changes go through the learner's own helpers
+        self._indexed_patterns = self.patterns
+        self._indexed_version = self.condition_index.version
         self.strategy_effectiveness: Dict[str, float] = defaultdict(float)
         self.market_memory: List[Dict[str, Any]] = []
         self.adaptation_threshold = 0.6
         self.learning_rate = 0.1
+        self.similarity_threshold = 0.8
 
     async def analyze_and_adapt(
         self,
@@ -31,22 +67,15 @@ class AdaptiveLearner:
         manipulation_data: Dict[str, Any]
     ) -> Dict[str, Any]:
         try:
-            # Identify new patterns
-            new_patterns = self._identify_new_patterns(market_data, manipulation_data)
-            
-            # Update existing patterns
-            self._update_pattern_effectiveness(trading_results)
-            
-            # Adapt strategies
-            adaptations = self._generate_adaptations(market_data)
-            
-            # Evolve decision weights
-            self._evolve_decision_weights(trading_results)
-            
+            new_patterns, adaptations = self._learn(
+                [MarketSnapshot.of(market_data)],
+                trading_results
+            )
+
             return {
                 'timestamp': datetime.now().isoformat(),
-                'new_patterns': new_patterns,
-                'adaptations': adaptations,
+                'new_patterns': new_patterns[0],
+                'adaptations': adaptations[0],
                 'effectiveness': dict(self.strategy_effectiveness)
             }
             
@@ -54,21 +83,85 @@ class AdaptiveLearner:
             self.logger.error(f"Adaptation analysis failed: {e}")
             return {}
 
+    async def analyze_and_adapt_many(
+        self,
+        market_data: Dict[str, Dict[str, Any]],
+        trading_results: Dict[str, Any],
+        manipulation_data: Optional[Dict[str, Dict[str, Any]]] = None
+    ) -> Dict[str, Any]:
+        # Market (and manipulation) data keyed by asset; new patterns and
+        # adaptations come back keyed the same way
+        try:
+            assets = list(market_data)
+            new_patterns, adaptations = self._learn(
+                [MarketSnapshot.of(market_data[asset]) for asset in assets],
+                trading_results
+            )
+
+            return {
+                'timestamp': datetime.now().isoformat(),
+                'new_patterns': dict(zip(assets, new_patterns)),
+                'adaptations': dict(zip(assets, adaptations)),
+                'effectiveness': dict(self.strategy_effectiveness)
+            }
+
+        except Exception as e:
+            self.logger.error(f"Batch adaptation analysis failed: {e}")
+            return {}
+
+    def _learn(
+        self,
+        snapshots: List[MarketSnapshot],
+        trading_results: Dict[str, Any]
+    ) -> Tuple[List[List[Dict[str, Any]]], List[List[Dict[str, Any]]]]:
+        # Identify new patterns
+        new_patterns = self._identify_new_patterns_many(snapshots)
+
+        # Update existing patterns
+        self._update_pattern_effectiveness(trading_results)
+
+        # Adapt strategies
+        adaptations = self._generate_adaptations_many(snapshots)
+
+        # Evolve decision weights
+        self._evolve_decision_weights(trading_results)
+
+        return new_patterns, adaptations
+
     def _identify_new_patterns(
         self,
         market_data: Dict[str, Any],
         manipulation_data: Dict[str, Any]
+    ) -> List[Dict[str, Any]]:
+        return self._identify_new_patterns_many([MarketSnapshot.of(market_data)])[0]
+
+    def _identify_new_patterns_many(
+        self,
+        snapshots: List[MarketSnapshot]
+    ) -> List[List[Dict[str, Any]]]:
+        # Analyze market behavior patterns of every market at once, then
+        # register them market by market
+        found = self._extract_market_patterns_many(snapshots)
+        return [
+            self._register_patterns(patterns, snapshot.get('conditions', {}))
+            for snapshot, patterns in zip(snapshots, found)
+        ]
+
+    def _register_patterns(
+        self,
+        current_patterns: List[Dict[str, Any]],
+        conditions: Dict[str, Any]
     ) -> List[Dict[str, Any]]:
         new_patterns = []
-        
-        # Analyze market behavior patterns
-        current_patterns = self._extract_market_patterns(market_data)
-        
+
         # Check for previously unknown patterns
         for pattern in current_patterns:
             pattern_id = self._generate_pattern_id(pattern)
             
-            if pattern_id not in self.patterns:
+            if pattern_id in self.patterns:
+                self.patterns[pattern_id].last_seen = datetime.now()
+                self.patterns.move_to_end(pattern_id)
+            else:
                 # New pattern discovered
                 new_pattern = LearningPattern(
                     pattern_id=pattern_id,
@@ -76,11 +169,15 @@ class AdaptiveLearner:
                     effectiveness=0.5,  # Initial neutral effectiveness
                     last_seen=datetime.now(),
                     success_rate=0.0,
-                    market_conditions=market_data.get('conditions', {}),
+                    market_conditions=conditions,
                     outcomes=[]
                 )
                 
+                if len(self.patterns) >= self.max_patterns:
+                    self._evict_pattern()
                 self.patterns[pattern_id] = new_pattern
+                self.condition_index.add(pattern_id, new_pattern.market_conditions)
+                self._indexed_version = self.condition_index.version
                 new_patterns.append(pattern)
                 
                 self.logger.info(f"New pattern discovered: {pattern['type']}")
@@ -88,55 +185,64 @@ class AdaptiveLearner:
         return new_patterns
 
     def _extract_market_patterns(self, market_data: Dict[str, Any]) -> List[Dict[str, Any]]:
-        patterns = []
-        
-        # Price action patterns
-        if price_pattern := self._analyze_price_pattern(market_data):
-            patterns.append(price_pattern)
-        
-        # Volume patterns
-        if volume_pattern := self._analyze_volume_pattern(market_data):
-            patterns.append(volume_pattern)
-        
-        # Order flow patterns
-        if order_pattern := self._analyze_order_pattern(market_data):
-            patterns.append(order_pattern)
-        
-        return patterns
+        return self._extract_market_patterns_many([MarketSnapshot.of(market_data)])[0]
 
-    def _analyze_price_pattern(self, data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
-        prices = data.get('price_history', [])
-        if len(prices) < 10:
-            return None
-            
-        recent_prices = prices[-10:]
-        price_changes = np.diff(recent_prices)
-        
-        pattern = {
-            'type': 'price_pattern',
-            'direction': 'up' if sum(price_changes) > 0 else 'down',
-            'volatility': float(np.std(price_changes)),
-            'magnitude': float(abs(sum(price_changes)))
-        }
-        
-        return pattern
+    def _extract_market_patterns_many(
+        self,
+        snapshots: List[MarketSnapshot]
+    ) -> List[List[Dict[str, Any]]]:
+        # Price and volume action over the last PATTERN_WINDOW values of
+        # every market in one pass; order flow market by market
+        price_ready, price_change, price_volatility = self._window_changes(
+            [snapshot.prices for snapshot in snapshots]
+        )
+        volume_ready, volume_change, volume_volatility = self._window_changes(
+            [snapshot.volumes for snapshot in snapshots]
+        )
 
-    def _analyze_volume_pattern(self, data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
-        volumes = data.get('volume_history', [])
-        if len(volumes) < 10:
-            return None
-            
-        recent_volumes = volumes[-10:]
-        volume_changes = np.diff(recent_volumes)
-        
-        pattern = {
-            'type': 'volume_pattern',
-            'trend': 'increasing' if sum(volume_changes) > 0 else 'decreasing',
-            'volatility': float(np.std(volume_changes)),
-            'magnitude': float(abs(sum(volume_changes)))
-        }
-        
-        return pattern
+        all_patterns = []
+        for i, snapshot in enumerate(snapshots):
+            patterns = []
+
+            # Price action patterns
+            if price_ready[i]:
+                patterns.append({
+                    'type': 'price_pattern',
+                    'direction': 'up' if price_change[i] > 0 else 'down',
+                    'volatility': float(price_volatility[i]),
+                    'magnitude': float(abs(price_change[i]))
+                })
+
+            # Volume patterns
+            if volume_ready[i]:
+                patterns.append({
+                    'type': 'volume_pattern',
+                    'trend': 'increasing' if volume_change[i] > 0 else 'decreasing',
+                    'volatility': float(volume_volatility[i]),
+                    'magnitude': float(abs(volume_change[i]))
+                })
+
+            # Order flow patterns
+            if order_pattern := self._analyze_order_pattern(snapshot):
+                patterns.append(order_pattern)
+
+            all_patterns.append(patterns)
+
+        return all_patterns
+
+    def _window_changes(
+        self,
+        series: List[np.ndarray]
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        # Per series: whether it holds a full window, and the net change and
+        # volatility of the step changes over its last PATTERN_WINDOW values
+        ready = np.fromiter(
+            (len(values) >= self.PATTERN_WINDOW for values in series),
+            dtype=bool,
+            count=len(series)
+        )
+        changes = np.diff(window_matrix(series, self.PATTERN_WINDOW), axis=1)
+        return ready, changes.sum(axis=1), changes.std(axis=1)
 
     def _analyze_order_pattern(self, data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         orders = data.get('order_history', [])
@@ -156,54 +262,54 @@ class AdaptiveLearner:
         return pattern
 
     def _update_pattern_effectiveness(self, trading_results: Dict[str, Any]) -> None:
-        for pattern_id, pattern in self.patterns.items():
-            # Update pattern with recent trading results
-            if relevant_trades := self._find_relevant_trades(pattern, trading_results):
-                success_rate = sum(
-                    1 for trade in relevant_trades if trade['success']
-                ) / len(relevant_trades)
-                
-                # Update pattern effectiveness using exponential moving average
-                pattern.effectiveness = (
-                    pattern.effectiveness * (1 - self.learning_rate) +
-                    success_rate * self.learning_rate
-                )
-                
-                pattern.success_rate = success_rate
-                pattern.outcomes.extend(relevant_trades)
-                
-                # Trim old outcomes to prevent memory bloat
-                if len(pattern.outcomes) > 100:
-                    pattern.outcomes = pattern.outcomes[-100:]
+        trades = trading_results.get('trades', [])
+        if not trades or not self.patterns:
+            return
 
-    def _find_relevant_trades(
-        self,
-        pattern: LearningPattern,
-        trading_results: Dict[str, Any]
-    ) -> List[Dict[str, Any]]:
-        relevant_trades = []
-        
-        for trade in trading_results.get('trades', []):
-            if self._is_trade_relevant_to_pattern(trade, pattern):
-                relevant_trades.append(trade)
-                
-        return relevant_trades
+        # Every pattern against every trade in one similarity matrix
+        relevant = self._condition_similarity_matrix(
+            [trade.get('market_conditions', {}) for trade in trades]
+        ) > self.similarity_threshold
 
-    def _is_trade_relevant_to_pattern(
-        self,
-        trade: Dict[str, Any],
-        pattern: LearningPattern
-    ) -> bool:
-        # Check if trade occurred under similar market conditions
-        trade_conditions = trade.get('market_conditions', {})
-        pattern_conditions = pattern.market_conditions
-        
-        similarity_score = self._calculate_condition_similarity(
-            trade_conditions,
-            pattern_conditions
-        )
-        
-        return similarity_score > 0.8
+        for row in np.flatnonzero(relevant.any(axis=1)):
+            pattern = self.patterns[self.condition_index.ids[row]]
+            relevant_trades = [trades[j] for j in np.flatnonzero(relevant[row])]
+
+            success_rate = sum(
+                1 for trade in relevant_trades if trade['success']
+            ) / len(relevant_trades)
+
+            # Update pattern effectiveness using exponential moving average
+            pattern.effectiveness = (
+                pattern.effectiveness * (1 - self.learning_rate) +
+                success_rate * self.learning_rate
+            )
+
+            pattern.success_rate = success_rate
+            pattern.outcomes.extend(relevant_trades)
+
+            # Trim old outcomes to prevent memory bloat
+            if len(pattern.outcomes) > 100:
+                pattern.outcomes = pattern.outcomes[-100:]
+
+    def _condition_similarity_matrix(self, conditions: List[Dict[str, Any]]) -> np.ndarray:
+        # Rows follow condition_index.ids; rebuilt if the index or the
+        # pattern table was changed other than through the learner, even
+        # when the number of rows stayed the same
+        if (
+            self.condition_index.version != self._indexed_version or
+            self.patterns is not self._indexed_patterns or
+            len(self.condition_index) != len(self.patterns)
+        ):
+            self._rebuild_condition_index()
+        return self.condition_index.similarity(conditions)
+
+    def _rebuild_condition_index(self) -> None:
+        self.condition_index = ConditionIndex()
+        for pattern_id, pattern in self.patterns.items():
+            self.condition_index.add(pattern_id, pattern.market_conditions)
+        self._indexed_patterns = self.patterns
+        self._indexed_version = self.condition_index.version
 
     def _calculate_condition_similarity(
         self,
@@ -226,15 +332,36 @@ class AdaptiveLearner:
         return float(np.mean(similarities)) if similarities else 0.0
 
     def _generate_adaptations(self, market_data: Dict[str, Any]) -> List[Dict[str, Any]]:
-        adaptations = []
-        
+        return self._generate_adaptations_many([MarketSnapshot.of(market_data)])[0]
+
+    def _generate_adaptations_many(
+        self,
+        snapshots: List[MarketSnapshot]
+    ) -> List[List[Dict[str, Any]]]:
+        adaptations: List[List[Dict[str, Any]]] = [[] for _ in snapshots]
+        if not self.patterns:
+            return adaptations
+
+        # Similarity of every pattern to every market's current conditions
+        # at once; rows follow condition_index.ids
+        similar = self._condition_similarity_matrix(
+            [snapshot.get('conditions', {}) for snapshot in snapshots]
+        ) > self.similarity_threshold
+        rows = {pattern_id: row for row, pattern_id in enumerate(self.condition_index.ids)}
+
         # Analyze pattern effectiveness
-        for pattern_id, pattern in self.patterns.items():
+        for pattern_id, pattern in list(self.patterns.items()):
             if pattern.effectiveness > self.adaptation_threshold:
-                # Pattern is proven effective
-                adaptation = self._create_adaptation_strategy(pattern, market_data)
+                # Pattern is proven effective in the markets it resembles
+                markets = np.flatnonzero(similar[rows[pattern_id]])
+                if not len(markets):
+                    continue
+                adaptation = self._create_adaptation_strategy(
+                    pattern, snapshots[markets[0]], True
+                )
                 if adaptation:
-                    adaptations.append(adaptation)
+                    for i in markets:
+                        adaptations[i].append(dict(adaptation))
             elif pattern.effectiveness < (1 - self.adaptation_threshold):
                 # Pattern is proven ineffective
                 self._deprecate_pattern(pattern_id)
@@ -244,12 +371,15 @@ class AdaptiveLearner:
     def _create_adaptation_strategy(
         self,
         pattern: LearningPattern,
-        market_data: Dict[str, Any]
+        market_data: Dict[str, Any],
+        similar: Optional[bool] = None
     ) -> Optional[Dict[str, Any]]:
         try:
-            current_conditions = market_data.get('conditions', {})
+            if similar is None:
+                current_conditions = market_data.get('conditions', {})
+                similar = self._are_conditions_similar(current_conditions, pattern.market_conditions)
             
-            if self._are_conditions_similar(current_conditions, pattern.market_conditions):
+            if similar:
                 return {
                     'pattern_id': pattern.pattern_id,
                     'type': pattern.pattern_type,
@@ -295,12 +425,27 @@ class AdaptiveLearner:
         conditions2: Dict[str, Any]
     ) -> bool:
         similarity = self._calculate_condition_similarity(conditions1, conditions2)
-        return similarity > 0.8
+        return similarity > self.similarity_threshold
 
     def _deprecate_pattern(self, pattern_id: str) -> None:
         if pattern_id in self.patterns:
             self.logger.info(f"Deprecating ineffective pattern: {pattern_id}")
-            del self.patterns[pattern_id]
+            self._remove_pattern(pattern_id)
+
+    def _evict_pattern(self) -> None:
+        # Least effective pattern, oldest first among ties; or plain LRU
+        if self.eviction == 'lru':
+            pattern_id = next(iter(self.patterns))
+        else:
+            pattern_id = min(self.patterns.values(), key=lambda p: p.effectiveness).pattern_id
+        self.logger.debug(f"Evicting pattern: {pattern_id}")
+        self._remove_pattern(pattern_id)
+
+    def _remove_pattern(self, pattern_id: str) -> None:
+        del self.patterns[pattern_id]
+        if pattern_id in self.condition_index:
+            self.condition_index.remove(pattern_id)
+            self._indexed_version = self.condition_index.version
 
     def _evolve_decision_weights(self, trading_results: Dict[str, Any]) -> None:
         for strategy, trades in self._group_trades_by_strategy(trading_results).items():
@@ -336,6 +481,24 @@ class AdaptiveLearner:
         return successful_trades / len(trades)
 
     def _generate_pattern_id(self, pattern: Dict[str, Any]) -> str:
-        # Create unique identifier for pattern
-        pattern_str = f"{pattern['type']}_{sorted(pattern.items())}"
-        return str(abs(hash(pattern_str)))
\ No newline at end of file
+        # Content hash of the quantized pattern: nearby states share it and
+        # it is stable across processes, unlike the salted built-in hash()
+        pattern = self.quantizer.quantize(pattern)
+        pattern_str = json.dumps(pattern, sort_keys=True, default=str)
+        return hashlib.blake2b(pattern_str.encode(), digest_size=8).hexdigest()
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            'patterns': [asdict(pattern) for pattern in self.patterns.values()],
+            'strategy_effectiveness': dict(self.strategy_effectiveness),
+            'market_memory': list(self.market_memory)
+        }
+
+    def restore(self, state: Dict[str, Any]) -> None:
+        self.patterns = OrderedDict(
+            (item['pattern_id'], LearningPattern(**item))
+            for item in state.get('patterns', [])
+        )
+        self.strategy_effectiveness = defaultdict(float, state.get('strategy_effectiveness', {}))
+        self.market_memory = list(state.get('market_memory', []))
+        self._rebuild_condition_index()
\ No newline at end of file
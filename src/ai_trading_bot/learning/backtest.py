@@ -0,0 +1,203 @@
+from typing import Dict, Any, List, Sequence
+import numpy as np
+
+
+def _sma(values: np.ndarray, prefix: np.ndarray, period: int, n: int) -> np.ndarray:
+    # SMAs ending at bars 0..n-1 from prefix sums of values - values[0];
+    # NaN until the window is full
+    out = np.full(n, np.nan)
+    if period <= n:
+        out[period - 1:] = (prefix[period:n + 1] - prefix[:n + 1 - period]) / period + values[0]
+    return out
+
+
+class VectorizedBacktester:
+    """Long-only moving-average crossover backtest for many parameter sets.
+
+    Recognised parameters (others are ignored):
+      fast_period / slow_period  SMA lengths (defaults 10 / 30)
+      threshold                  minimum relative gap fast/slow - 1 to hold
+      min_volume_ratio           volume must be at least this multiple of
+                                 its slow_period average to hold (0 = off)
+
+    The position decided at bar t earns the return from t to t + 1, less
+    `fee` per unit of position change. Positions are built as a (parameter
+    sets x time) matrix in row chunks of at most `chunk_elements`. The
+    sums behind Sharpe and total return come from one matrix product of
+    that matrix with the per-bar returns. Each trade's P&L is a difference
+    of cumulative returns between its entry and exit bars.
+    """
+
+    DEFAULTS = {'fast_period': 10, 'slow_period': 30, 'threshold': 0.0, 'min_volume_ratio': 0.0}
+    METRICS = ('win_rate', 'profit_factor', 'sharpe_ratio', 'total_return', 'trades')
+
+    def __init__(
+        self,
+        fee: float = 0.0,
+        periods_per_year: float = 365,
+        chunk_elements: int = 1 << 24
+    ):
+        self.fee = fee
+        self.periods_per_year = periods_per_year
+        self.chunk_elements = chunk_elements
+
+    def _parameter_arrays(self, parameter_sets: Sequence[Dict[str, Any]]) -> Dict[str, np.ndarray]:
+        arrays = {
+            name: np.array([params.get(name, default) for params in parameter_sets], dtype=float)
+            for name, default in self.DEFAULTS.items()
+        }
+        for name in ('fast_period', 'slow_period'):
+            arrays[name] = np.maximum(1, np.round(arrays[name])).astype(int)
+        return arrays
+
+    def run(
+        self,
+        prices: Sequence[float],
+        parameter_sets: Sequence[Dict[str, Any]],
+        volumes: Sequence[float] = None
+    ) -> Dict[str, np.ndarray]:
+        prices = np.asarray(prices, dtype=float)
+        n_sets, n_bars = len(parameter_sets), len(prices)
+        results = {name: np.zeros(n_sets) for name in self.METRICS}
+        if n_sets == 0 or n_bars < 2:
+            return results
+
+        params = self._parameter_arrays(parameter_sets)
+        steps = n_bars - 1
+        prefixes = {'price': (prices, np.concatenate([[0.0], np.cumsum(prices - prices[0])]))}
+
+        use_volume = (
+            volumes is not None and len(volumes) == n_bars and
+            bool(params['min_volume_ratio'].any())
+        )
+        if use_volume:
+            volumes = np.asarray(volumes, dtype=float)
+            prefixes['volume'] = (volumes, np.concatenate([[0.0], np.cumsum(volumes - volumes[0])]))
+
+        # SMAs are shared by every parameter set with the same period; sets
+        # are visited in period order so the cache stays small
+        cache: Dict[tuple, np.ndarray] = {}
+
+        def sma(series: str, period: int) -> np.ndarray:
+            key = (series, period)
+            if key not in cache:
+                if len(cache) * steps >= self.chunk_elements:
+                    cache.clear()
+                values, prefix = prefixes[series]
+                cache[key] = _sma(values, prefix, period, steps)
+            return cache[key]
+
+        # Positions are decided on bars 0..n-2 and earn the next bar's return
+        returns = prices[1:] / prices[:-1] - 1
+        basis = np.column_stack([returns, returns ** 2, np.log1p(returns)])
+        cumulative = np.concatenate([[0.0], np.cumsum(returns)])
+
+        order = np.lexsort((params['slow_period'], params['fast_period']))
+        rows_per_chunk = max(1, self.chunk_elements // n_bars)
+
+        for start in range(0, n_sets, rows_per_chunk):
+            rows = order[start:start + rows_per_chunk]
+            position = np.empty((len(rows), steps), dtype=bool)
+
+            # NaN during warm-up compares False, so no position is held
+            with np.errstate(invalid='ignore'):
+                for k, i in enumerate(rows):
+                    slow = sma('price', params['slow_period'][i])
+                    np.greater(sma('price', params['fast_period'][i]),
+                               slow * (1 + params['threshold'][i]), out=position[k])
+                    if use_volume and params['min_volume_ratio'][i]:
+                        average = sma('volume', params['slow_period'][i])
+                        position[k] &= volumes[:-1] >= average * params['min_volume_ratio'][i]
+
+            self._metrics(position, returns, basis, cumulative, results, rows)
+
+        return results
+
+    def _metrics(
+        self,
+        position: np.ndarray,
+        returns: np.ndarray,
+        basis: np.ndarray,
+        cumulative: np.ndarray,
+        results: Dict[str, np.ndarray],
+        rows: np.ndarray
+    ) -> None:
+        n, steps = position.shape
+        fee = self.fee
+        sums = position.astype(float) @ basis
+
+        # Trades are runs of held bars: +1/-1 in the padded diff mark the
+        # entry bar and the first bar after it. The entry is charged one fee
+        # and the exit bar, if inside the series, another
+        edges = np.diff(position.view(np.int8), axis=1, prepend=0, append=0)
+        entry_rows, entry_cols = np.nonzero(edges > 0)
+        _, exit_cols = np.nonzero(edges < 0)
+        closed = exit_cols < steps
+
+        trade_pnl = cumulative[exit_cols] - cumulative[entry_cols] - fee * (1 + closed)
+        trades = np.bincount(entry_rows, minlength=n)
+        changes = trades + np.bincount(entry_rows, weights=closed, minlength=n)
+        wins = np.bincount(entry_rows, weights=trade_pnl > 0, minlength=n)
+        profits = np.bincount(entry_rows, weights=np.maximum(trade_pnl, 0), minlength=n)
+        losses = np.bincount(entry_rows, weights=np.maximum(-trade_pnl, 0), minlength=n)
+
+        # Per-bar P&L is r on held bars, r - fee on entry bars and -fee on
+        # exit bars, so its moments follow from the matrix product
+        entry_returns = returns[entry_cols]
+        total = sums[:, 0] - fee * changes
+        squares = (
+            sums[:, 1] -
+            2 * fee * np.bincount(entry_rows, weights=entry_returns, minlength=n) +
+            fee ** 2 * changes
+        )
+        log_growth = sums[:, 2] + (changes - trades) * np.log1p(-fee) + np.bincount(
+            entry_rows,
+            weights=np.log1p(entry_returns - fee) - np.log1p(entry_returns),
+            minlength=n
+        )
+
+        mean = total / steps
+        std = np.sqrt(np.maximum(squares / steps - mean ** 2, 0.0))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            results['win_rate'][rows] = np.where(trades > 0, wins / trades, 0.0)
+            results['profit_factor'][rows] = np.where(
+                trades == 0, 0.0,
+                np.where(losses > 0, profits / losses, np.inf)
+            )
+            results['sharpe_ratio'][rows] = np.where(
+                std > 1e-15, mean / std * np.sqrt(self.periods_per_year), 0.0
+            )
+        results['total_return'][rows] = np.expm1(log_growth)
+        results['trades'][rows] = trades
+
+    def simulate(
+        self,
+        prices: Sequence[float],
+        parameters: Dict[str, Any],
+        volumes: Sequence[float] = None
+    ) -> Dict[str, float]:
+        results = self.run(prices, [parameters], volumes)
+        return {name: float(values[0]) for name, values in results.items()}
+
+
+def score_results(results: Dict[str, Any]) -> Any:
+    # Same weighting as StrategyOptimizer._evaluate_parameter_sets; works on
+    # scalars or per-parameter-set arrays
+    return (
+        np.asarray(results.get('win_rate', 0)) * 0.3 +
+        np.minimum(results.get('profit_factor', 0), 3) / 3 * 0.4 +
+        np.minimum(results.get('sharpe_ratio', 0), 3) / 3 * 0.3
+    )
+
+def score_parameter_sets(
+    backtester: VectorizedBacktester,
+    parameter_sets: Sequence[Dict[str, Any]],
+    market_data: Dict[str, Any]
+) -> List[float]:
+    # Module-level so a process pool pickles only the backtester settings
+    results = backtester.run(
+        market_data['price_history'],
+        parameter_sets,
+        market_data.get('volume_history')
+    )
+    return score_results(results).tolist()
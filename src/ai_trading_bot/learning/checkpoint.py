@@ -0,0 +1,111 @@
+import logging
+import asyncio
+import os
+import pickle
+import time
+from typing import Dict, Any, Optional
+
+MAGIC = b'AITBCKPT'
+VERSION = 2
+
+
+def encode_state(state: Dict[str, Any]) -> bytes:
+    payload = pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL)
+    return MAGIC + VERSION.to_bytes(2, 'little') + payload
+
+def write_checkpoint(path: str, data: bytes) -> None:
+    # Written to a temporary file and renamed, so a crash mid-write never
+    # leaves a truncated checkpoint behind
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+def save_state(path: str, state: Dict[str, Any]) -> None:
+    write_checkpoint(path, encode_state(state))
+
+def load_state(path: str) -> Dict[str, Any]:
+    # Only load checkpoints this process wrote itself: pickle is not safe
+    # for untrusted input
+    with open(path, 'rb') as f:
+        data = f.read()
+    if data[:len(MAGIC)] != MAGIC:
+        raise ValueError(f"Not a learner checkpoint: {path}")
+    version = int.from_bytes(data[len(MAGIC):len(MAGIC) + 2], 'little')
+    if version != VERSION:
+        raise ValueError(f"Unsupported checkpoint version: {version}")
+    return pickle.loads(data[len(MAGIC) + 2:])
+
+
+class Checkpointer:
+    """Periodic snapshots of learning components to a single binary file.
+
+    Components expose `snapshot() -> dict` and `restore(dict)`. State is
+    serialised on the event loop, so it is consistent with the components
+    between cycles; only the file write runs in a worker thread.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        components: Dict[str, Any],
+        interval_seconds: float = 300.0
+    ):
+        self.logger = logging.getLogger('ai_trading_bot.learning.checkpoint')
+        self.path = path
+        self.components = components
+        self.interval_seconds = interval_seconds
+        self._task: Optional[asyncio.Task] = None
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            'saved_at': time.time(),
+            'components': {
+                name: component.snapshot()
+                for name, component in self.components.items()
+            }
+        }
+
+    def save(self) -> None:
+        save_state(self.path, self.snapshot())
+
+    def restore(self) -> bool:
+        if not os.path.exists(self.path):
+            return False
+        try:
+            state = load_state(self.path)
+            for name, component_state in state['components'].items():
+                if name in self.components:
+                    self.components[name].restore(component_state)
+            self.logger.info(f"Restored learning state from {self.path}")
+            return True
+        except Exception as e:
+            self.logger.error(f"Failed to restore checkpoint: {e}")
+            return False
+
+    async def checkpoint(self) -> None:
+        data = encode_state(self.snapshot())
+        await asyncio.to_thread(write_checkpoint, self.path, data)
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval_seconds)
+            try:
+                await self.checkpoint()
+            except Exception as e:
+                self.logger.error(f"Checkpoint failed: {e}")
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        # Cancel the periodic task and write one final checkpoint
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.checkpoint()
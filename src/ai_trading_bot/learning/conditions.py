@@ -0,0 +1,116 @@
+from typing import Dict, Any, List, Sequence, Tuple
+import numpy as np
+
+
+def is_numeric(value: Any) -> bool:
+    return isinstance(value, (int, float))
+
+
+class ConditionIndex:
+    """Numeric market conditions of many items held as one feature matrix.
+
+    Every numeric condition key gets a fixed column; a parallel mask marks
+    which keys each row actually has. Similarity against a batch of other
+    condition dicts is then computed for all pairs at once, with the same
+    per-key score as AdaptiveLearner._calculate_condition_similarity:
+    1 - min(|a - b| / max(|a|, |b|), 1), averaged over shared numeric keys.
+    `version` changes on every add and remove, so holders can tell whether
+    the rows still match what they last synced.
+    """
+
+    # Upper bound on the size of the pairwise temporary, in elements
+    CHUNK_ELEMENTS = 1 << 20
+
+    def __init__(self, capacity: int = 64):
+        self.columns: Dict[str, int] = {}
+        self.ids: List[str] = []
+        self.positions: Dict[str, int] = {}
+        self.values = np.zeros((capacity, 0))
+        self.present = np.zeros((capacity, 0), dtype=bool)
+        self.version = 0
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __contains__(self, item_id: str) -> bool:
+        return item_id in self.positions
+
+    def _add_columns(self, conditions: Dict[str, Any]) -> None:
+        new_keys = [
+            key for key, value in conditions.items()
+            if is_numeric(value) and key not in self.columns
+        ]
+        for key in new_keys:
+            self.columns[key] = len(self.columns)
+        if new_keys:
+            padding = ((0, 0), (0, len(new_keys)))
+            self.values = np.pad(self.values, padding)
+            self.present = np.pad(self.present, padding)
+
+    def encode(self, conditions: Sequence[Dict[str, Any]]) -> Tuple[np.ndarray, np.ndarray]:
+        # Keys the index has never seen can't be shared with any row, so
+        # they are dropped rather than widening the matrix
+        values = np.zeros((len(conditions), len(self.columns)))
+        present = np.zeros((len(conditions), len(self.columns)), dtype=bool)
+        for row, item in enumerate(conditions):
+            for key, value in (item or {}).items():
+                column = self.columns.get(key)
+                if column is not None and is_numeric(value):
+                    values[row, column] = value
+                    present[row, column] = True
+        return values, present
+
+    def add(self, item_id: str, conditions: Dict[str, Any]) -> None:
+        if item_id in self.positions:
+            self.remove(item_id)
+        self._add_columns(conditions or {})
+
+        row = len(self.ids)
+        if row == len(self.values):
+            self.values = np.concatenate([self.values, np.zeros_like(self.values)])
+            self.present = np.concatenate([self.present, np.zeros_like(self.present)])
+
+        values, present = self.encode([conditions])
+        self.values[row] = values[0]
+        self.present[row] = present[0]
+        self.ids.append(item_id)
+        self.positions[item_id] = row
+        self.version += 1
+
+    def remove(self, item_id: str) -> None:
+        # Move the last row into the freed slot
+        row = self.positions.pop(item_id)
+        last = len(self.ids) - 1
+        if row != last:
+            moved = self.ids[last]
+            self.values[row] = self.values[last]
+            self.present[row] = self.present[last]
+            self.ids[row] = moved
+            self.positions[moved] = row
+        self.ids.pop()
+        self.present[last] = False
+        self.version += 1
+
+    def similarity(self, conditions: Sequence[Dict[str, Any]]) -> np.ndarray:
+        # (rows x len(conditions)) similarity matrix
+        values, present = self.encode(conditions)
+        n = len(self.ids)
+        result = np.zeros((n, len(conditions)))
+        if not n or not len(conditions) or not self.columns:
+            return result
+
+        rows_per_chunk = max(1, self.CHUNK_ELEMENTS // (len(conditions) * len(self.columns)))
+        for start in range(0, n, rows_per_chunk):
+            stop = min(start + rows_per_chunk, n)
+            a = self.values[start:stop, None, :]
+            shared = self.present[start:stop, None, :] & present[None, :, :]
+
+            with np.errstate(divide='ignore', invalid='ignore'):
+                scale = np.maximum(np.abs(a), np.abs(values))
+                ratio = np.where(scale > 0, np.abs(a - values) / scale, 0.0)
+
+            scores = np.where(shared, 1 - np.minimum(ratio, 1), 0.0).sum(axis=-1)
+            counts = shared.sum(axis=-1)
+            np.divide(scores, counts, out=result[start:stop], where=counts > 0)
+
+        return result
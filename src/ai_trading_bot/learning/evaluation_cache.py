@@ -0,0 +1,70 @@
+import json
+from collections import OrderedDict
+from typing import Dict, Any, Hashable, Optional, Tuple
+
+
+def canonical_parameters(parameters: Dict[str, Any]) -> Tuple[Tuple[str, Any], ...]:
+    # Sorted (name, value) pairs; unhashable values are replaced by their
+    # JSON form so equal parameter dicts always give equal keys
+    items = []
+    for name, value in sorted(parameters.items()):
+        try:
+            hash(value)
+        except TypeError:
+            value = json.dumps(value, sort_keys=True, default=str)
+        items.append((name, value))
+    return tuple(items)
+
+
+class EvaluationCache:
+    """LRU cache of parameter-set scores.
+
+    Keys combine the strategy id, the canonical parameters and the market
+    data fingerprint, so a score is reused only for the same parameters on
+    the same history. Once `max_entries` scores are held, the least
+    recently used is evicted. Hit, miss and eviction counts are kept for
+    monitoring.
+    """
+
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self.entries: OrderedDict = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    @staticmethod
+    def key(strategy_id: str, parameters: Dict[str, Any], fingerprint: str) -> Hashable:
+        return (strategy_id, canonical_parameters(parameters), fingerprint)
+
+    def get(self, key: Hashable) -> Optional[float]:
+        score = self.entries.get(key)
+        if score is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return score
+
+    def put(self, key: Hashable, score: float) -> None:
+        self.entries[key] = score
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        self.entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            'size': len(self.entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / lookups if lookups else 0.0
+        }
@@ -0,0 +1,287 @@
+import itertools
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Dict, Any, Callable, List, Optional, Tuple
+import numpy as np
+from ..analysis.snapshot import MarketSnapshot
+from .evaluation_cache import EvaluationCache
+
+# evaluate(parameter_sets, market_data) -> one score per parameter set
+BatchEvaluator = Callable[[List[Dict[str, Any]], Dict[str, Any]], List[float]]
+
+# (evaluate, shared memory name, history length, other market data,
+#  candidates, bars)
+ChunkTask = Tuple[BatchEvaluator, str, int, Dict[str, Any], List[Dict[str, Any]], Optional[int]]
+
+SERIES_KEYS = ('price_history', 'prices', 'volume_history', 'volumes', 'ohlcv')
+
+# Per-process handle on the shared series of the current search
+_worker: Dict[str, Any] = {}
+
+
+def _attach_series(shm_name: str, length: int) -> np.ndarray:
+    # Re-attach only when the parent has moved to new market data
+    if _worker.get('shm_name') != shm_name:
+        _worker.pop('series', None)
+        if 'shm' in _worker:
+            _worker.pop('shm').close()
+        shm = shared_memory.SharedMemory(name=shm_name)
+        _worker.update(
+            shm_name=shm_name,
+            shm=shm,
+            series=np.ndarray((2, length), dtype=float, buffer=shm.buf)
+        )
+    return _worker['series']
+
+def _evaluate_chunk(args: ChunkTask) -> List[float]:
+    evaluate, shm_name, length, extras, candidates, bars = args
+    series = _attach_series(shm_name, length)
+    market_data = {**extras, 'price_history': series[0], 'volume_history': series[1]}
+    return list(evaluate(candidates, _slice_market_data(market_data, bars)))
+
+def _slice_market_data(market_data: Dict[str, Any], bars: Optional[int]) -> Dict[str, Any]:
+    # The most recent `bars` of price and volume history
+    if bars is None:
+        return market_data
+    return {
+        **market_data,
+        'price_history': market_data['price_history'][-bars:],
+        'volume_history': market_data['volume_history'][-bars:]
+    }
+
+
+class ParameterSearch:
+    """Grid, random or successive-halving search over numeric parameters.
+
+    Candidates are generated around the current parameters: `grid` tries
+    every combination of `grid_levels` evenly spaced multipliers within
+    +/- `spread`, `random` samples `n_candidates` points from the same
+    range, and `halving` scores random candidates on a short tail of the
+    history and keeps the best 1/`eta` for each longer round. The current
+    parameters are always a candidate, and ties keep the earliest one, so
+    a given seed always returns the same result.
+
+    With `max_workers` above one, candidates are scored in chunks on a
+    process pool that is created on first use and kept until `close()`.
+    `evaluate` is pickled into every task, so it should be a module-level
+    function (or a partial of one) over small picklable arguments. Price
+    and volume history is placed in shared memory once per distinct data
+    fingerprint and length instead of being pickled into every task.
+
+    Given a `cache`, scores are looked up and stored in the calling process
+    under `scope` (usually a strategy id), so only uncached candidates are
+    sent to `evaluate` or to the workers.
+    """
+
+    MODES = ('grid', 'random', 'halving')
+
+    def __init__(
+        self,
+        mode: str = 'grid',
+        n_candidates: int = 64,
+        spread: float = 0.1,
+        grid_levels: int = 3,
+        eta: int = 3,
+        min_bars: int = 100,
+        seed: int = 0,
+        max_workers: Optional[int] = None
+    ):
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown search mode: {mode}")
+
+        self.mode = mode
+        self.n_candidates = n_candidates
+        self.spread = spread
+        self.grid_levels = grid_levels
+        self.eta = eta
+        self.min_bars = min_bars
+        self.seed = seed
+        self.max_workers = max_workers
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._shm: Optional[shared_memory.SharedMemory] = None
+        self._shm_key: Optional[Tuple[str, int]] = None
+
+    def candidates(self, parameters: Dict[str, Any]) -> List[Dict[str, Any]]:
+        numeric = [
+            name for name, value in parameters.items()
+            if isinstance(value, (int, float)) and not isinstance(value, bool)
+        ]
+        if not numeric:
+            return [dict(parameters)]
+
+        if self.mode == 'grid':
+            levels = np.linspace(1 - self.spread, 1 + self.spread, self.grid_levels)
+            multipliers = np.array(list(itertools.product(levels, repeat=len(numeric))))
+        else:
+            rng = np.random.default_rng(self.seed)
+            multipliers = rng.uniform(
+                1 - self.spread, 1 + self.spread,
+                size=(self.n_candidates, len(numeric))
+            )
+
+        # Current parameters first, so ties favour leaving them unchanged
+        candidates = [dict(parameters)]
+        for row in multipliers:
+            candidate = dict(parameters)
+            for name, multiplier in zip(numeric, row):
+                value = parameters[name] * multiplier
+                candidate[name] = int(round(value)) if isinstance(parameters[name], int) else float(value)
+            if candidate not in candidates:
+                candidates.append(candidate)
+        return candidates
+
+    def run(
+        self,
+        parameters: Dict[str, Any],
+        evaluate: BatchEvaluator,
+        market_data: Dict[str, Any],
+        cache: Optional[EvaluationCache] = None,
+        scope: str = ''
+    ) -> Tuple[Dict[str, Any], float]:
+        candidates = self.candidates(parameters)
+        snapshot = MarketSnapshot.of(market_data)
+
+        with self._evaluator(evaluate, snapshot) as score:
+            if cache is not None:
+                score = _CachedScores(score, cache, scope, snapshot)
+            if self.mode != 'halving':
+                scores = score(candidates, None)
+            else:
+                candidates, scores = self._successive_halving(candidates, score, len(snapshot.prices))
+
+        best = int(np.argmax(scores))
+        return candidates[best], float(scores[best])
+
+    def _successive_halving(self, candidates, score, length: int):
+        rounds = max(1, int(np.ceil(np.log(len(candidates)) / np.log(self.eta))))
+        for round_index in range(rounds):
+            bars = min(length, self.min_bars * self.eta ** round_index)
+            if round_index == rounds - 1:
+                bars = length
+
+            scores = score(candidates, bars)
+            if round_index < rounds - 1:
+                keep = max(1, len(candidates) // self.eta)
+                # Stable sort on negated scores keeps earlier candidates on ties
+                order = np.sort(np.argsort(-np.asarray(scores), kind='stable')[:keep])
+                candidates = [candidates[i] for i in order]
+
+        return candidates, scores
+
+    def _evaluator(self, evaluate: BatchEvaluator, snapshot: MarketSnapshot):
+        if not self.max_workers or self.max_workers <= 1:
+            return _SerialEvaluator(evaluate, snapshot)
+
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+        return _PoolEvaluator(evaluate, snapshot, self._pool, self._share(snapshot), self.max_workers)
+
+    def _share(self, snapshot: MarketSnapshot) -> Tuple[str, int]:
+        # Copy price and volume history into shared memory, reusing the
+        # segment while the data fingerprint and length are unchanged
+        prices, volumes = snapshot.prices, snapshot.volumes
+        key = (snapshot.fingerprint, len(prices))
+        if self._shm is None or self._shm_key != key:
+            self._release_shared()
+            if len(volumes) != len(prices):
+                volumes = np.zeros(len(prices))
+            self._shm = shared_memory.SharedMemory(create=True, size=max(1, 2 * len(prices) * 8))
+            series = np.ndarray((2, len(prices)), dtype=float, buffer=self._shm.buf)
+            series[0] = prices
+            series[1] = volumes
+            self._shm_key = key
+        return self._shm.name, len(prices)
+
+    def _release_shared(self) -> None:
+        if self._shm is not None:
+            self._shm.close()
+            self._shm.unlink()
+            self._shm = None
+            self._shm_key = None
+
+    def close(self) -> None:
+        # Shut down the worker pool and free the shared history
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+        self._release_shared()
+
+
+class _CachedScores:
+    def __init__(self, score, cache: EvaluationCache, scope: str, snapshot: MarketSnapshot):
+        self.score = score
+        self.cache = cache
+        self.scope = scope
+        self.fingerprint = snapshot.fingerprint
+        self.length = len(snapshot.prices)
+
+    def __call__(self, candidates: List[Dict[str, Any]], bars: Optional[int]) -> List[float]:
+        # Tails of the history are distinct data; the full history shares
+        # its keys with every other user of the cache
+        fingerprint = self.fingerprint
+        if bars is not None and bars < self.length:
+            fingerprint = f"{fingerprint}:tail:{bars}"
+
+        keys = [self.cache.key(self.scope, candidate, fingerprint) for candidate in candidates]
+        scores = [self.cache.get(key) for key in keys]
+        missing = [i for i, score in enumerate(scores) if score is None]
+        if missing:
+            for i, score in zip(missing, self.score([candidates[i] for i in missing], bars)):
+                scores[i] = score
+                self.cache.put(keys[i], score)
+        return scores
+
+
+class _SerialEvaluator:
+    def __init__(self, evaluate: BatchEvaluator, snapshot: MarketSnapshot):
+        self.evaluate = evaluate
+        self.market_data = {
+            **snapshot.data,
+            'price_history': snapshot.prices,
+            'volume_history': snapshot.volumes
+        }
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc) -> None:
+        pass
+
+    def __call__(self, candidates: List[Dict[str, Any]], bars: Optional[int]) -> List[float]:
+        return list(self.evaluate(candidates, _slice_market_data(self.market_data, bars)))
+
+
+class _PoolEvaluator:
+    def __init__(
+        self,
+        evaluate: BatchEvaluator,
+        snapshot: MarketSnapshot,
+        pool: ProcessPoolExecutor,
+        shared: Tuple[str, int],
+        max_workers: int
+    ):
+        self.evaluate = evaluate
+        self.pool = pool
+        self.shm_name, self.length = shared
+        self.max_workers = max_workers
+        self.extras = {key: value for key, value in snapshot.data.items() if key not in SERIES_KEYS}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc) -> None:
+        # The pool and shared memory outlive a single search
+        pass
+
+    def __call__(self, candidates: List[Dict[str, Any]], bars: Optional[int]) -> List[float]:
+        # A few chunks per worker balances load without per-candidate IPC
+        n_chunks = min(len(candidates), self.max_workers * 4)
+        chunks = [chunk.tolist() for chunk in np.array_split(np.arange(len(candidates)), n_chunks)]
+        results = self.pool.map(
+            _evaluate_chunk,
+            [
+                (self.evaluate, self.shm_name, self.length, self.extras, [candidates[i] for i in chunk], bars)
+                for chunk in chunks
+            ]
+        )
+        return [score for chunk_scores in results for score in chunk_scores]
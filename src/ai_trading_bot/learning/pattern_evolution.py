@@ -0,0 +1,146 @@
+import math
+from collections import deque
+from typing import Dict, Any, Iterable, Tuple
+
+PATTERN_TYPES = ('price', 'volume', 'order', 'floor_sweep', 'wash_trading', 'rbf')
+GROUPS = {'market': 'market_patterns', 'manipulation': 'manipulation_patterns'}
+
+# (group, pattern type) -> (sum of relative changes, number of changes)
+PairChanges = Dict[Tuple[str, str], Tuple[float, int]]
+
+
+def pair_change(prev: Dict[str, Any], curr: Dict[str, Any]) -> Tuple[float, int]:
+    # Relative change of every numeric metric between two sightings
+    total, count = 0.0, 0
+    for key, value in prev.items():
+        if isinstance(value, (int, float)):
+            total += (curr[key] - value) / value if value != 0 else 0
+            count += 1
+    return total, count
+
+
+class PatternEvolution:
+    """Pattern history in a bounded deque with running change aggregates.
+
+    For every (group, pattern type) it keeps the sum and count of relative
+    metric changes between consecutive history entries, plus how many
+    entries lack that type. Appending an entry adds one pair of entries and
+    evicting the oldest removes one, so `changes()` is O(types) whatever
+    the history length. A type is reported only while every entry in the
+    history has it, and its change is the mean over all pairs.
+
+    The sums are re-added from the stored pair contributions once per
+    `maxlen` appends, and when the last non-finite contribution leaves the
+    window (inf - inf leaves NaN behind), so rounding error cannot build up.
+    """
+
+    def __init__(self, maxlen: int = 1000):
+        self.history: deque = deque(maxlen=maxlen)
+        # Contributions of the pair ending at each entry, aligned with history
+        self.pairs: deque = deque(maxlen=maxlen)
+        self.sums: Dict[Tuple[str, str], float] = {}
+        self.counts: Dict[Tuple[str, str], int] = {}
+        self.missing: Dict[Tuple[str, str], int] = {}
+        # Non-finite pair totals in the window, and appends since the last re-sum
+        self.nonfinite = 0
+        self.appends = 0
+
+    def __len__(self) -> int:
+        return len(self.history)
+
+    @staticmethod
+    def _first_of_type(entry: Dict[str, Any]) -> Dict[Tuple[str, str], Dict[str, Any]]:
+        found = {}
+        for group, field in GROUPS.items():
+            for pattern in entry.get(field, []):
+                key = (group, pattern.get('type'))
+                if key[1] in PATTERN_TYPES and key not in found:
+                    found[key] = pattern
+        return found
+
+    def append(self, entry: Dict[str, Any]) -> None:
+        if len(self.history) == self.history.maxlen:
+            self._evict_oldest()
+
+        current = self._first_of_type(entry)
+        previous = self._first_of_type(self.history[-1]) if self.history else {}
+
+        pairs: PairChanges = {}
+        for key, pattern in current.items():
+            if key in previous:
+                pairs[key] = pair_change(previous[key], pattern)
+                total, count = pairs[key]
+                self.sums[key] = self.sums.get(key, 0.0) + total
+                self.counts[key] = self.counts.get(key, 0) + count
+                if not math.isfinite(total):
+                    self.nonfinite += 1
+
+        for group in GROUPS:
+            for pattern_type in PATTERN_TYPES:
+                key = (group, pattern_type)
+                if key not in current:
+                    self.missing[key] = self.missing.get(key, 0) + 1
+
+        self.history.append(entry)
+        self.pairs.append(pairs)
+
+        self.appends += 1
+        if self.appends >= self.history.maxlen:
+            self._resum()
+
+    def _evict_oldest(self) -> None:
+        oldest = self._first_of_type(self.history.popleft())
+        self.pairs.popleft()
+
+        for group in GROUPS:
+            for pattern_type in PATTERN_TYPES:
+                key = (group, pattern_type)
+                if key not in oldest:
+                    self.missing[key] -= 1
+
+        # The pair joining the evicted entry to the new oldest one leaves too
+        removed_nonfinite = 0
+        if self.pairs:
+            for key, (total, count) in self.pairs[0].items():
+                self.sums[key] -= total
+                self.counts[key] -= count
+                if not math.isfinite(total):
+                    removed_nonfinite += 1
+            self.pairs[0] = {}
+
+        self.nonfinite -= removed_nonfinite
+        if removed_nonfinite and not self.nonfinite:
+            self._resum()
+
+    def _resum(self) -> None:
+        # O(window) re-add of the pair contributions still in the window
+        self.sums = {key: 0.0 for key in self.sums}
+        self.counts = {key: 0 for key in self.counts}
+        for pairs in self.pairs:
+            for key, (total, count) in pairs.items():
+                self.sums[key] += total
+                self.counts[key] += count
+        self.appends = 0
+
+    def rebuild(self, entries: Iterable[Dict[str, Any]]) -> None:
+        self.history.clear()
+        self.pairs.clear()
+        self.sums, self.counts, self.missing = {}, {}, {}
+        self.nonfinite = self.appends = 0
+        for entry in entries:
+            self.append(entry)
+
+    def changes(self) -> Dict[str, Dict[str, float]]:
+        changes = {group: {} for group in GROUPS}
+        if not self.history:
+            return changes
+
+        for group in GROUPS:
+            for pattern_type in PATTERN_TYPES:
+                key = (group, pattern_type)
+                if self.missing.get(key, 0) == 0:
+                    count = self.counts.get(key, 0)
+                    changes[group][pattern_type] = (
+                        float(self.sums[key] / count) if count else 0
+                    )
+        return changes
@@ -0,0 +1,54 @@
+from typing import Dict, Any, Optional, Tuple, Union
+import math
+
+Bucket = Union[int, Tuple[int, int]]
+
+
+class PatternQuantizer:
+    """Buckets continuous pattern features so similar market states share a key.
+
+    Features listed in `steps` use fixed-width linear buckets (suited to
+    bounded ratios such as buy pressure). Every other numeric feature is
+    bucketed by sign and by floor(log|v| / log(1 + log_ratio)), so each
+    bucket spans a factor of 1 + `log_ratio` at any magnitude: 0.001 and
+    0.01 land in different buckets just as 10 and 100 do. Magnitudes
+    below `min_magnitude`, including zero, share one zero bucket.
+    Non-numeric features are kept as they are.
+    """
+
+    DEFAULT_STEPS = {
+        'buy_pressure': 0.1,
+        'sell_pressure': 0.1,
+        'imbalance': 0.1
+    }
+
+    ZERO_BUCKET = (0, 0)
+
+    def __init__(
+        self,
+        steps: Optional[Dict[str, float]] = None,
+        log_ratio: float = 0.25,
+        min_magnitude: float = 1e-12
+    ):
+        self.steps = dict(self.DEFAULT_STEPS if steps is None else steps)
+        self.log_base = math.log1p(log_ratio)
+        self.min_magnitude = min_magnitude
+
+    def bucket(self, key: str, value: float) -> Bucket:
+        if key in self.steps:
+            return math.floor(value / self.steps[key])
+        if abs(value) < self.min_magnitude:
+            return self.ZERO_BUCKET
+        # (sign, log-magnitude bucket)
+        return (1 if value > 0 else -1, math.floor(math.log(abs(value)) / self.log_base))
+
+    def quantize(self, pattern: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            key: (
+                self.bucket(key, value)
+                if isinstance(value, (int, float)) and not isinstance(value, bool)
+                and math.isfinite(value)
+                else value
+            )
+            for key, value in pattern.items()
+        }
@@ -2,12 +2,17 @@ import logging
 from typing import Dict, Any, List
 from datetime import datetime
 import numpy as np
+from ..analysis.snapshot import MarketSnapshot
+from .pattern_evolution import PatternEvolution
 
 class PatternRecognizer:
-    def __init__(self):
+    def __init__(self, history_size: int = 1000):
         self.logger = logging.getLogger('ai_trading_bot.learning.pattern')
         self.known_patterns = {}
-        self.pattern_history = []
+        # Append through _update_pattern_history so the change aggregates
+        # stay in step with the history
+        self.evolution = PatternEvolution(history_size)
+        self.pattern_history = self.evolution.history
 
     async def analyze_patterns(
         self,
@@ -15,6 +20,8 @@ class PatternRecognizer:
         manipulation_data: Dict[str, Any]
     ) -> Dict[str, Any]:
         try:
+            market_data = MarketSnapshot.of(market_data)
+
             # Identify market patterns
             market_patterns = self._identify_market_patterns(market_data)
             
@@ -75,13 +82,13 @@ class PatternRecognizer:
 
     def _analyze_price_pattern(self, data: Dict[str, Any]) -> Dict[str, Any]:
         try:
-            prices = data.get('prices', [])
+            snapshot = MarketSnapshot.of(data)
+            prices = snapshot.prices
             if len(prices) < 10:
                 return None
                 
-            returns = np.diff(prices) / prices[:-1]
-            volatility = np.std(returns)
-            trend = np.mean(returns)
+            volatility = snapshot.returns_std()
+            trend = snapshot.returns_mean()
             
             return {
                 'type': 'price',
@@ -95,11 +102,12 @@ class PatternRecognizer:
 
     def _analyze_volume_pattern(self, data: Dict[str, Any]) -> Dict[str, Any]:
         try:
-            volumes = data.get('volumes', [])
+            snapshot = MarketSnapshot.of(data)
+            volumes = snapshot.volumes
             if len(volumes) < 10:
                 return None
                 
-            vol_changes = np.diff(volumes)
+            vol_changes = snapshot.volume_changes
             vol_trend = np.mean(vol_changes)
             vol_volatility = np.std(vol_changes)
             
@@ -169,6 +177,15 @@ class PatternRecognizer:
     def _analyze_rbf_pattern(self, data: Dict[str, Any]) -> Dict[str, Any]:
         try:
             rbf_events = data.get('rbf_events', [])
+            mempool = data.get('mempool')
+            if not rbf_events and mempool is not None and mempool.replacement_count:
+                # Running totals kept by a MempoolTracker
+                return {
+                    'type': 'rbf',
+                    'frequency': mempool.replacement_count,
+                    'average_fee_increase': float(mempool.average_fee_bump),
+                    'confidence': self._calculate_confidence(mempool.replacement_count)
+                }
             if not rbf_events:
                 return None
                 
@@ -193,15 +210,12 @@ class PatternRecognizer:
         market_patterns: List[Dict[str, Any]],
         manipulation_patterns: List[Dict[str, Any]]
     ) -> None:
-        self.pattern_history.append({
+        # The deque keeps the last `history_size` entries
+        self.evolution.append({
             'timestamp': datetime.now().isoformat(),
             'market_patterns': market_patterns,
             'manipulation_patterns': manipulation_patterns
         })
-        
-        # Keep last 1000 patterns
-        if len(self.pattern_history) > 1000:
-            self.pattern_history = self.pattern_history[-1000:]
 
     def _analyze_pattern_evolution(self) -> Dict[str, Any]:
         if len(self.pattern_history) < 2:
@@ -209,14 +223,7 @@ class PatternRecognizer:
             
         try:
             # Analyze how patterns have changed over time
-            changes = {
-                'market': self._calculate_pattern_changes(
-                    [p['market_patterns'] for p in self.pattern_history]
-                ),
-                'manipulation': self._calculate_pattern_changes(
-                    [p['manipulation_patterns'] for p in self.pattern_history]
-                )
-            }
+            changes = self.evolution.changes()
             
             return {
                 'changes': changes,
@@ -226,41 +233,6 @@ class PatternRecognizer:
             self.logger.error(f"Pattern evolution analysis failed: {e}")
             return {}
 
-    def _calculate_pattern_changes(
-        self,
-        pattern_sequence: List[List[Dict[str, Any]]]
-    ) -> Dict[str, float]:
-        changes = {}
-        
-        for pattern_type in ['price', 'volume', 'order', 'floor_sweep', 'wash_trading', 'rbf']:
-            type_patterns = [
-                [p for p in patterns if p['type'] == pattern_type]
-                for patterns in pattern_sequence
-            ]
-            
-            if all(type_patterns):
-                changes[pattern_type] = self._calculate_type_change(type_patterns)
-                
-        return changes
-
-    def _calculate_type_change(
-        self,
-        type_patterns: List[List[Dict[str, Any]]]
-    ) -> float:
-        # Calculate rate of change for pattern metrics
-        changes = []
-        
-        for i in range(1, len(type_patterns)):
-            prev = type_patterns[i-1][0]
-            curr = type_patterns[i][0]
-            
-            for key in prev:
-                if isinstance(prev[key], (int, float)):
-                    change = (curr[key] - prev[key]) / prev[key] if prev[key] != 0 else 0
-                    changes.append(change)
-                    
-        return float(np.mean(changes)) if changes else 0
-
     def _determine_pattern_trend(self, changes: Dict[str, Dict[str, float]]) -> str:
         # Analyze overall trend direction
         market_change = np.mean(list(changes['market'].values()))
@@ -271,4 +243,14 @@ class PatternRecognizer:
         elif manipulation_change < -0.1:
             return 'decreasing_manipulation'
         else:
-            return 'stable'
\ No newline at end of file
+            return 'stable'
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            'known_patterns': dict(self.known_patterns),
+            'pattern_history': list(self.pattern_history)
+        }
+
+    def restore(self, state: Dict[str, Any]) -> None:
+        self.known_patterns = dict(state.get('known_patterns', {}))
+        self.evolution.rebuild(state.get('pattern_history', []))
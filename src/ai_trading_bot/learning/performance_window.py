@@ -0,0 +1,78 @@
+from typing import Sequence
+import numpy as np
+
+
+class TrendWindow:
+    """The last `capacity` rows of `width` metrics, with their mean and slope.
+
+    Rows live in a fixed ring buffer. Running sums of y and x*y, with x
+    counted from the oldest row in the window, are updated as rows enter
+    and leave, so the least-squares slope against row order (what
+    np.polyfit(range(n), y, 1)[0] returns) costs O(width) per append.
+    The sums are rebuilt from the buffer once per wrap, or when a
+    non-finite value leaves the window, so rounding error cannot build up.
+    """
+
+    def __init__(self, capacity: int, width: int = 1):
+        if capacity < 1:
+            raise ValueError("capacity must be positive")
+
+        self.capacity = capacity
+        self.width = width
+        self.buffer = np.zeros((capacity, width))
+        self.start = 0
+        self.count = 0
+        self.sum_y = np.zeros(width)
+        self.sum_xy = np.zeros(width)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def append(self, values: Sequence[float]) -> None:
+        values = np.asarray(values, dtype=float)
+
+        if self.count == self.capacity:
+            # Drop the oldest row; every remaining x shifts down by one
+            oldest = self.buffer[self.start]
+            # inf - inf is NaN here; the rebuild below repairs the sums
+            with np.errstate(invalid='ignore'):
+                self.sum_y -= oldest
+                self.sum_xy -= self.sum_y
+            self.start = (self.start + 1) % self.capacity
+            self.count -= 1
+            rebuild = self.start == 0 or not np.isfinite(oldest).all()
+        else:
+            rebuild = False
+
+        self.buffer[(self.start + self.count) % self.capacity] = values
+        self.sum_y += values
+        self.sum_xy += self.count * values
+        self.count += 1
+
+        if rebuild:
+            self._rebuild()
+
+    def _rebuild(self) -> None:
+        rows = self.values()
+        self.sum_y = rows.sum(axis=0)
+        self.sum_xy = np.arange(len(rows)) @ rows
+
+    def values(self) -> np.ndarray:
+        # Rows oldest first
+        indices = (self.start + np.arange(self.count)) % self.capacity
+        return self.buffer[indices]
+
+    def mean(self) -> np.ndarray:
+        if not self.count:
+            return np.zeros(self.width)
+        return self.sum_y / self.count
+
+    def slope(self) -> np.ndarray:
+        n = self.count
+        if n < 2:
+            return np.zeros(self.width)
+
+        sum_x = n * (n - 1) / 2
+        sum_xx = (n - 1) * n * (2 * n - 1) / 6
+        with np.errstate(invalid='ignore'):
+            return (n * self.sum_xy - sum_x * self.sum_y) / (n * sum_xx - sum_x ** 2)
@@ -0,0 +1,162 @@
+import json
+import logging
+import os
+from dataclasses import asdict
+from datetime import datetime
+from typing import Dict, Any, Iterator, List, Optional, Sequence
+import numpy as np
+from .backtest import score_results
+
+METRICS = ('win_rate', 'profit_factor', 'sharpe_ratio')
+
+
+def read_archive(path: str) -> Iterator[Dict[str, Any]]:
+    # Retired strategies, oldest first, one JSON record per line
+    if not os.path.exists(path):
+        return
+    with open(path) as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+class StrategyPopulation:
+    """Caps the optimizer's strategy pool and picks which strategies breed.
+
+    Fitness is the optimizer's score (0.3 win rate, 0.4 capped profit
+    factor, 0.3 capped Sharpe) of a strategy's latest performance. Parents
+    are chosen by tournament: each of at most `max_offspring` slots goes
+    to the fittest of `tournament_size` random stagnant strategies.
+
+    `cull` retires strategies until the pool is within `max_size`. The
+    `elite_count` fittest are never retired. Strategies that another one
+    beats or matches on every metric go first, then the least fit, then
+    the oldest of those not yet evaluated. A strategy counts as evaluated
+    once it has `min_evaluations` performance records, so a newly evolved
+    one is not retired on the zeros of its first cycles without trades.
+    Retired strategies are dropped from memory and, when `archive_path` is
+    set, appended to it as JSON lines. Without one they are discarded; the
+    optimizer's own population archives to its ARCHIVE_PATH.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 50,
+        elite_count: int = 5,
+        tournament_size: int = 3,
+        max_offspring: int = 5,
+        min_evaluations: int = 3,
+        archive_path: Optional[str] = None,
+        seed: Optional[int] = None
+    ):
+        if elite_count >= max_size:
+            raise ValueError("elite_count must be smaller than max_size")
+
+        self.logger = logging.getLogger('ai_trading_bot.learning.population')
+        self.max_size = max_size
+        self.elite_count = elite_count
+        self.tournament_size = tournament_size
+        self.max_offspring = max_offspring
+        self.min_evaluations = min_evaluations
+        self.archive_path = archive_path
+        self.rng = np.random.default_rng(seed)
+        self.retired_count = 0
+
+    @staticmethod
+    def fitness(strategy: Any) -> float:
+        return float(score_results(strategy.performance))
+
+    @staticmethod
+    def is_evaluated(strategy: Any) -> bool:
+        return any(key in strategy.performance for key in METRICS)
+
+    def select_parents(self, candidates: Sequence[Any]) -> List[Any]:
+        if not candidates:
+            return []
+
+        fitness = np.array([self.fitness(strategy) for strategy in candidates])
+        slots = min(self.max_offspring, len(candidates))
+        size = min(self.tournament_size, len(candidates))
+
+        # A strategy that wins several tournaments is still bred only once
+        parents: Dict[str, Any] = {}
+        for _ in range(slots):
+            entrants = self.rng.choice(len(candidates), size=size, replace=False)
+            winner = candidates[entrants[np.argmax(fitness[entrants])]]
+            parents.setdefault(winner.id, winner)
+        return list(parents.values())
+
+    def _dominated(self, strategies: List[Any]) -> np.ndarray:
+        # Row i is dominated if some row j is >= on every metric and > on one
+        metrics = np.array([
+            [strategy.performance.get(key, 0) for key in METRICS]
+            for strategy in strategies
+        ], dtype=float).reshape(len(strategies), len(METRICS))
+        at_least = (metrics[None, :, :] >= metrics[:, None, :]).all(axis=2)
+        better = (metrics[None, :, :] > metrics[:, None, :]).any(axis=2)
+        return (at_least & better).any(axis=1)
+
+    def cull(
+        self,
+        strategies: Dict[str, Any],
+        evaluations: Optional[Dict[str, int]] = None
+    ) -> List[str]:
+        """Retire strategies in place until at most `max_size` remain.
+
+        `evaluations` holds the number of performance records per strategy
+        id; without it, any strategy with performance metrics is evaluated.
+        """
+        excess = len(strategies) - self.max_size
+        if excess <= 0:
+            return []
+
+        pool = list(strategies.values())
+        fitness = np.array([self.fitness(strategy) for strategy in pool])
+        evaluated = np.array([
+            self.is_evaluated(strategy) and (
+                evaluations is None or
+                evaluations.get(strategy.id, 0) >= self.min_evaluations
+            )
+            for strategy in pool
+        ], dtype=bool)
+        dominated = np.zeros(len(pool), dtype=bool)
+        if evaluated.any():
+            dominated[evaluated] = self._dominated([s for s, e in zip(pool, evaluated) if e])
+
+        # Stable sort: evaluated before unevaluated, dominated first, then
+        # lowest fitness, then oldest update
+        age = np.array([strategy.last_updated.timestamp() for strategy in pool])
+        order = np.lexsort((age, fitness, ~dominated, ~evaluated))
+
+        ranked = np.argsort(-fitness, kind='stable')
+        elites = set(ranked[evaluated[ranked]][:self.elite_count])
+        victims = [i for i in order if i not in elites][:excess]
+
+        retired = [pool[i] for i in victims]
+        for strategy in retired:
+            del strategies[strategy.id]
+        self._archive(retired)
+        self.retired_count += len(retired)
+
+        self.logger.info(
+            f"Retired {len(retired)} strategies "
+            f"({int(dominated[victims].sum())} dominated), {len(strategies)} remain"
+        )
+        return [strategy.id for strategy in retired]
+
+    def _archive(self, retired: List[Any]) -> None:
+        if not retired or self.archive_path is None:
+            return
+        try:
+            directory = os.path.dirname(self.archive_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+
+            retired_at = datetime.now().isoformat()
+            with open(self.archive_path, 'a') as f:
+                for strategy in retired:
+                    record = {**asdict(strategy), 'retired_at': retired_at}
+                    f.write(json.dumps(record, default=str) + '\n')
+
+        except Exception as e:
+            self.logger.error(f"Failed to archive retired strategies: {e}")
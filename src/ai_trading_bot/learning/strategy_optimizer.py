@@ -1,8 +1,18 @@
 import logging
+from functools import partial
 from typing import Dict, Any, List, Optional
 from datetime import datetime
 import numpy as np
-from dataclasses import dataclass
+from dataclasses import dataclass, asdict
+from .parameter_search import ParameterSearch
+from .backtest import VectorizedBacktester, score_parameter_sets, score_results
+from .performance_window import TrendWindow
+from .population import StrategyPopulation
+from .evaluation_cache import EvaluationCache
+from ..analysis.snapshot import MarketSnapshot
+
+# Where retired strategies go unless the optimizer is given a population
+ARCHIVE_PATH = 'data/strategy_archive.jsonl'
 
 @dataclass
 class Strategy:
@@ -13,10 +23,29 @@ class Strategy:
     last_updated: datetime
 
 class StrategyOptimizer:
-    def __init__(self):
+    METRICS = ('win_rate', 'profit_factor', 'sharpe_ratio')
+
+    def __init__(
+        self,
+        search: Optional[ParameterSearch] = None,
+        backtester: Optional[VectorizedBacktester] = None,
+        population: Optional[StrategyPopulation] = None,
+        evaluation_cache: Optional[EvaluationCache] = None,
+        archive_path: Optional[str] = ARCHIVE_PATH
+    ):
         self.logger = logging.getLogger('ai_trading_bot.learning.strategy')
+        # Without a search, parameters are tuned one at a time
+        self.search = search
+        self.backtester = backtester or VectorizedBacktester()
+        self.population = population or StrategyPopulation(archive_path=archive_path)
+        self.evaluation_cache = evaluation_cache or EvaluationCache()
         self.strategies: Dict[str, Strategy] = {}
-        self.performance_history: List[Dict[str, Any]] = []
+        # Bounded history: the last `evolve_window` results per strategy
+        # and the last `metrics_window` results across all strategies
+        self.evolve_window = 10
+        self.metrics_window = 100
+        self.performance_history: Dict[str, TrendWindow] = {}
+        self.recent_performance = TrendWindow(self.metrics_window, len(self.METRICS))
         self.learning_rate = 0.1
         self.exploration_rate = 0.2
 
@@ -34,17 +63,27 @@ class StrategyOptimizer:
             
             # Evolve strategies
             evolved_strategies = self._evolve_strategies()
+
+            # Keep the pool within its cap
+            retired_strategies = self._retire_strategies()
             
             return {
                 'timestamp': datetime.now().isoformat(),
                 'optimizations': optimizations,
                 'evolved_strategies': evolved_strategies,
-                'performance_metrics': self._calculate_performance_metrics()
+                'retired_strategies': retired_strategies,
+                'performance_metrics': self._calculate_performance_metrics(),
+                'evaluation_cache': self.evaluation_cache.stats()
             }
         except Exception as e:
             self.logger.error(f"Strategy optimization failed: {e}")
             return {}
 
+    def close(self) -> None:
+        # Shut down the search's worker pool, if it started one
+        if self.search is not None:
+            self.search.close()
+
     def _update_performance(self, trading_results: Dict[str, Any]) -> None:
         for strategy_id, strategy in self.strategies.items():
             # Calculate strategy performance
@@ -58,11 +97,16 @@ class StrategyOptimizer:
             strategy.last_updated = datetime.now()
             
             # Add to performance history
-            self.performance_history.append({
-                'strategy_id': strategy_id,
-                'timestamp': datetime.now().isoformat(),
-                'performance': performance
-            })
+            self._record_performance(strategy_id, performance)
+
+    def _record_performance(self, strategy_id: str, performance: Dict[str, float]) -> None:
+        values = [performance.get(key, 0) for key in self.METRICS]
+        history = self.performance_history.get(strategy_id)
+        if history is None:
+            history = TrendWindow(self.evolve_window, len(self.METRICS))
+            self.performance_history[strategy_id] = history
+        history.append(values)
+        self.recent_performance.append(values)
 
     def _calculate_strategy_performance(
         self,
@@ -105,6 +149,9 @@ class StrategyOptimizer:
 
     def _generate_optimizations(self, market_data: Dict[str, Any]) -> List[Dict[str, Any]]:
         optimizations = []
+
+        # One snapshot per cycle, so the data fingerprint is computed once
+        market_data = MarketSnapshot.of(market_data)
         
         for strategy in self.strategies.values():
             # Generate parameter optimizations
@@ -128,6 +175,17 @@ class StrategyOptimizer:
         strategy: Strategy,
         market_data: Dict[str, Any]
     ) -> Dict[str, Any]:
+        if self.search is not None:
+            # Scores are cached here; workers only get the backtester settings
+            optimized, _ = self.search.run(
+                strategy.parameters,
+                partial(score_parameter_sets, self.backtester),
+                market_data,
+                cache=self.evaluation_cache,
+                scope=strategy.id
+            )
+            return optimized
+
         optimized = strategy.parameters.copy()
         
         # Optimize each parameter
@@ -140,15 +198,12 @@ class StrategyOptimizer:
                     value * (1 + self.learning_rate)
                 ]
                 
-                # Evaluate each variation
-                scores = [
-                    self._evaluate_parameters(
-                        strategy,
-                        {**optimized, param: var},
-                        market_data
-                    )
-                    for var in variations
-                ]
+                # One batched backtest scores every variation
+                scores = self._evaluate_parameter_sets(
+                    strategy,
+                    [{**optimized, param: var} for var in variations],
+                    market_data
+                )
                 
                 # Select best variation
                 best_idx = np.argmax(scores)
@@ -156,40 +211,41 @@ class StrategyOptimizer:
 
         return optimized
 
-    def _evaluate_parameters(
+    def _evaluate_parameter_sets(
         self,
         strategy: Strategy,
-        parameters: Dict[str, Any],
+        parameter_sets: List[Dict[str, Any]],
         market_data: Dict[str, Any]
-    ) -> float:
-        # Simulate strategy with given parameters
-        simulation_results = self._simulate_strategy(
-            strategy,
-            parameters,
-            market_data
-        )
-        
-        # Calculate score based on multiple metrics
-        score = (
-            simulation_results.get('win_rate', 0) * 0.3 +
-            min(simulation_results.get('profit_factor', 0), 3) / 3 * 0.4 +
-            min(simulation_results.get('sharpe_ratio', 0), 3) / 3 * 0.3
-        )
-        
-        return float(score)
+    ) -> List[float]:
+        snapshot = MarketSnapshot.of(market_data)
+        keys = [
+            self.evaluation_cache.key(strategy.id, parameters, snapshot.fingerprint)
+            for parameters in parameter_sets
+        ]
+        scores = [self.evaluation_cache.get(key) for key in keys]
+        missing = [i for i, score in enumerate(scores) if score is None]
+
+        # One vectorized backtest scores every uncached set
+        if missing:
+            results = self._simulate_parameter_sets(
+                strategy,
+                [parameter_sets[i] for i in missing],
+                snapshot
+            )
+            for i, score in zip(missing, score_results(results).tolist()):
+                scores[i] = score
+                self.evaluation_cache.put(keys[i], score)
+
+        return scores
 
-    def _simulate_strategy(
+    def _simulate_parameter_sets(
         self,
         strategy: Strategy,
-        parameters: Dict[str, Any],
+        parameter_sets: List[Dict[str, Any]],
         market_data: Dict[str, Any]
-    ) -> Dict[str, float]:
-        # Implement strategy simulation logic
-        return {
-            'win_rate': 0.5,
-            'profit_factor': 1.5,
-            'sharpe_ratio': 1.0
-        }
+    ) -> Dict[str, np.ndarray]:
+        snapshot = MarketSnapshot.of(market_data)
+        return self.backtester.run(snapshot.prices, parameter_sets, snapshot.volumes)
 
     def _estimate_improvement(
         self,
@@ -214,45 +270,51 @@ class StrategyOptimizer:
 
     def _evolve_strategies(self) -> List[Dict[str, Any]]:
         evolved = []
-        
-        for strategy in self.strategies.values():
-            if self._should_evolve(strategy):
-                # Create evolved version of strategy
-                evolved_strategy = self._create_evolved_strategy(strategy)
-                
-                evolved.append({
-                    'original_id': strategy.id,
-                    'evolved_id': evolved_strategy.id,
-                    'changes': self._describe_evolution(
-                        strategy,
-                        evolved_strategy
-                    )
-                })
-                
-                # Add evolved strategy to pool
-                self.strategies[evolved_strategy.id] = evolved_strategy
+
+        # Tournament selection among stagnant strategies bounds the number
+        # of offspring per cycle
+        stagnant = [
+            strategy for strategy in self.strategies.values()
+            if self._should_evolve(strategy)
+        ]
+
+        for strategy in self.population.select_parents(stagnant):
+            # Create evolved version of strategy
+            evolved_strategy = self._create_evolved_strategy(strategy)
+            
+            evolved.append({
+                'original_id': strategy.id,
+                'evolved_id': evolved_strategy.id,
+                'changes': self._describe_evolution(
+                    strategy,
+                    evolved_strategy
+                )
+            })
+            
+            # Add evolved strategy to pool
+            self.strategies[evolved_strategy.id] = evolved_strategy
 
         return evolved
 
+    def _retire_strategies(self) -> List[str]:
+        evaluations = {
+            strategy_id: len(history)
+            for strategy_id, history in self.performance_history.items()
+        }
+        retired = self.population.cull(self.strategies, evaluations)
+        for strategy_id in retired:
+            self.performance_history.pop(strategy_id, None)
+        return retired
+
     def _should_evolve(self, strategy: Strategy) -> bool:
         # Check if strategy performance is stagnant
-        recent_performance = [
-            p['performance']
-            for p in self.performance_history[-10:]
-            if p['strategy_id'] == strategy.id
-        ]
-        
-        if len(recent_performance) < 10:
+        history = self.performance_history.get(strategy.id)
+        if history is None or len(history) < self.evolve_window:
             return False
-            
-        # Calculate performance trend
-        performance_values = [
-            np.mean(list(p.values()))
-            for p in recent_performance
-        ]
-        
-        trend = np.polyfit(range(len(performance_values)), performance_values, 1)[0]
-        
+
+        # The slope of the per-cycle mean is the mean of the metric slopes
+        trend = float(np.mean(history.slope()))
+
         return trend < 0.01  # Evolve if improvement is minimal
 
     def _create_evolved_strategy(self, strategy: Strategy) -> Strategy:
@@ -296,20 +358,41 @@ class StrategyOptimizer:
         return changes
 
     def _calculate_performance_metrics(self) -> Dict[str, float]:
-        if not self.performance_history:
+        if not len(self.recent_performance):
             return {}
-            
-        recent_performance = self.performance_history[-100:]
-        
+
+        averages = self.recent_performance.mean()
+        trends = self.recent_performance.slope()
+
         metrics = {}
-        for key in ['win_rate', 'profit_factor', 'sharpe_ratio']:
-            values = [
-                p['performance'].get(key, 0)
-                for p in recent_performance
-            ]
-            metrics[f'avg_{key}'] = float(np.mean(values))
-            metrics[f'{key}_trend'] = float(
-                np.polyfit(range(len(values)), values, 1)[0]
-            )
-            
-        return metrics
\ No newline at end of file
+        for key, average, trend in zip(self.METRICS, averages, trends):
+            metrics[f'avg_{key}'] = float(average)
+            metrics[f'{key}_trend'] = float(trend)
+
+        return metrics
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            'strategies': [asdict(strategy) for strategy in self.strategies.values()],
+            'performance_history': {
+                strategy_id: history.values().tolist()
+                for strategy_id, history in self.performance_history.items()
+            },
+            'recent_performance': self.recent_performance.values().tolist()
+        }
+
+    def restore(self, state: Dict[str, Any]) -> None:
+        self.strategies = {
+            item['id']: Strategy(**item)
+            for item in state.get('strategies', [])
+        }
+        self.performance_history = {}
+        self.recent_performance = TrendWindow(self.metrics_window, len(self.METRICS))
+
+        for strategy_id, rows in state.get('performance_history', {}).items():
+            window = TrendWindow(self.evolve_window, len(self.METRICS))
+            for row in rows:
+                window.append(row)
+            self.performance_history[strategy_id] = window
+        for row in state.get('recent_performance', []):
+            self.recent_performance.append(row)
@@ -2,6 +2,7 @@ import logging
 from typing import Dict, Any, Tuple, Optional
 import numpy as np
 from datetime import datetime, timedelta
+from ..analysis.snapshot import MarketSnapshot
 
 class RiskAnalyzer:
     def __init__(self):
@@ -9,6 +10,8 @@ class RiskAnalyzer:
         
     def analyze_risk(self, asset_data: Dict[str, Any], market_data: Dict[str, Any]) -> Dict[str, Any]:
         try:
+            asset_data = MarketSnapshot.of(asset_data)
+            market_data = MarketSnapshot.of(market_data)
             volatility = self._calculate_volatility(asset_data)
             liquidity = self._assess_liquidity(asset_data)
             market_risk = self._assess_market_risk(market_data)
@@ -37,11 +40,10 @@ class RiskAnalyzer:
             return None
 
     def _calculate_volatility(self, data: Dict[str, Any]) -> float:
-        prices = data.get('price_history', [])
-        if not prices:
+        snapshot = MarketSnapshot.of(data)
+        if not len(snapshot.prices):
             return 0.0
-        returns = np.diff(prices) / prices[:-1]
-        return float(np.std(returns) * np.sqrt(365))
+        return float(snapshot.returns_std() * np.sqrt(365))
 
     def _assess_liquidity(self, data: Dict[str, Any]) -> float:
         volume = data.get('24h_volume', 0)
@@ -58,8 +60,8 @@ class RiskAnalyzer:
         return (abs(sentiment) + abs(trend) + volatility) / 3
 
     def _calculate_correlation(self, asset_data: Dict[str, Any], market_data: Dict[str, Any]) -> float:
-        asset_returns = np.diff(asset_data.get('price_history', []))
-        market_returns = np.diff(market_data.get('price_history', []))
+        asset_returns = MarketSnapshot.of(asset_data).price_changes
+        market_returns = MarketSnapshot.of(market_data).price_changes
         
         if len(asset_returns) == len(market_returns) and len(asset_returns) > 0:
             return float(np.corrcoef(asset_returns, market_returns)[0, 1])
@@ -0,0 +1,88 @@
+import numpy as np
+from ai_trading_bot.analysis.correlation import (
+    RollingCorrelation,
+    correlation_matrix,
+    mean_abs_correlation
+)
+from ai_trading_bot.analysis.risk_analyzer import RiskAnalyzer
+
+def make_returns(assets=6, n=200, seed=4):
+    rng = np.random.default_rng(seed)
+    common = rng.normal(0, 0.01, n)
+    return common + rng.normal(0, 0.01, (assets, n))
+
+def make_assets(returns):
+    prices = 100 * np.cumprod(1 + returns, axis=1)
+    return {f"A{i}": {'price_history': list(row)} for i, row in enumerate(prices)}
+
+def test_correlation_matrix_matches_corrcoef():
+    returns = make_returns()
+    assert np.allclose(correlation_matrix(returns), np.corrcoef(returns))
+
+    expected = np.mean([
+        abs(np.corrcoef(returns[i], returns[j])[0, 1])
+        for i in range(len(returns)) for j in range(i + 1, len(returns))
+    ])
+    assert np.isclose(mean_abs_correlation(correlation_matrix(returns)), expected)
+    assert mean_abs_correlation(correlation_matrix(returns[:1])) == 0.0
+
+def test_rolling_correlation_tracks_window():
+    returns = make_returns().T
+    rolling = RollingCorrelation(returns.shape[1], window=50)
+    rolling.extend(returns[:120])
+    for row in returns[120:]:
+        rolling.update(row)
+
+    assert rolling.count == 50
+    assert np.allclose(rolling.matrix(), np.corrcoef(returns[-50:].T))
+
+def test_rolling_correlation_stays_accurate_on_long_near_constant_streams():
+    rng = np.random.default_rng(4)
+    base = rng.normal(0, 1e-6, 3000)
+    # Tiny moves around a large level, two assets following the first
+    returns = 50.0 + np.column_stack([base, base + rng.normal(0, 1e-6, 3000), -base])
+    rolling = RollingCorrelation(3, window=40)
+    for row in returns:
+        rolling.update(row)
+
+    matrix = rolling.matrix()
+    assert np.isfinite(matrix).all()
+    assert np.abs(matrix).max() <= 1.0
+    assert np.allclose(matrix, np.corrcoef(returns[-40:].T), atol=1e-6)
+
+def test_risk_analyzer_rolling_mode_matches_full_recompute():
+    returns = make_returns(assets=4, n=150)
+    assets = make_assets(returns)
+    analyzer = RiskAnalyzer(correlation_window=60)
+
+    for end in (80, 81, 150):
+        data = {
+            'assets': {
+                name: {'price_history': asset['price_history'][:end]}
+                for name, asset in assets.items()
+            }
+        }
+        expected = mean_abs_correlation(np.corrcoef(returns[:, 1:end][:, -60:]))
+        assert np.isclose(analyzer._calculate_correlation_risk(data), expected)
+
+    assert analyzer.rolling_correlation.count == 60
+
+def test_risk_analyzer_rolling_mode_follows_same_price_slides():
+    returns = make_returns(assets=3, n=100)
+    assets = make_assets(returns)
+    analyzer = RiskAnalyzer(correlation_window=60)
+
+    histories = {name: asset['price_history'] for name, asset in assets.items()}
+    analyzer._calculate_correlation_risk({
+        'assets': {name: {'price_history': prices} for name, prices in histories.items()}
+    })
+    for _ in range(3):
+        # Drop the oldest price and repeat the latest, as a flat tick would
+        histories = {name: prices[1:] + [prices[-1]] for name, prices in histories.items()}
+        risk = analyzer._calculate_correlation_risk({
+            'assets': {name: {'price_history': prices} for name, prices in histories.items()}
+        })
+
+    slid = np.array(list(histories.values()))
+    expected = mean_abs_correlation(np.corrcoef((np.diff(slid) / slid[:, :-1])[:, -60:]))
+    assert np.isclose(risk, expected)
@@ -0,0 +1,150 @@
+import numpy as np
+import pytest
+from ai_trading_bot.analysis.decision import DecisionEngine
+from ai_trading_bot.learning.adaptive_learner import AdaptiveLearner
+
+def make_market(n_assets=200, seed=3):
+    rng = np.random.default_rng(seed)
+    market = {}
+    for i in range(n_assets):
+        length = int(rng.integers(1, 60))
+        drift = rng.normal(0, 0.01)
+        market[f'RUNE{i}'] = {
+            'symbol': f'RUNE{i}',
+            'price_history': list(100 * np.cumprod(1 + drift + rng.normal(0, 0.005, length))),
+            'volume_history': list(rng.uniform(0.1, 1.0, length))
+        }
+    return market
+
+class FixedLearner:
+    # Same adaptations for every asset; records what it was asked about
+    def __init__(self, adaptations, effectiveness=None):
+        self.adaptations = adaptations
+        self.effectiveness = effectiveness or {}
+        self.calls = []
+
+    async def analyze_and_adapt_many(self, market_data, trading_results, manipulation_data):
+        self.calls.append((list(market_data), trading_results, manipulation_data))
+        return {
+            'new_patterns': {asset: [] for asset in market_data},
+            'adaptations': {asset: self.adaptations for asset in market_data},
+            'effectiveness': self.effectiveness
+        }
+
+def test_feature_matrix_matches_per_asset_scoring():
+    engine = DecisionEngine(None)
+    market = make_market()
+    sentiment = {'RUNE1': {'overall': 0.8}, 'RUNE2': {'overall': -0.4}}
+    manipulation = {'RUNE1': {'manipulation_score': 0.9}}
+    patterns = np.linspace(0, 1, len(market))
+
+    assets, features = engine._feature_matrix(market, sentiment, manipulation, patterns)
+
+    assert assets == list(market)
+    for i, asset in enumerate(assets):
+        assert features[i, 0] == pytest.approx(engine._evaluate_market(market[asset]))
+        assert features[i, 1] == pytest.approx(engine._evaluate_sentiment(sentiment.get(asset, {})))
+    assert features[:, 3].tolist() == patterns.tolist()
+    assert features[1, 1:3].tolist() == [0.9, 0.9]
+    assert features[2, 1] == pytest.approx(0.3)
+    assert np.isfinite(features).all()
+
+@pytest.mark.asyncio
+async def test_batch_decisions_follow_weighted_scores():
+    adaptations = [{'pattern_id': 'p1', 'confidence': 0.9, 'type': 'order_pattern'}]
+    engine = DecisionEngine(FixedLearner(adaptations))
+    market = make_market()
+    sentiment = {asset: {'overall': 1.0} for asset in list(market)[:50]}
+
+    decisions = await engine.make_batch_decisions(market, sentiment, {})
+
+    _, features = engine._feature_matrix(market, sentiment, {})
+    weights = np.array([0.3, 0.2, -0.2, 0.3])
+    scores = dict(zip(market, features @ weights))
+
+    expected = [asset for asset, score in scores.items() if score > 0.7 or score < 0.3]
+    assert [d['asset'] for d in decisions] == expected
+    assert expected
+    for decision in decisions:
+        score = scores[decision['asset']]
+        assert decision['confidence'] == pytest.approx(score)
+        assert decision['action'] == ('buy' if score > 0.7 else 'sell')
+        assert decision['adaptations_applied'] == ['p1']
+        assert decision['protection_measures'] == engine._determine_protection_measures(score, adaptations)
+
+@pytest.mark.asyncio
+async def test_batch_decisions_handle_empty_input():
+    assert await DecisionEngine(None).make_batch_decisions({}) == []
+
+@pytest.mark.asyncio
+async def test_batch_decisions_run_the_learner_once_per_cycle():
+    learner = FixedLearner(
+        [{'pattern_id': 'p2', 'confidence': 0.8, 'type': 'order_pattern'}],
+        {'market_score': 3.0, 'learned_patterns': 1.0}
+    )
+    engine = DecisionEngine(learner)
+    engine.last_trading_results = {'trades': [{'success': True, 'strategy': 'market_score'}]}
+    market = make_market(n_assets=5)
+    manipulation = {'RUNE3': {'manipulation_score': 0.4}}
+
+    await engine.make_batch_decisions(market, {}, manipulation)
+
+    assert learner.calls == [(list(market), engine.last_trading_results, manipulation)]
+    assert engine.decision_weights['market_score'] == 0.75
+
+@pytest.mark.asyncio
+async def test_batch_decisions_use_the_engine_thresholds():
+    engine = DecisionEngine(None)
+    engine.buy_threshold = 0.4
+    engine.sell_threshold = 0.15
+    market = make_market()
+    sentiment = {asset: {'overall': 1.0} for asset in list(market)[:50]}
+
+    decisions = await engine.make_batch_decisions(market, sentiment, {})
+
+    _, features = engine._feature_matrix(market, sentiment, {})
+    scores = dict(zip(market, features @ np.array([0.3, 0.2, -0.2, 0.3])))
+    assert {d['action'] for d in decisions} == {'buy', 'sell'}
+    for decision in decisions:
+        score = scores[decision['asset']]
+        assert decision['action'] == ('buy' if score > 0.4 else 'sell')
+        assert score > 0.4 or score < 0.15
+
+def make_asset(symbol, drift, buys, seed):
+    rng = np.random.default_rng(seed)
+    return {
+        'symbol': symbol,
+        'price_history': list(100 * np.cumprod(1 + drift + rng.normal(0, 0.001, 30))),
+        'volume_history': list(np.linspace(1, 2, 30) if drift > 0 else np.linspace(2, 1, 30)),
+        'order_history': [{'side': 'buy'}] * buys + [{'side': 'sell'}] * (12 - buys)
+    }
+
+@pytest.mark.asyncio
+async def test_batch_matches_per_asset_make_decisions():
+    market = {
+        'UP': make_asset('UP', 0.004, 10, seed=1),
+        'DOWN': make_asset('DOWN', -0.004, 1, seed=2)
+    }
+    sentiment = {'UP': {'overall': 0.9}, 'DOWN': {'overall': -0.9}}
+    manipulation = {'UP': {'manipulation_score': 0.1}, 'DOWN': {'manipulation_score': 0.6}}
+
+    scalar_engine = DecisionEngine(AdaptiveLearner())
+    batch_engine = DecisionEngine(AdaptiveLearner())
+
+    # The second pass sees patterns the learner already knows
+    for _ in range(2):
+        scalar = {}
+        for asset in market:
+            scalar[asset] = await scalar_engine.make_decisions(
+                market[asset], sentiment[asset], manipulation[asset]
+            )
+        batch = await batch_engine.make_batch_decisions(market, sentiment, manipulation)
+
+        assert [d['asset'] for d in batch] == [asset for asset in market if scalar[asset]]
+        for decision in batch:
+            (expected,) = scalar[decision['asset']]
+            assert decision['action'] == expected['action']
+            assert decision['confidence'] == pytest.approx(expected['confidence'])
+            assert decision['adaptations_applied'] == expected['adaptations_applied']
+            assert decision['protection_measures'] == expected['protection_measures']
+        assert batch_engine.decision_weights == pytest.approx(scalar_engine.decision_weights)
@@ -0,0 +1,86 @@
+import json
+import pytest
+from datetime import datetime, timedelta
+from ai_trading_bot.analysis.learned_behavior import LearnedBehaviorModule
+
+@pytest.mark.asyncio
+async def test_scores_update_and_default():
+    module = LearnedBehaviorModule()
+    assert await module.get_behavior_score('wallet', 'abc') == 0.5
+
+    await module.update_behavior_score('wallet', 'abc', 1.0)
+    await module.update_behavior_score('wallet', 'abc', 1.0)
+    await module.update_behavior_score('token', 'abc', 0.0)
+
+    assert await module.get_behavior_score('wallet', 'abc') == pytest.approx(0.6)
+    assert await module.get_behavior_score('token', 'abc') == pytest.approx(0.45)
+    assert len(module) == 2
+
+@pytest.mark.asyncio
+async def test_columns_grow_past_initial_capacity():
+    module = LearnedBehaviorModule()
+    count = LearnedBehaviorModule.INITIAL_CAPACITY + 10
+    for i in range(count):
+        await module.update_behavior_score('wallet', str(i), 1.0)
+
+    assert len(module) == count
+    assert await module.get_behavior_score('wallet', str(count - 1)) == pytest.approx(0.55)
+
+@pytest.mark.asyncio
+async def test_decay_and_round_trip():
+    two_days_ago = datetime.now() - timedelta(days=2)
+    module = LearnedBehaviorModule.from_dict({'behavior_scores': [
+        {'behavior_type': 'wallet', 'identifier': 'old', 'score': 0.8, 'last_updated': two_days_ago},
+        {'behavior_type': 'wallet', 'identifier': 'new', 'score': 0.8,
+         'last_updated': datetime.now().isoformat()}
+    ]})
+
+    await module.decay_behavior_scores()
+
+    assert await module.get_behavior_score('wallet', 'old') == pytest.approx(0.8 * 0.99 ** 2, rel=1e-4)
+    assert await module.get_behavior_score('wallet', 'new') == 0.8
+
+    records = module.to_dict()['behavior_scores']
+    assert [record['identifier'] for record in records] == ['old', 'new']
+    assert isinstance(records[0]['last_updated'], datetime)
+
+    restored = LearnedBehaviorModule.from_dict(module.to_dict())
+    assert restored.to_dict() == module.to_dict()
+
+class FakeContext:
+    def __init__(self):
+        self.saved = []
+
+    def upsert_behavior_scores(self, records):
+        self.saved.append(json.loads(json.dumps(records)))
+
+@pytest.mark.asyncio
+async def test_update_many_matches_single_updates():
+    records = [('wallet', 'a', 1.0), ('wallet', 'b', 0.0), ('wallet', 'a', 1.0)]
+    records += [{'behavior_type': 'wallet', 'identifier': 'c', 'outcome': 1.0}] * 12
+
+    single = LearnedBehaviorModule()
+    for record in records:
+        if isinstance(record, dict):
+            record = (record['behavior_type'], record['identifier'], record['outcome'])
+        await single.update_behavior_score(*record)
+
+    context = FakeContext()
+    batch = LearnedBehaviorModule(context)
+    await batch.update_many(records)
+
+    keys = [('wallet', 'a'), ('wallet', 'b'), ('wallet', 'c'), ('wallet', 'missing')]
+    expected = [await single.get_behavior_score(*key) for key in keys]
+    assert list(await batch.get_many(keys)) == pytest.approx(expected)
+    assert expected[2] == 1.0
+
+    # One persistence write for the whole batch, restorable from JSON
+    assert len(context.saved) == 1
+    restored = LearnedBehaviorModule.from_dict({'behavior_scores': context.saved[0]})
+    assert list(await restored.get_many(keys)) == pytest.approx(expected)
+
+    # A later batch writes only the rows it touched
+    await batch.update_many([('wallet', 'b', 1.0), ('wallet', 'b', 1.0)])
+    assert [record['identifier'] for record in context.saved[1]] == ['b']
+    restored = LearnedBehaviorModule.from_dict({'behavior_scores': sum(context.saved, [])})
+    assert restored.to_dict() == batch.to_dict()
@@ -0,0 +1,449 @@
+import asyncio
+import json
+import threading
+import pytest
+from ai_trading_bot.analysis.manipulation_detector import ManipulationDetector
+from ai_trading_bot.analysis.mempool import MempoolTracker
+from ai_trading_bot.analysis.order_flow import FloorSweepDetector, WindowStats
+from ai_trading_bot.analysis.trade_graph import TradeGraph
+
+def trade(seller, buyer, timestamp):
+    return {'seller': seller, 'buyer': buyer, 'timestamp': timestamp}
+
+def test_trade_graph_finds_short_cycles():
+    graph = TradeGraph(window_seconds=60, max_cycle_length=3)
+
+    assert graph.add_trade(trade('A', 'B', 0)) is None
+    assert graph.add_trade(trade('B', 'A', 1)) == ['B', 'A']
+    assert graph.add_trade(trade('C', 'D', 2)) is None
+    assert graph.add_trade(trade('D', 'E', 3)) is None
+    assert graph.add_trade(trade('E', 'C', 4)) == ['E', 'C', 'D']
+    assert graph.add_trade(trade('F', 'F', 5)) == ['F']
+
+    # Four-address cycles are beyond the search depth
+    for seller, buyer in (('G', 'H'), ('H', 'I'), ('I', 'J')):
+        graph.add_trade(trade(seller, buyer, 6))
+    assert graph.add_trade(trade('J', 'G', 7)) is None
+
+def test_trade_graph_expires_old_edges():
+    graph = TradeGraph(window_seconds=60)
+    graph.add_trade(trade('A', 'B', 0))
+
+    assert graph.add_trade(trade('B', 'A', 120)) is None
+    assert len(graph) == 1
+    assert 'A' not in graph.edges
+
+def test_trade_graph_expires_out_of_order_trades():
+    graph = TradeGraph(window_seconds=60)
+    graph.add_trade(trade('A', 'B', 100))
+    # A late trade still inside the window must not hold back expiry
+    graph.add_trade(trade('C', 'D', 50))
+    graph.add_trade(trade('E', 'F', 80))
+
+    graph.add_trade(trade('G', 'H', 125))
+    assert 'C' not in graph.edges and 'E' in graph.edges
+    assert len(graph) == 3
+
+    # One already older than the window is dropped, and closes no cycle
+    assert graph.add_trade(trade('H', 'G', 10)) is None
+    assert 'H' not in graph.edges and len(graph) == 3
+
+    graph.add_trade(trade('X', 'Y', 200))
+    assert set(graph.edges) == {'X'}
+
+def test_wash_trading_only_flags_new_trades():
+    detector = ManipulationDetector(trade_window_seconds=60)
+    trades = [trade('A', 'B', 0), trade('C', 'D', 1), trade('B', 'A', 2)]
+
+    first = detector._detect_wash_trading({'trades': trades})
+    assert first['detected']
+    assert first['cycles'] == [['B', 'A']]
+
+    # Trades that were already seen are not counted again
+    second = detector._detect_wash_trading({'trades': trades + [trade('D', 'E', 3)]})
+    assert not second['detected']
+
+def test_trade_graph_skips_trades_from_overlapping_lists():
+    graph = TradeGraph(window_seconds=60)
+    graph.update([trade('A', 'B', 0), trade('C', 'D', 1)])
+
+    # A new list repeating earlier trades adds only the unseen ones
+    evidence = graph.update([trade('C', 'D', 1), trade('B', 'A', 2)])
+    assert [item['cycle'] for item in evidence] == [['B', 'A']]
+    assert len(graph) == 3
+    assert graph.edges['C'] == {'D': 1}
+    assert graph.add_trade({**trade('E', 'F', 3), 'id': 7}) is None
+    assert graph.add_trade({**trade('F', 'E', 3), 'id': 7}) is None
+    assert len(graph) == 4
+
+def test_trade_graph_keeps_untimed_trades_on_the_data_clock():
+    graph = TradeGraph(window_seconds=60)
+    trades = [
+        trade('A', 'B', '2024-01-01T00:00:00'),
+        trade('Q', 'R', None),
+        trade('B', 'A', '2024-01-01T00:00:05')
+    ]
+
+    evidence = graph.update(trades)
+    assert [item['cycle'] for item in evidence] == [['B', 'A']]
+
+    # Untimed trades seen before any timed one start on the first timestamp
+    graph = TradeGraph(window_seconds=60)
+    graph.add_trade(trade('A', 'B', None))
+    assert graph.add_trade(trade('B', 'A', 1000)) == ['B', 'A']
+    graph.add_trade(trade('X', 'Y', 1100))
+    assert set(graph.edges) == {'X'}
+
+def test_trade_graph_keeps_repeated_untimed_legs():
+    graph = TradeGraph(window_seconds=60)
+    out = {'seller': 'A', 'buyer': 'B', 'volume': 1.0, 'price': 10.0}
+    back = {'seller': 'B', 'buyer': 'A', 'volume': 1.0, 'price': 10.0}
+    trades = [out, back, out, back]
+
+    # Identical wash legs are separate trades
+    evidence = graph.update(trades)
+    assert len(evidence) == 3
+    assert graph.edges['A'] == {'B': 2}
+
+    # A list that slid on by one identical leg adds only that leg
+    trades = trades[1:] + [dict(out)]
+    graph.update(trades)
+    assert graph.edges['A'] == {'B': 3}
+    trades = trades[2:] + [dict(back), dict(back)]
+    graph.update(trades)
+    assert len(graph) == 7
+    assert graph.edges['B'] == {'A': 4}
+
+def test_floor_sweep_streams_order_events():
+    detector = ManipulationDetector()
+    events = [
+        {'type': 'create', 'order': {'id': i, 'volume': 1.0, 'created_at': i}}
+        for i in range(50)
+    ]
+    events += [
+        {'type': 'create', 'order': {'id': 'big', 'volume': 100.0, 'created_at': 50}},
+        {'type': 'cancel', 'order_id': 'big', 'cancelled_at': 80},
+        {'type': 'cancel', 'order_id': 3, 'cancelled_at': 60}
+    ]
+
+    result = detector._detect_floor_sweep({}, {'order_events': events})
+    assert result['detected']
+    assert [order['id'] for order in result['suspicious_orders']] == ['big']
+    assert detector.floor_sweep.stats.count == 51
+
+    # A repeated cancel is not a new event
+    detector._detect_floor_sweep({}, {'order_events': events[-2:-1]})
+    assert len(detector.floor_sweep.recent) == 1
+
+def test_floor_sweep_syncs_order_list():
+    orders = [
+        {'id': i, 'volume': 1.0, 'created_at': '2024-01-01T00:00:00'}
+        for i in range(20)
+    ]
+    detector = ManipulationDetector()
+    assert not detector._detect_floor_sweep({}, {'orders': orders})['detected']
+
+    orders.append({
+        'id': 'big', 'volume': 50.0,
+        'created_at': '2024-01-01T00:01:00',
+        'cancelled_at': '2024-01-01T00:01:30'
+    })
+    assert detector._detect_floor_sweep({}, {'orders': orders})['detected']
+
+def test_order_index_stays_bounded():
+    detector = FloorSweepDetector(window_seconds=100)
+    orders = []
+    for i in range(1000):
+        orders.append({'volume': 1.0, 'created_at': i, 'side': 'buy', 'price': 10.0})
+        if i % 3 == 0:
+            orders[-1]['cancelled_at'] = i + 1
+        elif i % 3 == 1:
+            orders[-1]['filled_at'] = i + 1
+        detector.update(orders)
+
+    # Only open orders from the last 100 seconds are held
+    assert len(detector.index) <= 34
+    assert len(detector.index.closed) <= 68
+    assert set(detector.positions) == set(detector.index.orders)
+    # Volume statistics cover the same window
+    assert detector.stats.count == 100
+    assert detector.stats.mean == pytest.approx(1.0)
+
+    # A rebuilt list with the same (id-less) orders creates nothing new
+    detector.update([dict(order) for order in orders])
+    assert detector.stats.count == 100
+    assert len(detector.stats.values) == 100
+
+def test_flagged_orders_age_out_without_new_cancels():
+    detector = ManipulationDetector()
+    events = [
+        {'type': 'create', 'order': {'id': i, 'volume': 1.0, 'created_at': i}}
+        for i in range(20)
+    ]
+    events += [
+        {'type': 'create', 'order': {'id': 'big', 'volume': 100.0, 'created_at': 20}},
+        {'type': 'cancel', 'order_id': 'big', 'cancelled_at': 30}
+    ]
+    assert detector._detect_floor_sweep({}, {'order_events': events})['detected']
+    assert detector._detect_floor_sweep({}, {'order_events': [], 'timestamp': 3000})['detected']
+
+    # An hour after the cancel, with no cancels since, the flag is gone
+    assert not detector._detect_floor_sweep({}, {'order_events': [], 'timestamp': 3700})['detected']
+
+    # Later creates move the detector's clock too
+    detector.floor_sweep.process_events(events[-2:])
+    detector.floor_sweep.process_events([
+        {'type': 'create', 'order': {'id': 'late', 'volume': 1.0, 'created_at': 8000}}
+    ])
+    assert not detector._detect_floor_sweep({}, {'order_events': []})['detected']
+
+def test_volume_threshold_follows_the_window():
+    detector = FloorSweepDetector(window_seconds=100)
+    for i in range(200):
+        detector.on_create(i, {'volume': 100.0, 'created_at': i})
+    for i in range(200, 400):
+        detector.on_create(i, {'volume': 1.0, 'created_at': i})
+
+    # Only the small orders of the last 100 seconds set the threshold
+    assert detector.stats.mean == pytest.approx(1.0)
+    detector.on_create('big', {'volume': 50.0, 'created_at': 400})
+    assert detector.on_cancel('big', 410)
+
+def test_untimed_orders_follow_the_data_clock():
+    detector = FloorSweepDetector(window_seconds=100)
+    # Replayed history: the first order has no time, nor does the big one
+    detector.process_events([{'type': 'create', 'order': {'id': 0, 'volume': 1.0}}])
+    detector.process_events([
+        {'type': 'create', 'order': {'id': i, 'volume': 1.0, 'created_at': 1000 + i}}
+        for i in range(1, 20)
+    ])
+    detector.process_events([
+        {'type': 'create', 'order': {'id': 'big', 'volume': 100.0}},
+        {'type': 'cancel', 'order_id': 'big', 'cancelled_at': 1030}
+    ])
+
+    assert detector.index.latest == 1030
+    assert detector.index.orders[0]['created_at'] == 1001
+    assert detector.stats.count == 21
+    assert [order['id'] for order in detector.suspicious_orders()] == ['big']
+
+def test_order_windows_expire_out_of_order_events():
+    stats = WindowStats(window_seconds=60)
+    for timestamp, value in [(100, 1.0), (10, 5.0), (101, 1.0)]:
+        stats.add(timestamp, value)
+    stats.advance(150)
+    assert stats.count == 2
+    assert stats.mean == pytest.approx(1.0)
+
+    detector = FloorSweepDetector(window_seconds=60)
+    for order_id, created_at in [('a', 100), ('b', 50), ('c', 115)]:
+        detector.on_create(order_id, {'volume': 1.0, 'created_at': created_at})
+    assert set(detector.index.orders) == {'a', 'c'}
+    assert detector.stats.count == 2
+
+    detector.recent.extend([{'order': 'a', 'cancelled_at': 100}, {'order': 'b', 'cancelled_at': 10}])
+    assert detector.suspicious_orders(150) == ['a']
+
+def test_mempool_tracker_links_replacement_chains():
+    tracker = MempoolTracker(expiry_seconds=600, min_replacements=2)
+    tracker.add_transaction({'txid': 'a', 'inputs': ['f:0', 'f:1'], 'fee': 10, 'timestamp': 0})
+    tracker.add_transaction({'txid': 'b', 'inputs': ['f:1'], 'fee': 15, 'timestamp': 1})
+    chain = tracker.add_transaction({'txid': 'c', 'inputs': [['f', 1]], 'fee': 25, 'timestamp': 2})
+
+    assert chain.root == 'a' and chain.head == 'c'
+    assert chain.replacements == 2 and chain.fee_bump == 15
+    assert set(tracker.transactions) == {'c'}
+    assert ('f', 0) not in tracker.spends
+    assert tracker.suspicious_chains()[0]['tx_id'] == 'c'
+
+    tracker.evict('c')
+    assert not tracker.flagged and not tracker.spends
+
+    tracker.add_transaction({'txid': 'd', 'inputs': ['g:0'], 'timestamp': 3})
+    tracker.add_transaction({'txid': 'e', 'inputs': ['h:0'], 'timestamp': 1000})
+    assert set(tracker.transactions) == {'e'}
+
+def test_mempool_replacement_removes_every_conflict():
+    tracker = MempoolTracker(min_replacements=2)
+    tracker.add_transaction({'txid': 'a', 'inputs': ['f:0'], 'fee': 10, 'timestamp': 0})
+    tracker.add_transaction({'txid': 'b', 'inputs': ['f:0'], 'fee': 12, 'timestamp': 1})
+    tracker.add_transaction({'txid': 'x', 'inputs': ['g:0'], 'fee': 5, 'timestamp': 1})
+    chain = tracker.add_transaction({'txid': 'c', 'inputs': ['g:0', 'f:0'], 'fee': 30, 'timestamp': 2})
+
+    assert set(tracker.transactions) == {'c'}
+    assert tracker.spends == {('g', 0): 'c', ('f', 0): 'c'}
+    assert chain.root == 'a' and chain.replacements == 2
+    assert chain.fee_bump == 2 + 30 - 17
+
+def test_mempool_totals_describe_the_current_chains():
+    tracker = MempoolTracker(expiry_seconds=600)
+    for i in range(4):
+        tracker.add_transaction({'txid': f"a{i}", 'inputs': ['f:0'], 'fee': 10 + i, 'timestamp': i})
+    for i in range(3):
+        tracker.add_transaction({'txid': f"b{i}", 'inputs': ['g:0'], 'fee': 20 + 5 * i, 'timestamp': i})
+    assert (tracker.replacement_count, tracker.total_fee_bump) == (5, 13.0)
+
+    # A confirmed chain drops out of the totals
+    tracker.evict('a3')
+    assert (tracker.replacement_count, tracker.total_fee_bump) == (2, 10.0)
+
+    # A merge keeps only the surviving chain's replacements
+    tracker.add_transaction({'txid': 'x', 'inputs': ['h:0'], 'fee': 1, 'timestamp': 5})
+    tracker.add_transaction({'txid': 'm', 'inputs': ['g:0', 'h:0'], 'fee': 40, 'timestamp': 6})
+    assert tracker.replacement_count == 3
+    assert tracker.total_fee_bump == tracker.transactions['m']['chain'].fee_bump == 10 + 40 - 31
+
+    # Expired chains leave nothing behind
+    tracker.add_transaction({'txid': 'late', 'inputs': ['k:0'], 'timestamp': 1000})
+    assert (tracker.replacement_count, tracker.total_fee_bump, tracker.average_fee_bump) == (0, 0.0, 0.0)
+
+def test_mempool_expires_out_of_order_and_untimed_transactions():
+    tracker = MempoolTracker(expiry_seconds=600)
+    tracker.add_transaction({'txid': 'untimed', 'inputs': ['u:0']})
+    tracker.add_transaction({'txid': 'a', 'inputs': ['f:0'], 'timestamp': 500})
+    tracker.add_transaction({'txid': 'old', 'inputs': ['g:0'], 'timestamp': 10})
+    # Already out of the window when it arrives
+    tracker.add_transaction({'txid': 'stale', 'inputs': ['s:0'], 'timestamp': -200})
+    assert set(tracker.transactions) == {'untimed', 'a', 'old'}
+    assert tracker.transactions['untimed']['chain'].started_at == 500
+
+    tracker.add_transaction({'txid': 'b', 'inputs': ['h:0'], 'timestamp': 700})
+    assert set(tracker.transactions) == {'untimed', 'a', 'b'}
+    assert ('g', 0) not in tracker.spends
+
+    tracker.add_transaction({'txid': 'c', 'inputs': ['k:0']})
+    assert tracker.transactions['c']['chain'].started_at == 700
+
+def test_rbf_detection_from_mempool_events(tmp_path):
+    events = [
+        {'type': 'add', 'tx': {'txid': f"t{i}", 'inputs': ['x:0'], 'fee': i, 'timestamp': i}}
+        for i in range(4)
+    ]
+    path = tmp_path / 'mempool.jsonl'
+    path.write_text('\n'.join(json.dumps(event) for event in events))
+
+    detector = ManipulationDetector()
+    assert detector.mempool.replay(str(path)) == 4
+
+    result = detector._detect_rbf_manipulation({'mempool_events': []})
+    assert result['detected']
+    assert result['suspicious_transactions'] == [{
+        'tx_id': 't3', 'root_tx_id': 't0', 'replacements': 3, 'fee_increase': 3.0
+    }]
+
+@pytest.mark.asyncio
+async def test_detectors_run_with_deadlines_and_timings():
+    detector = ManipulationDetector(deadlines={'wash_trading': 0.05})
+    release = threading.Event()
+
+    def slow_wash_trading(market_data):
+        release.wait(2)
+        return {'detected': True, 'confidence': 1.0}
+
+    detector._detect_wash_trading = slow_wash_trading
+    order_data = {'order_events': [], 'transactions': []}
+
+    result = await detector.detect_manipulation({'trades': []}, order_data)
+    assert result['detections']['wash_trading']['timed_out']
+    assert result['timings']['wash_trading'] == 0.05
+    assert set(result['timings']) == {'floor_sweep', 'wash_trading', 'rbf_manipulation'}
+    assert not result['detections']['floor_sweep']['detected']
+
+    # The stuck detector is skipped rather than started a second time
+    again = await detector.detect_manipulation({'trades': []}, order_data)
+    assert again['detections']['wash_trading']['timed_out']
+    assert again['timings']['wash_trading'] == 0.0
+
+    release.set()
+
+@pytest.mark.asyncio
+async def test_late_detection_is_reported_on_the_next_call():
+    detector = ManipulationDetector(deadlines={'wash_trading': 0.05})
+    release = threading.Event()
+    runs = []
+
+    def wash_trading(market_data):
+        runs.append(len(runs))
+        if len(runs) == 1:
+            # The first run finds a cycle but only after its deadline
+            release.wait(2)
+            return {'detected': True, 'confidence': 0.2, 'suspicious_trades': ['t1'], 'cycles': [['A', 'B']]}
+        return {'detected': False, 'confidence': 0, 'suspicious_trades': [], 'cycles': []}
+
+    detector._detect_wash_trading = wash_trading
+    order_data = {'order_events': [], 'transactions': []}
+
+    first = await detector.detect_manipulation({'trades': []}, order_data)
+    assert first['detections']['wash_trading']['timed_out']
+    release.set()
+    await asyncio.sleep(0.05)
+
+    second = (await detector.detect_manipulation({'trades': []}, order_data))['detections']['wash_trading']
+    assert second['detected'] and second['cycles'] == [['A', 'B']]
+    assert second['suspicious_trades'] == ['t1'] and 'timed_out' not in second
+
+    # Reported once only
+    third = (await detector.detect_manipulation({'trades': []}, order_data))['detections']['wash_trading']
+    assert not third['detected'] and runs == [0, 1, 2]
+    detector.close()
+
+@pytest.mark.asyncio
+async def test_skipped_and_cancelled_runs_keep_their_event_deltas():
+    from concurrent.futures import ThreadPoolExecutor
+
+    executor = ThreadPoolExecutor(max_workers=1)
+    detector = ManipulationDetector(executor=executor, deadline_seconds=0.05)
+    release = threading.Event()
+    seen = {'floor_sweep': [], 'rbf_manipulation': []}
+
+    def slow_floor_sweep(market_data, order_data):
+        seen['floor_sweep'].extend(order_data['order_events'])
+        release.wait(2)
+        return {'detected': False, 'confidence': 0}
+
+    def record_rbf(order_data):
+        seen['rbf_manipulation'].extend(order_data['mempool_events'])
+        return {'detected': False, 'confidence': 0}
+
+    detector._detect_floor_sweep = slow_floor_sweep
+    detector._detect_rbf_manipulation = record_rbf
+    detector._detect_wash_trading = lambda market_data: {'detected': False, 'confidence': 0}
+
+    # The floor sweep blocks the only worker, so the queued RBF run is
+    # cancelled and the second floor sweep call is skipped
+    await detector.detect_manipulation({}, {'order_events': [1], 'mempool_events': ['a']})
+    await detector.detect_manipulation({}, {'order_events': [2], 'mempool_events': ['b']})
+    release.set()
+    await asyncio.sleep(0.05)
+    await detector.detect_manipulation({}, {'order_events': [3], 'mempool_events': ['c']})
+
+    assert seen['floor_sweep'] == [1, 2, 3]
+    assert seen['rbf_manipulation'] == ['a', 'b', 'c']
+    detector.close()
+    executor.shutdown()
+
+def test_close_shuts_down_only_an_owned_pool():
+    from concurrent.futures import ThreadPoolExecutor
+
+    owned = ManipulationDetector()
+    owned.close()
+    with pytest.raises(RuntimeError):
+        owned.executor.submit(print)
+
+    shared = ThreadPoolExecutor(max_workers=1)
+    ManipulationDetector(executor=shared).close()
+    assert shared.submit(lambda: 1).result() == 1
+    shared.shutdown()
+
+def test_detector_closes_its_pool_as_a_context_manager():
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ManipulationDetector() as detector:
+        assert detector.executor.submit(lambda: 1).result() == 1
+    with pytest.raises(RuntimeError):
+        detector.executor.submit(print)
+
+    # Detectors keep state on the instance, which a process pool cannot share
+    with ProcessPoolExecutor(max_workers=1) as processes:
+        with pytest.raises(TypeError):
+            ManipulationDetector(executor=processes)
@@ -0,0 +1,57 @@
+import pytest
+import numpy as np
+from ai_trading_bot.analysis.market_analyzer import MarketAnalyzer
+from ai_trading_bot.analysis.extrema import SlidingExtrema
+
+def brute_force_extrema(prices, window_size, pick):
+    levels = []
+    for i in range(window_size, len(prices) - window_size):
+        if prices[i] == pick(prices[i - window_size:i + window_size + 1]):
+            levels.append(prices[i])
+    return levels[-3:]
+
+def make_prices(n, seed=3):
+    rng = np.random.default_rng(seed)
+    # Rounded so that ties inside a window are exercised
+    return list(np.round(rng.normal(0, 1, n).cumsum(), 0))
+
+@pytest.mark.parametrize('n', [15, 120, 1000])
+def test_sliding_extrema_matches_brute_force(n):
+    prices = make_prices(n)
+    assert SlidingExtrema(10, 'min').update(prices) == brute_force_extrema(prices, 10, min)
+    assert SlidingExtrema(10, 'max').update(prices) == brute_force_extrema(prices, 10, max)
+
+def test_sliding_extrema_processes_appended_tail():
+    prices = make_prices(600)
+    tracker = SlidingExtrema(5, 'min')
+
+    tracker.update(prices[:400])
+    for end in range(401, 601):
+        levels = tracker.update(prices[:end])
+
+    assert tracker.count == 600
+    assert levels == brute_force_extrema(prices, 5, min)
+
+def test_sliding_extrema_follows_a_bounded_list_slid_at_the_same_price():
+    prices = make_prices(300)
+    tracker = SlidingExtrema(5, 'max')
+
+    tracker.update(prices[:200])
+    stream = prices[:200]
+    for price in prices[200:]:
+        # Every new price is followed by a repeat, as in a thin market
+        stream += [price, price]
+        levels = tracker.update(stream[-200:])
+
+    assert levels == brute_force_extrema(stream, 5, max)
+
+@pytest.mark.asyncio
+async def test_support_resistance_uses_configured_window():
+    prices = [float(p) + 100 for p in make_prices(300)]
+    analyzer = MarketAnalyzer(window_size=4)
+
+    result = await analyzer.analyze_market({'symbol': 'RUNE', 'price_history': prices})
+    levels = result['metrics']['support_resistance']
+
+    assert levels['support'] == brute_force_extrema(prices, 4, min)
+    assert levels['resistance'] == brute_force_extrema(prices, 4, max)
@@ -0,0 +1,83 @@
+import pytest
+import numpy as np
+from ai_trading_bot.analysis.ohlcv import OHLCVBuffer
+from ai_trading_bot.analysis.snapshot import MarketSnapshot
+from ai_trading_bot.analysis.history import HistoryCursor
+from ai_trading_bot.analysis.indicators import ema_series
+from ai_trading_bot.analysis.technical_analyzer import TechnicalAnalyzer
+from ai_trading_bot.analysis.market_analyzer import MarketAnalyzer
+
+def make_prices(n, seed=9):
+    rng = np.random.default_rng(seed)
+    return 100 * np.cumprod(1 + rng.normal(0, 0.01, n))
+
+def test_buffer_windows_are_contiguous_views_after_wrap():
+    buffer = OHLCVBuffer(capacity=8)
+    for i in range(20):
+        buffer.append(float(i), volume=float(i) * 10)
+
+    assert len(buffer) == 8
+    assert buffer.total == 20
+    assert list(buffer.closes) == [float(i) for i in range(12, 20)]
+    assert list(buffer.window('volume', 3)) == [170.0, 180.0, 190.0]
+    assert np.shares_memory(buffer.closes, buffer._data)
+    with pytest.raises(ValueError):
+        buffer.closes[0] = 1.0
+
+def test_buffer_extend_matches_appends():
+    appended = OHLCVBuffer(capacity=16)
+    extended = OHLCVBuffer(capacity=16)
+    prices = make_prices(50)
+
+    for price in prices:
+        appended.append(price)
+    extended.extend(prices[:10])
+    extended.extend(prices[10:])
+
+    assert extended.total == appended.total
+    assert np.array_equal(extended.closes, appended.closes)
+
+def test_snapshot_reads_buffer_without_copy():
+    buffer = OHLCVBuffer(capacity=32, symbol='RUNE')
+    buffer.extend(make_prices(40))
+
+    snapshot = MarketSnapshot.of({'symbol': 'RUNE', 'ohlcv': buffer})
+
+    assert snapshot.total == 40
+    assert np.shares_memory(snapshot.prices, buffer._data)
+
+    cursor = HistoryCursor()
+    fresh, continued = snapshot.unread_prices(cursor)
+    assert continued and len(fresh) == 32
+
+    buffer.extend(make_prices(3, seed=1))
+    fresh, continued = MarketSnapshot.of(buffer).unread_prices(cursor)
+    assert continued and list(fresh) == list(buffer.closes[-3:])
+
+    buffer.extend(make_prices(40, seed=2))
+    fresh, continued = MarketSnapshot.of(buffer).unread_prices(cursor)
+    assert not continued and len(fresh) == 32
+
+@pytest.mark.asyncio
+async def test_analyzers_stream_through_a_wrapping_buffer():
+    prices = make_prices(400)
+    buffer = OHLCVBuffer(capacity=64, symbol='RUNE')
+    technical = TechnicalAnalyzer()
+    market = MarketAnalyzer(window_size=5)
+
+    for price in prices:
+        buffer.append(price)
+        result = await technical.analyze(buffer)
+        levels = await market.analyze_market(buffer)
+
+    # EMAs keep the whole stream even though the buffer only holds 64 prices
+    assert result['indicators']['moving_averages']['ema_50'] == pytest.approx(
+        ema_series(prices, 50)[-1]
+    )
+    assert result['indicators']['moving_averages']['sma_50'] == pytest.approx(
+        np.mean(prices[-50:])
+    )
+
+    expected = await MarketAnalyzer(window_size=5).analyze_market({'price_history': list(prices)})
+    assert (levels['metrics']['support_resistance'] ==
+            expected['metrics']['support_resistance'])
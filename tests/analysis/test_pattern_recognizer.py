@@ -0,0 +1,94 @@
+import numpy as np
+from ai_trading_bot.analysis.pattern_recognizer import PatternRecognizer
+from ai_trading_bot.analysis.extrema import PeakTroughIndex
+from ai_trading_bot.analysis.candlesticks import CandlestickScanner, scan_candlesticks
+
+def brute_force_pairs(prices, is_extremum, min_distance=10, tolerance=0.02):
+    pairs = []
+    for i in range(min_distance, len(prices) - min_distance):
+        if is_extremum(prices, i):
+            for j in range(i + min_distance, len(prices)):
+                if is_extremum(prices, j) and abs(prices[i] - prices[j]) < prices[i] * tolerance:
+                    pairs.append((i, j))
+    return pairs
+
+def make_prices(n, seed=11):
+    rng = np.random.default_rng(seed)
+    return list(100 + np.sin(np.arange(n) / 3) * 4 + rng.normal(0, 0.5, n))
+
+def test_peak_trough_index_matches_brute_force():
+    recognizer = PatternRecognizer()
+    prices = make_prices(300)
+    index = PeakTroughIndex(prices)
+
+    assert index.matching_pairs('trough', 10, 0.02) == brute_force_pairs(
+        prices, recognizer._is_local_minimum
+    )
+    assert index.matching_pairs('peak', 10, 0.02) == brute_force_pairs(
+        prices, recognizer._is_local_maximum
+    )
+
+def test_head_and_shoulders_from_index():
+    prices = [1.0] * 30
+    for position, height in ((8, 3.0), (13, 5.0), (18, 3.05)):
+        prices[position] = height
+
+    patterns = PatternRecognizer()._find_head_and_shoulders(prices)
+
+    assert patterns == [{
+        'type': 'head_and_shoulders',
+        'positions': [8, 13, 18],
+        'confidence': 0.8
+    }]
+
+def make_candles(n, seed=5):
+    rng = np.random.default_rng(seed)
+    candles = []
+    for _ in range(n):
+        open_, close = rng.normal(100, 2, 2).round(1)
+        candles.append({
+            'open': float(open_),
+            'close': float(close),
+            'high': float(max(open_, close) + abs(rng.normal(0, 1))),
+            'low': float(min(open_, close) - abs(rng.normal(0, 3)))
+        })
+    return candles
+
+def test_streaming_candlestick_flags_match_full_scan():
+    scanner = CandlestickScanner(5)
+    candles = make_candles(200)
+
+    for end in range(3, 201):
+        flags = scanner.update(candles[:end])
+
+    full = scan_candlesticks(candles)
+    for name, mask in full.items():
+        assert list(flags[name]) == list(mask[-5:])
+
+def test_scanner_follows_a_sliding_list_with_repeated_candles():
+    scanner = CandlestickScanner(5)
+    # Every candle is repeated, as on an illiquid market
+    candles = [candle for candle in make_candles(60) for _ in range(2)]
+
+    for end in range(20, len(candles) + 1):
+        window = candles[end - 20:end]
+        flags = scanner.update(window)
+
+        full = scan_candlesticks(window)
+        for name, mask in full.items():
+            assert list(flags[name]) == list(mask[-5:])
+
+def test_candlestick_patterns_unchanged_for_last_five():
+    candles = make_candles(40)
+    recognizer = PatternRecognizer()
+
+    patterns = recognizer._identify_candlestick_patterns({'candles': candles})
+
+    expected = []
+    for i, candle in enumerate(candles[-5:]):
+        body = abs(candle['open'] - candle['close'])
+        lower_shadow = min(candle['open'], candle['close']) - candle['low']
+        upper_shadow = candle['high'] - max(candle['open'], candle['close'])
+        if (lower_shadow > body * 2) and (upper_shadow < body * 0.5):
+            expected.append(i)
+    assert [p['position'] for p in patterns if p['type'] == 'hammer'] == expected
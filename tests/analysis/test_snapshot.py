@@ -0,0 +1,68 @@
+import pytest
+import numpy as np
+from ai_trading_bot.analysis.ohlcv import OHLCVBuffer
+from ai_trading_bot.analysis.snapshot import MarketSnapshot
+from ai_trading_bot.analysis.market_analyzer import MarketAnalyzer
+from ai_trading_bot.analysis.risk_analyzer import RiskAnalyzer
+
+def make_data(n=80):
+    rng = np.random.default_rng(2)
+    return {
+        'symbol': 'RUNE',
+        'price_history': list(100 * np.cumprod(1 + rng.normal(0, 0.01, n))),
+        'volume_history': list(rng.uniform(1, 10, n))
+    }
+
+def test_snapshot_memoizes_derived_series():
+    snapshot = MarketSnapshot(make_data())
+
+    assert snapshot.returns is snapshot.returns
+    assert snapshot.price_mean(20) == pytest.approx(np.mean(snapshot.prices[-20:]))
+    assert snapshot.returns_std() == pytest.approx(
+        np.std(np.diff(snapshot.prices) / snapshot.prices[:-1])
+    )
+    assert np.allclose(np.exp(snapshot.log_returns) - 1, snapshot.returns)
+
+def test_snapshot_behaves_like_market_data():
+    data = make_data()
+    snapshot = MarketSnapshot.of(data)
+
+    assert MarketSnapshot.of(snapshot) is snapshot
+    assert snapshot['symbol'] == 'RUNE'
+    assert snapshot.get('missing', 1) == 1
+    assert len(MarketSnapshot({'prices': [1.0, 2.0]}).prices) == 2
+
+def test_fingerprint_tracks_history():
+    data = make_data()
+    fingerprint = MarketSnapshot(data).fingerprint
+
+    assert MarketSnapshot(make_data()).fingerprint == fingerprint
+    assert MarketSnapshot({**data, 'price_history': data['price_history'][:-1]}).fingerprint != fingerprint
+    assert MarketSnapshot({**data, 'symbol': 'ORDI'}).fingerprint != fingerprint
+    assert MarketSnapshot({**data, 'data_version': 7}).fingerprint == 'version:7'
+
+def test_sequence_is_read_with_the_prices():
+    buffer = OHLCVBuffer(capacity=5)
+    for price in range(8):
+        buffer.append(float(price))
+    snapshot = MarketSnapshot.of(buffer)
+
+    # Asked before the prices, and unaffected by a later append
+    assert snapshot.sequence == 8
+    buffer.append(8.0)
+    assert snapshot.sequence == 8
+    assert snapshot.total == 8
+    assert MarketSnapshot({'prices': [1.0], 'price_total': '4'}).sequence == 4
+    assert MarketSnapshot({'prices': [1.0, 2.0]}).sequence is None
+
+@pytest.mark.asyncio
+async def test_analyzers_share_one_snapshot():
+    snapshot = MarketSnapshot(make_data())
+
+    market = await MarketAnalyzer().analyze_market(snapshot)
+    risk = await RiskAnalyzer().analyze_risk(snapshot, {})
+
+    assert risk['components']['volatility_risk'] == pytest.approx(
+        min(1.0, market['metrics']['volatility']['average'])
+    )
+    assert ('returns_std', None) in snapshot._stats
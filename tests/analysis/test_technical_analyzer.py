@@ -0,0 +1,172 @@
+import pytest
+import numpy as np
+from ai_trading_bot.analysis.technical_analyzer import TechnicalAnalyzer
+from ai_trading_bot.analysis import indicators
+from ai_trading_bot.analysis.indicators import (
+    SMA, EMA, RSI, BollingerBands, bollinger_series, ema_series, rsi_series
+)
+
+def make_prices(n, seed=7):
+    rng = np.random.default_rng(seed)
+    return list(100 * np.cumprod(1 + rng.normal(0, 0.01, n)))
+
+def test_sma_matches_window_mean():
+    prices = make_prices(60)
+    sma = SMA(20)
+    for price in prices:
+        sma.update(price)
+    assert sma.value == pytest.approx(np.mean(prices[-20:]))
+
+def test_ema_matches_full_recompute():
+    prices = make_prices(80)
+    ema = EMA(20)
+    for price in prices:
+        ema.update(price)
+
+    expected = prices[0]
+    for price in prices[1:]:
+        expected += (price - expected) * 2 / 21
+    assert ema.value == pytest.approx(expected)
+    assert ema.value == pytest.approx(ema_series(prices, 20)[-1])
+
+def test_rsi_and_bollinger_match_full_recompute():
+    prices = make_prices(80)
+    rsi = RSI(14)
+    bands = BollingerBands(20, 2)
+    for price in prices:
+        rsi.update(price)
+        bands.update(price)
+
+    deltas = np.diff(prices)[-14:]
+    expected_rsi = 100 - 100 / (1 + deltas[deltas > 0].sum() / -deltas[deltas < 0].sum())
+    assert rsi.value == pytest.approx(expected_rsi)
+    assert rsi.value == pytest.approx(rsi_series(prices, 14)[-1])
+
+    window = prices[-20:]
+    assert bands.value['middle'] == pytest.approx(np.mean(window))
+    assert bands.value['upper'] == pytest.approx(np.mean(window) + 2 * np.std(window))
+    assert bands.value['lower'] == pytest.approx(np.mean(window) - 2 * np.std(window))
+
+@pytest.mark.asyncio
+async def test_analyze_only_feeds_new_prices():
+    analyzer = TechnicalAnalyzer()
+    prices = make_prices(120)
+
+    await analyzer.analyze({'symbol': 'RUNE', 'price_history': prices[:100]})
+    result = await analyzer.analyze({'symbol': 'RUNE', 'price_history': prices})
+
+    state = analyzer.indicator_states['RUNE']
+    assert state.count == 120
+    assert result['indicators']['moving_averages']['sma_50'] == pytest.approx(
+        np.mean(prices[-50:])
+    )
+    assert 'ma_trend' in result['signals']
+
+@pytest.mark.asyncio
+async def test_analyze_rebuilds_when_history_replaced():
+    analyzer = TechnicalAnalyzer()
+    prices = make_prices(120)
+
+    await analyzer.analyze({'price_history': prices})
+    await analyzer.analyze({'price_history': make_prices(100, seed=8)})
+
+    assert analyzer.indicator_states['default'].count == 100
+
+    # Dropping the oldest prices is a slide, not a replacement
+    await analyzer.analyze({'price_history': make_prices(100, seed=8)[20:]})
+    assert analyzer.indicator_states['default'].count == 100
+
+@pytest.mark.asyncio
+async def test_analyze_follows_a_bounded_list_slid_at_the_same_price():
+    analyzer = TechnicalAnalyzer()
+    prices = make_prices(60)
+    slid = prices[1:] + [prices[-1]]
+
+    await analyzer.analyze({'price_history': prices})
+    result = await analyzer.analyze({'price_history': slid})
+
+    assert analyzer.indicator_states['default'].count == 61
+    assert result['indicators']['moving_averages']['sma_20'] == pytest.approx(np.mean(slid[-20:]))
+    assert result['indicators']['moving_averages']['sma_50'] == pytest.approx(np.mean(slid[-50:]))
+
+@pytest.mark.asyncio
+async def test_analyze_uses_price_total_for_flat_slides():
+    analyzer = TechnicalAnalyzer()
+    prices = make_prices(40) + [100.0] * 20
+
+    await analyzer.analyze({'price_history': prices, 'price_total': 60})
+    result = await analyzer.analyze({'price_history': prices[2:] + [100.0] * 2, 'price_total': 62})
+
+    assert analyzer.indicator_states['default'].count == 62
+    assert result['indicators']['moving_averages']['sma_50'] == pytest.approx(
+        np.mean((prices + [100.0] * 2)[-50:])
+    )
+
+@pytest.mark.asyncio
+async def test_analyze_series_matches_streaming_analyze():
+    prices = make_prices(150)
+    series = TechnicalAnalyzer().analyze_series({'price_history': prices})
+
+    for n in (30, 60, 150):
+        result = await TechnicalAnalyzer().analyze({'price_history': prices[:n]})
+        indicators = result['indicators']
+        assert series['indicators']['rsi'][n - 1] == pytest.approx(indicators['rsi'])
+        for key, value in indicators['macd'].items():
+            assert series['indicators']['macd'][key][n - 1] == pytest.approx(value)
+        for key, value in indicators['moving_averages'].items():
+            assert series['indicators']['moving_averages'][key][n - 1] == pytest.approx(value)
+        for key, value in result['signals'].items():
+            assert series['signals'][key][n - 1] == value
+
+def test_bollinger_keeps_precision_at_high_prices():
+    rng = np.random.default_rng(6)
+    prices = 1e6 + np.cumsum(rng.normal(0, 0.01, 500))
+    bands = BollingerBands(20, 2)
+
+    for i, price in enumerate(prices):
+        value = bands.update(price)
+        if i >= 19:
+            window = prices[i - 19:i + 1]
+            assert value['middle'] == pytest.approx(window.mean(), rel=1e-12)
+            assert (value['upper'] - value['middle']) / 2 == pytest.approx(np.std(window), rel=1e-6)
+
+def test_bollinger_series_keeps_precision_on_a_trend(monkeypatch):
+    rng = np.random.default_rng(7)
+    prices = np.linspace(1, 1e6, 20000) + rng.normal(0, 0.01, 20000)
+    # Small blocks so the block boundaries are exercised too
+    monkeypatch.setattr(indicators, 'BOLLINGER_BLOCK', 333)
+    bands = bollinger_series(np.stack([prices, prices[::-1]]), 20, 2)
+
+    windows = np.lib.stride_tricks.sliding_window_view(prices, 20)
+    assert np.isnan(bands['middle'][:, :19]).all()
+    assert bands['middle'][0, 19:] == pytest.approx(windows.mean(axis=1), rel=1e-12)
+    assert (bands['upper'][0, 19:] - bands['middle'][0, 19:]) / 2 == pytest.approx(np.std(windows, axis=1), rel=1e-6)
+    assert (bands['upper'][1, 19:] - bands['middle'][1, 19:]) / 2 == pytest.approx(np.std(windows[::-1, ::-1], axis=1), rel=1e-6)
+
+def test_ema_series_accepts_period_one():
+    prices = [3.0, 1.0, 4.0, 1.5]
+    ema = EMA(1)
+
+    assert ema_series(prices, 1).tolist() == prices
+    assert [ema.update(price) for price in prices] == prices
+
+def test_analyze_series_warmup_is_nan():
+    series = TechnicalAnalyzer().analyze_series({'price_history': make_prices(30)})
+    assert np.isnan(series['indicators']['moving_averages']['sma_50']).all()
+    assert np.isnan(series['indicators']['bollinger_bands']['middle'][:19]).all()
+    assert not np.isnan(series['indicators']['bollinger_bands']['middle'][19:]).any()
+
+@pytest.mark.asyncio
+async def test_analyze_many_matches_per_symbol_analyze():
+    matrix = np.array([make_prices(80, seed) for seed in range(4)])
+    symbols = ['A', 'B', 'C', 'D']
+
+    batched = await TechnicalAnalyzer().analyze_many(matrix, symbols)
+
+    for symbol, row in zip(symbols, matrix):
+        single = await TechnicalAnalyzer().analyze({'price_history': list(row)})
+        result = batched['symbols'][symbol]
+        assert result['signals'] == single['signals']
+        assert result['indicators']['rsi'] == pytest.approx(single['indicators']['rsi'])
+        for key, value in single['indicators']['bollinger_bands'].items():
+            assert result['indicators']['bollinger_bands'][key] == pytest.approx(value)
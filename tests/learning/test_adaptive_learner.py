@@ -0,0 +1,163 @@
+import numpy as np
+import pytest
+from ai_trading_bot.learning.adaptive_learner import AdaptiveLearner, LearningPattern
+from ai_trading_bot.learning.conditions import ConditionIndex
+from ai_trading_bot.learning.pattern_keys import PatternQuantizer
+from datetime import datetime
+
+def make_pattern(pattern_id, conditions, effectiveness=0.5):
+    return LearningPattern(
+        pattern_id=pattern_id,
+        pattern_type='price_pattern',
+        effectiveness=effectiveness,
+        last_seen=datetime.now(),
+        success_rate=0.0,
+        market_conditions=conditions,
+        outcomes=[]
+    )
+
+def test_condition_index_matches_pairwise_similarity():
+    rng = np.random.default_rng(3)
+    conditions = [
+        {key: float(rng.uniform(0.5, 1.5)) for key in ('volatility', 'trend', 'volume')
+         if rng.random() < 0.8}
+        for _ in range(40)
+    ]
+    conditions[0]['label'] = 'bull'
+
+    index = ConditionIndex(capacity=4)
+    for i, item in enumerate(conditions):
+        index.add(str(i), item)
+    index.remove('3')
+
+    learner = AdaptiveLearner()
+    matrix = index.similarity(conditions)
+    for row, item_id in enumerate(index.ids):
+        for col, other in enumerate(conditions):
+            expected = learner._calculate_condition_similarity(conditions[int(item_id)], other)
+            assert np.isclose(matrix[row, col], expected)
+
+def test_effectiveness_updates_only_relevant_patterns():
+    learner = AdaptiveLearner()
+    learner.patterns = {
+        'calm': make_pattern('calm', {'volatility': 1.0}),
+        'wild': make_pattern('wild', {'volatility': 5.0})
+    }
+    trades = [
+        {'success': True, 'market_conditions': {'volatility': 1.05}},
+        {'success': False, 'market_conditions': {'volatility': 0.98}},
+        {'success': True, 'market_conditions': {}}
+    ]
+
+    learner._update_pattern_effectiveness({'trades': trades})
+
+    assert learner.patterns['calm'].success_rate == 0.5
+    assert learner.patterns['calm'].outcomes == trades[:2]
+    assert learner.patterns['wild'].outcomes == []
+
+def test_adaptations_use_current_conditions():
+    learner = AdaptiveLearner()
+    learner.patterns = {
+        'good': make_pattern('good', {'volatility': 1.0}, effectiveness=0.9),
+        'bad': make_pattern('bad', {'volatility': 1.0}, effectiveness=0.1)
+    }
+
+    adaptations = learner._generate_adaptations({'conditions': {'volatility': 1.02}})
+
+    assert [item['pattern_id'] for item in adaptations] == ['good']
+    assert 'bad' not in learner.patterns
+    assert learner.condition_index.ids == ['good']
+
+@pytest.mark.asyncio
+async def test_batch_adaptations_follow_each_market():
+    learner = AdaptiveLearner()
+    learner.patterns = {
+        'calm': make_pattern('calm', {'volatility': 1.0}, effectiveness=0.9),
+        'wild': make_pattern('wild', {'volatility': 5.0}, effectiveness=0.9),
+        'bad': make_pattern('bad', {'volatility': 1.0}, effectiveness=0.1)
+    }
+    market = {
+        'CALM': {'conditions': {'volatility': 1.02}, 'price_history': [100 + i for i in range(12)]},
+        'WILD': {'conditions': {'volatility': 4.9}},
+        'FLAT': {'conditions': {}}
+    }
+
+    results = await learner.analyze_and_adapt_many(market, {}, {})
+
+    adaptations = results['adaptations']
+    assert [item['pattern_id'] for item in adaptations['CALM']] == ['calm']
+    assert [item['pattern_id'] for item in adaptations['WILD']] == ['wild']
+    assert adaptations['FLAT'] == []
+    assert 'bad' not in learner.patterns
+    assert [item['type'] for item in results['new_patterns']['CALM']] == ['price_pattern']
+    assert results['new_patterns']['WILD'] == []
+
+    single = await AdaptiveLearner().analyze_and_adapt(market['CALM'], {}, {})
+    assert single['new_patterns'] == results['new_patterns']['CALM']
+
+def test_similarity_matrix_follows_same_length_changes():
+    learner = AdaptiveLearner()
+    learner.patterns = {
+        'calm': make_pattern('calm', {'volatility': 1.0}),
+        'wild': make_pattern('wild', {'volatility': 5.0})
+    }
+    assert learner._condition_similarity_matrix([{'volatility': 1.0}])[:, 0] == pytest.approx([1.0, 0.2])
+
+    # A replaced table of the same size
+    learner.patterns = {
+        'calm': make_pattern('calm', {'volatility': 1.0}),
+        'storm': make_pattern('storm', {'volatility': 10.0})
+    }
+    matrix = learner._condition_similarity_matrix([{'volatility': 1.0}])
+    assert learner.condition_index.ids == ['calm', 'storm']
+    assert matrix[:, 0] == pytest.approx([1.0, 0.1])
+
+    # An index row swapped behind the learner's back, same length
+    learner.condition_index.remove('storm')
+    learner.condition_index.add('storm', {'volatility': 1.0})
+    assert learner._condition_similarity_matrix([{'volatility': 1.0}])[:, 0] == pytest.approx([1.0, 0.1])
+
+def test_similar_patterns_share_a_quantized_id():
+    learner = AdaptiveLearner()
+    base = {'type': 'price_pattern', 'direction': 'up', 'volatility': 0.52, 'magnitude': 3.1}
+    nearby = dict(base, volatility=0.53, magnitude=3.15)
+    distant = dict(base, magnitude=30.0)
+
+    assert learner._generate_pattern_id(base) == learner._generate_pattern_id(nearby)
+    assert learner._generate_pattern_id(base) != learner._generate_pattern_id(distant)
+
+def test_quantizer_separates_small_magnitudes():
+    quantizer = PatternQuantizer()
+    values = [1e-5, 1e-3, 0.01, 0.05, 0.1, 0.2, 1.0, 10.0]
+
+    buckets = [quantizer.bucket('volatility', value) for value in values]
+    assert len(set(buckets)) == len(values)
+    assert quantizer.bucket('volatility', 0.0) == quantizer.bucket('volatility', -1e-15)
+    assert quantizer.bucket('trend', -0.01) != quantizer.bucket('trend', 0.01)
+    # Relative width is the same at every scale
+    assert quantizer.bucket('magnitude', 0.0101) == quantizer.bucket('magnitude', 0.0102)
+    assert quantizer.bucket('magnitude', 1010.0) == quantizer.bucket('magnitude', 1020.0)
+
+def test_pattern_table_is_bounded():
+    learner = AdaptiveLearner(max_patterns=3)
+    prices = lambda scale: {'price_history': [100 + scale * i for i in range(12)]}
+
+    for scale in (1, 10, 100):
+        learner._identify_new_patterns(prices(scale), {})
+    ids = list(learner.patterns)
+    learner.patterns[ids[1]].effectiveness = 0.2
+
+    # A repeat sighting refreshes the pattern instead of adding one
+    learner._identify_new_patterns(prices(1), {})
+    assert len(learner.patterns) == 3
+    assert next(reversed(learner.patterns)) == ids[0]
+
+    learner._identify_new_patterns(prices(1000), {})
+    assert len(learner.patterns) == 3
+    assert ids[1] not in learner.patterns
+    assert len(learner.condition_index) == 3
+
+    lru = AdaptiveLearner(max_patterns=2, eviction='lru')
+    for scale in (1, 10, 100):
+        lru._identify_new_patterns(prices(scale), {})
+    assert len(lru.patterns) == 2
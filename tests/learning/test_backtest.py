@@ -0,0 +1,80 @@
+import numpy as np
+import pytest
+from datetime import datetime
+from ai_trading_bot.learning.backtest import VectorizedBacktester, score_results
+from ai_trading_bot.learning.strategy_optimizer import Strategy, StrategyOptimizer
+
+FEE = 0.001
+rng = np.random.default_rng(0)
+PRICES = 100 * np.cumprod(1 + rng.normal(0.0002, 0.01, 600))
+VOLUMES = rng.uniform(1, 10, 600)
+SETS = [
+    {'fast_period': fast, 'slow_period': slow, 'threshold': threshold, 'min_volume_ratio': ratio}
+    for fast in (3, 8) for slow in (10, 21) for threshold in (0, 0.002) for ratio in (0, 0.8)
+]
+
+def reference(params):
+    # Bar-by-bar loop the vectorized engine must agree with
+    fast, slow = params['fast_period'], params['slow_period']
+    pnl, trades, held, current = [], [], 0, 0.0
+    for i in range(len(PRICES) - 1):
+        hold = 0
+        if i + 1 >= max(fast, slow):
+            hold = PRICES[i + 1 - fast:i + 1].mean() > PRICES[i + 1 - slow:i + 1].mean() * (1 + params['threshold'])
+            if params['min_volume_ratio']:
+                hold = hold and VOLUMES[i] >= VOLUMES[i + 1 - slow:i + 1].mean() * params['min_volume_ratio']
+        hold = int(hold)
+        step = hold * (PRICES[i + 1] / PRICES[i] - 1) - FEE * abs(hold - held)
+        pnl.append(step)
+        if hold or held:
+            current += step
+        if held and not hold:
+            trades.append(current)
+            current = 0.0
+        held = hold
+    if held:
+        trades.append(current)
+
+    pnl = np.array(pnl)
+    profits = sum(t for t in trades if t > 0)
+    losses = -sum(t for t in trades if t < 0)
+    return {
+        'win_rate': sum(t > 0 for t in trades) / len(trades) if trades else 0.0,
+        'profit_factor': profits / losses if losses else (np.inf if trades else 0.0),
+        'sharpe_ratio': pnl.mean() / pnl.std() * np.sqrt(365),
+        'total_return': np.prod(1 + pnl) - 1,
+        'trades': len(trades)
+    }
+
+@pytest.mark.parametrize('chunk_elements', [1 << 24, 1000])
+def test_matches_bar_by_bar_reference(chunk_elements):
+    results = VectorizedBacktester(fee=FEE, chunk_elements=chunk_elements).run(PRICES, SETS, VOLUMES)
+
+    for i, params in enumerate(SETS):
+        expected = reference(params)
+        for name, value in expected.items():
+            assert results[name][i] == pytest.approx(value, rel=1e-9, abs=1e-12), (params, name)
+
+def test_simulate_matches_batch_row():
+    backtester = VectorizedBacktester(fee=FEE)
+    batch = backtester.run(PRICES, SETS, VOLUMES)
+
+    single = backtester.simulate(PRICES, SETS[5], VOLUMES)
+    assert single == pytest.approx({name: float(values[5]) for name, values in batch.items()})
+
+def test_short_history_scores_zero():
+    results = VectorizedBacktester().run(PRICES[:1], SETS)
+
+    assert all(not values.any() for values in results.values())
+    assert score_results(results).tolist() == [0.0] * len(SETS)
+
+def test_optimizer_scores_batches_with_backtester():
+    optimizer = StrategyOptimizer()
+    strategy = Strategy('s1', 'crossover', {'fast_period': 5, 'slow_period': 20}, {}, datetime.now())
+    market = {'price_history': list(PRICES), 'volume_history': list(VOLUMES)}
+
+    scores = optimizer._evaluate_parameter_sets(strategy, SETS, market)
+    assert scores == pytest.approx([
+        score_results(optimizer.backtester.simulate(PRICES, params, VOLUMES)) for params in SETS
+    ])
+    assert len(set(scores)) > 1
@@ -0,0 +1,85 @@
+import asyncio
+import hashlib
+import json
+import pickle
+from datetime import datetime
+import pytest
+from ai_trading_bot.learning.adaptive_learner import AdaptiveLearner
+from ai_trading_bot.learning.pattern_recognizer import PatternRecognizer
+from ai_trading_bot.learning.strategy_optimizer import Strategy, StrategyOptimizer
+from ai_trading_bot.learning.checkpoint import MAGIC, VERSION, Checkpointer, load_state, save_state
+
+def make_components():
+    learner = AdaptiveLearner()
+    learner._identify_new_patterns({
+        'price_history': [100 + i for i in range(12)],
+        'conditions': {'volatility': 0.4}
+    }, {})
+    learner.strategy_effectiveness['momentum'] = 0.7
+
+    optimizer = StrategyOptimizer()
+    optimizer.strategies['s1'] = Strategy('s1', 'momentum', {'period': 14}, {}, datetime(2024, 1, 1))
+    optimizer._record_performance('s1', {'win_rate': 0.6})
+
+    recognizer = PatternRecognizer()
+    recognizer._update_pattern_history([], [])
+    return {'learner': learner, 'optimizer': optimizer, 'recognizer': recognizer}
+
+def test_pattern_ids_are_content_addressed():
+    learner = AdaptiveLearner()
+    pattern = {'type': 'price_pattern', 'direction': 'up', 'volatility': 0.5, 'magnitude': 2.0}
+    quantized = learner.quantizer.quantize(pattern)
+    expected = hashlib.blake2b(
+        json.dumps(quantized, sort_keys=True).encode(),
+        digest_size=8
+    ).hexdigest()
+
+    assert learner._generate_pattern_id(pattern) == expected
+
+def test_checkpoint_round_trip(tmp_path):
+    path = str(tmp_path / 'learning.ckpt')
+    original = make_components()
+    Checkpointer(path, original).save()
+
+    restored = {
+        'learner': AdaptiveLearner(),
+        'optimizer': StrategyOptimizer(),
+        'recognizer': PatternRecognizer()
+    }
+    assert Checkpointer(path, restored).restore()
+
+    assert list(restored['learner'].patterns) == list(original['learner'].patterns)
+    assert restored['learner'].strategy_effectiveness['momentum'] == 0.7
+    assert len(restored['learner'].condition_index) == 1
+    assert restored['optimizer'].strategies['s1'].parameters == {'period': 14}
+    assert restored['optimizer']._calculate_performance_metrics()['avg_win_rate'] == 0.6
+    assert restored['recognizer'].pattern_history == original['recognizer'].pattern_history
+
+def test_restore_rejects_foreign_files(tmp_path):
+    path = tmp_path / 'other.bin'
+    path.write_bytes(b'not a checkpoint')
+
+    with pytest.raises(ValueError):
+        load_state(str(path))
+    assert not Checkpointer(str(path), {'learner': AdaptiveLearner()}).restore()
+    assert not Checkpointer(str(tmp_path / 'missing'), {}).restore()
+
+def test_restore_rejects_other_versions(tmp_path):
+    path = tmp_path / 'stale.ckpt'
+    path.write_bytes(MAGIC + (VERSION - 1).to_bytes(2, 'little') + pickle.dumps({'components': {}}))
+
+    with pytest.raises(ValueError, match='version'):
+        load_state(str(path))
+    assert not Checkpointer(str(path), {'optimizer': StrategyOptimizer()}).restore()
+
+@pytest.mark.asyncio
+async def test_background_checkpoints(tmp_path):
+    path = str(tmp_path / 'learning.ckpt')
+    checkpointer = Checkpointer(path, make_components(), interval_seconds=0.01)
+    checkpointer.start()
+    await asyncio.sleep(0.05)
+    await checkpointer.stop()
+
+    assert set(load_state(path)['components']) == {'learner', 'optimizer', 'recognizer'}
+    save_state(path, {'components': {}})
+    assert load_state(path) == {'components': {}}
@@ -0,0 +1,86 @@
+from datetime import datetime
+import numpy as np
+from ai_trading_bot.analysis.snapshot import MarketSnapshot
+from ai_trading_bot.learning.backtest import VectorizedBacktester
+from ai_trading_bot.learning.evaluation_cache import EvaluationCache
+from ai_trading_bot.learning.parameter_search import ParameterSearch
+from ai_trading_bot.learning.strategy_optimizer import Strategy, StrategyOptimizer
+
+rng = np.random.default_rng(2)
+MARKET = {
+    'symbol': 'RUNE',
+    'price_history': list(100 * np.cumprod(1 + rng.normal(0, 0.01, 400))),
+    'volume_history': list(rng.uniform(1, 10, 400))
+}
+
+class CountingOptimizer(StrategyOptimizer):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.simulations = 0
+
+    def _simulate_parameter_sets(self, strategy, parameter_sets, market_data):
+        self.simulations += len(parameter_sets)
+        return super()._simulate_parameter_sets(strategy, parameter_sets, market_data)
+
+def test_lru_eviction_and_counters():
+    cache = EvaluationCache(max_entries=2)
+    keys = [cache.key('s1', {'fast_period': i, 'tags': ['a']}, 'f') for i in range(3)]
+    cache.put(keys[0], 0.1)
+    cache.put(keys[1], 0.2)
+    assert cache.get(keys[0]) == 0.1
+    cache.put(keys[2], 0.3)
+
+    assert cache.get(keys[1]) is None
+    assert cache.key('s1', {'tags': ['a'], 'fast_period': 0}, 'f') == keys[0]
+    assert cache.stats() == {'size': 2, 'hits': 1, 'misses': 1, 'evictions': 1, 'hit_rate': 0.5}
+
+def test_optimizer_skips_repeated_simulations():
+    optimizer = CountingOptimizer()
+    strategy = Strategy('s1', 'crossover', {'fast_period': 5, 'slow_period': 20}, {}, datetime.now())
+
+    first = optimizer._optimize_parameters(strategy, MARKET)
+    simulations = optimizer.simulations
+    # The unchanged variation of each parameter is served from the cache
+    assert simulations < 6
+
+    assert optimizer._optimize_parameters(strategy, MARKET) == first
+    assert optimizer.simulations == simulations
+
+    # New data invalidates every entry
+    changed = {**MARKET, 'price_history': MARKET['price_history'][1:] + [101.0]}
+    optimizer._optimize_parameters(strategy, changed)
+    assert optimizer.simulations > simulations
+
+def test_batch_evaluation_only_runs_uncached_sets():
+    optimizer = StrategyOptimizer()
+    strategy = Strategy('s1', 'crossover', {}, {}, datetime.now())
+    sets = [{'fast_period': f, 'slow_period': 30} for f in (3, 5, 8)]
+
+    scores = optimizer._evaluate_parameter_sets(strategy, sets[:2], MARKET)
+    assert optimizer._evaluate_parameter_sets(strategy, sets, MARKET)[:2] == scores
+    assert optimizer.evaluation_cache.stats()['hits'] == 2
+
+    key = optimizer.evaluation_cache.key('s1', sets[2], MarketSnapshot.of(MARKET).fingerprint)
+    assert optimizer.evaluation_cache.get(key) == StrategyOptimizer()._evaluate_parameter_sets(strategy, sets[2:], MARKET)[0]
+
+def test_pooled_search_fills_the_parent_cache():
+    search = ParameterSearch('halving', n_candidates=20, min_bars=50, seed=1, max_workers=2)
+    optimizer = StrategyOptimizer(search=search)
+    strategy = Strategy('s1', 'crossover', {'fast_period': 5, 'slow_period': 20}, {}, datetime.now())
+
+    first = optimizer._optimize_parameters(strategy, MARKET)
+    stored = len(optimizer.evaluation_cache)
+    assert stored > 0
+
+    # A repeat search is served entirely from the cache: nothing is scored
+    search.close()
+    search.max_workers = None
+    optimizer.backtester = None
+    assert optimizer._optimize_parameters(strategy, MARKET) == first
+    assert len(optimizer.evaluation_cache) == stored
+    assert optimizer.evaluation_cache.stats()['hits'] >= stored
+
+    # Full-history scores are shared with the direct batch evaluation
+    optimizer.backtester = VectorizedBacktester()
+    key = optimizer.evaluation_cache.key('s1', strategy.parameters, MarketSnapshot.of(MARKET).fingerprint)
+    assert optimizer.evaluation_cache.get(key) == optimizer._evaluate_parameter_sets(strategy, [strategy.parameters], MARKET)[0]
@@ -0,0 +1,76 @@
+import numpy as np
+import pytest
+from datetime import datetime
+from ai_trading_bot.learning.parameter_search import ParameterSearch
+from ai_trading_bot.learning.strategy_optimizer import Strategy, StrategyOptimizer
+
+def distance_score(parameter_sets, market_data):
+    # Peaks at period 22, threshold 0.45; also checks the history arrived
+    assert len(market_data['price_history']) == len(market_data['volume_history'])
+    return [
+        -abs(params['period'] - 22) - abs(params['threshold'] - 0.45) * 10
+        for params in parameter_sets
+    ]
+
+MARKET = {
+    'symbol': 'RUNE',
+    'price_history': list(np.linspace(100, 120, 1000)),
+    'volume_history': list(np.ones(1000))
+}
+PARAMS = {'period': 20, 'threshold': 0.5, 'label': 'momentum'}
+
+def test_grid_candidates_keep_types_and_current_first():
+    candidates = ParameterSearch('grid', spread=0.1, grid_levels=3).candidates(PARAMS)
+
+    assert candidates[0] == PARAMS
+    assert all(isinstance(c['period'], int) and c['label'] == 'momentum' for c in candidates)
+    assert {c['period'] for c in candidates} == {18, 20, 22}
+
+@pytest.mark.parametrize('mode', ['grid', 'random', 'halving'])
+def test_search_is_deterministic_and_improves(mode):
+    search = ParameterSearch(mode, n_candidates=40, spread=0.2, grid_levels=5, min_bars=50, seed=7)
+    best, score = search.run(PARAMS, distance_score, MARKET)
+
+    assert (best, score) == search.run(PARAMS, distance_score, MARKET)
+    assert score > distance_score([PARAMS], MARKET)[0]
+
+def test_process_pool_matches_serial():
+    serial = ParameterSearch('random', n_candidates=30, seed=3)
+    pooled = ParameterSearch('random', n_candidates=30, seed=3, max_workers=2)
+
+    assert pooled.run(PARAMS, distance_score, MARKET) == serial.run(PARAMS, distance_score, MARKET)
+    pooled.close()
+
+def test_pool_and_shared_history_persist_until_data_changes():
+    search = ParameterSearch('halving', n_candidates=30, min_bars=50, seed=3, max_workers=2)
+    first = search.run(PARAMS, distance_score, MARKET)
+    pool, shm_name = search._pool, search._shm.name
+
+    assert search.run(PARAMS, distance_score, MARKET) == first
+    assert search._pool is pool and search._shm.name == shm_name
+
+    shorter = {**MARKET, 'price_history': MARKET['price_history'][:500], 'volume_history': MARKET['volume_history'][:500]}
+    assert search.run(PARAMS, distance_score, shorter) == ParameterSearch(
+        'halving', n_candidates=30, min_bars=50, seed=3
+    ).run(PARAMS, distance_score, shorter)
+    assert search._pool is pool and search._shm.name != shm_name
+
+    search.close()
+    assert search._pool is None and search._shm is None
+
+def test_pooled_optimizer_matches_serial():
+    strategy = Strategy('s1', 'crossover', {'fast_period': 5, 'slow_period': 20}, {}, datetime.now())
+    market = {**MARKET, 'price_history': list(100 + 5 * np.sin(np.arange(1000) / 15))}
+    serial = StrategyOptimizer(search=ParameterSearch('random', n_candidates=20, seed=1))
+    pooled = StrategyOptimizer(search=ParameterSearch('random', n_candidates=20, seed=1, max_workers=2))
+
+    assert pooled._optimize_parameters(strategy, market) == serial._optimize_parameters(strategy, market)
+    pooled.close()
+
+def test_optimizer_uses_configured_search():
+    optimizer = StrategyOptimizer(search=ParameterSearch('grid', grid_levels=5))
+    strategy = Strategy('s1', 'momentum', {'period': 20}, {}, datetime.now())
+
+    # The backtester ignores 'period', so every candidate scores the same
+    # and the current parameters win the tie
+    assert optimizer._optimize_parameters(strategy, MARKET) == {'period': 20}
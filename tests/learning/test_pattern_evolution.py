@@ -0,0 +1,78 @@
+import numpy as np
+import pytest
+from ai_trading_bot.learning.pattern_recognizer import PatternRecognizer
+from ai_trading_bot.learning.pattern_evolution import PatternEvolution
+
+def reference_changes(history):
+    # The full rescan the incremental aggregates replace
+    changes = {}
+    for group, field in (('market', 'market_patterns'), ('manipulation', 'manipulation_patterns')):
+        changes[group] = {}
+        for pattern_type in ['price', 'volume', 'order', 'floor_sweep', 'wash_trading', 'rbf']:
+            sequence = [[p for p in entry[field] if p['type'] == pattern_type] for entry in history]
+            if not all(sequence):
+                continue
+            values = []
+            for prev, curr in zip(sequence, sequence[1:]):
+                for key, value in prev[0].items():
+                    if isinstance(value, (int, float)):
+                        values.append((curr[0][key] - value) / value if value != 0 else 0)
+            changes[group][pattern_type] = float(np.mean(values)) if values else 0
+    return changes
+
+def random_patterns(rng):
+    market = [{'type': 'price', 'volatility': rng.uniform(0.1, 1), 'trend': rng.normal(), 'confidence': 1.0}]
+    if rng.random() < 0.9:
+        market.append({'type': 'volume', 'trend': rng.normal(), 'volatility': 0.0, 'confidence': 0.5})
+    manipulation = []
+    if rng.random() < 0.95:
+        manipulation.append({'type': 'rbf', 'frequency': int(rng.integers(1, 9)), 'average_fee_increase': rng.uniform(1, 5), 'confidence': 0.1})
+    return market, manipulation
+
+def test_incremental_changes_match_full_rescan():
+    rng = np.random.default_rng(4)
+    recognizer = PatternRecognizer(history_size=25)
+
+    for _ in range(200):
+        recognizer._update_pattern_history(*random_patterns(rng))
+        expected = reference_changes(list(recognizer.pattern_history))
+        actual = recognizer.evolution.changes()
+        assert actual.keys() == expected.keys()
+        for group in expected:
+            assert actual[group] == pytest.approx(expected[group])
+
+    assert len(recognizer.pattern_history) == 25
+
+def test_restore_rebuilds_aggregates():
+    rng = np.random.default_rng(5)
+    recognizer = PatternRecognizer(history_size=10)
+    for _ in range(30):
+        recognizer._update_pattern_history(*random_patterns(rng))
+
+    restored = PatternRecognizer(history_size=10)
+    restored.restore(recognizer.snapshot())
+
+    assert list(restored.pattern_history) == list(recognizer.pattern_history)
+    evolution = restored._analyze_pattern_evolution()
+    expected = recognizer._analyze_pattern_evolution()
+    assert evolution['trend'] == expected['trend']
+    for group, changes in expected['changes'].items():
+        assert evolution['changes'][group] == pytest.approx(changes)
+
+def test_non_finite_changes_leave_the_window_cleanly():
+    evolution = PatternEvolution(maxlen=4)
+    resums = []
+    original = evolution._resum
+    evolution._resum = lambda: (resums.append(len(evolution)), original())
+
+    values = [1.0, 2.0, float('inf'), float('inf'), 3.0, 4.0, 5.0, 6.0, 7.0]
+    for value in values:
+        evolution.append({'market_patterns': [{'type': 'price', 'trend': value}]})
+
+    # inf -> inf is NaN and 1 -> inf is inf; both have left the window
+    assert evolution.nonfinite == 0
+    expected = np.mean([(b - a) / a for a, b in zip(values[-4:], values[-3:])])
+    assert evolution.changes()['market']['price'] == pytest.approx(expected)
+    # One re-sum per wrap plus one when the last non-finite pair left,
+    # not one per eviction
+    assert len(resums) <= 4
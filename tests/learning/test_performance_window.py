@@ -0,0 +1,44 @@
+from datetime import datetime
+import numpy as np
+import pytest
+from ai_trading_bot.learning.performance_window import TrendWindow
+from ai_trading_bot.learning.strategy_optimizer import Strategy, StrategyOptimizer
+
+def test_mean_and_slope_match_polyfit_across_wraps():
+    rng = np.random.default_rng(1)
+    rows = rng.normal(size=(57, 3)) + np.arange(57)[:, None] * [0.1, -0.2, 0.0]
+    window = TrendWindow(10, 3)
+
+    for i, row in enumerate(rows):
+        window.append(row)
+        recent = rows[max(0, i - 9):i + 1]
+        assert np.allclose(window.values(), recent)
+        assert np.allclose(window.mean(), recent.mean(axis=0))
+        if len(recent) > 1:
+            assert np.allclose(window.slope(), np.polyfit(range(len(recent)), recent, 1)[0])
+
+def test_non_finite_values_leave_the_window_cleanly():
+    window = TrendWindow(3)
+    for value in [1.0, np.inf, 2.0, 3.0, 4.0]:
+        window.append([value])
+
+    assert window.mean() == pytest.approx([3.0])
+    assert window.slope() == pytest.approx([1.0])
+
+def test_should_evolve_with_many_strategies():
+    optimizer = StrategyOptimizer()
+    for i in range(20):
+        optimizer.strategies[f's{i}'] = Strategy(f's{i}', 'momentum', {'period': 14}, {}, datetime.now())
+
+    # s0 improves every cycle, the others stay flat
+    for cycle in range(10):
+        for strategy_id in optimizer.strategies:
+            win_rate = 0.1 * cycle if strategy_id == 's0' else 0.5
+            optimizer._record_performance(strategy_id, {'win_rate': win_rate})
+
+    assert not optimizer._should_evolve(optimizer.strategies['s0'])
+    assert optimizer._should_evolve(optimizer.strategies['s1'])
+    assert all(len(history) == 10 for history in optimizer.performance_history.values())
+    assert len(optimizer.recent_performance) == 100
+    # Last 5 cycles: s0 contributes 0.5..0.9, the other 95 entries 0.5
+    assert optimizer._calculate_performance_metrics()['avg_win_rate'] == pytest.approx(0.51)
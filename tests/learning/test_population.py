@@ -0,0 +1,99 @@
+from datetime import datetime, timedelta
+from ai_trading_bot.learning.population import StrategyPopulation, read_archive
+from ai_trading_bot.learning.strategy_optimizer import ARCHIVE_PATH, Strategy, StrategyOptimizer
+
+START = datetime(2024, 1, 1)
+
+def make_strategy(i, win_rate=None, sharpe=0.0):
+    performance = {} if win_rate is None else {
+        'win_rate': win_rate, 'profit_factor': 1.0, 'sharpe_ratio': sharpe
+    }
+    return Strategy(f's{i}', 'momentum', {'period': 14}, performance, START + timedelta(minutes=i))
+
+def test_cull_retires_dominated_then_least_fit_and_archives(tmp_path):
+    path = str(tmp_path / 'archive' / 'strategies.jsonl')
+    population = StrategyPopulation(max_size=4, elite_count=1, archive_path=path)
+    strategies = {
+        's0': make_strategy(0, 0.9, sharpe=0.1),
+        's1': make_strategy(1, 0.2, sharpe=2.0),
+        's2': make_strategy(2, 0.8, sharpe=0.0),   # dominated by s0
+        's3': make_strategy(3, 0.1, sharpe=1.0),   # dominated by s1
+        's4': make_strategy(4),
+        's5': make_strategy(5)
+    }
+
+    assert population.cull(strategies) == ['s3', 's2']
+    assert list(strategies) == ['s0', 's1', 's4', 's5']
+    assert [record['id'] for record in read_archive(path)] == ['s3', 's2']
+
+    # Unevaluated strategies go last, oldest first; the elite is kept
+    population.max_size = 2
+    assert population.cull(strategies) == ['s1', 's4']
+    assert population.retired_count == 4
+
+def test_select_parents_is_bounded_and_unique():
+    population = StrategyPopulation(max_offspring=3, tournament_size=2, seed=0)
+    candidates = [make_strategy(i, win_rate=i / 10) for i in range(10)]
+
+    parents = population.select_parents(candidates)
+    assert 1 <= len(parents) <= 3
+    assert len({parent.id for parent in parents}) == len(parents)
+    assert population.select_parents([]) == []
+
+def test_optimizer_population_stays_capped(tmp_path):
+    population = StrategyPopulation(
+        max_size=6, elite_count=2, max_offspring=2,
+        archive_path=str(tmp_path / 'archive.jsonl'), seed=1
+    )
+    optimizer = StrategyOptimizer(population=population)
+    for i in range(6):
+        optimizer.strategies[f's{i}'] = make_strategy(i, win_rate=0.5)
+
+    for cycle in range(30):
+        for strategy in optimizer.strategies.values():
+            strategy.performance = {'win_rate': 0.5, 'profit_factor': 1.0, 'sharpe_ratio': 0.0}
+            optimizer._record_performance(strategy.id, strategy.performance)
+        optimizer._evolve_strategies()
+        optimizer._retire_strategies()
+        assert len(optimizer.strategies) <= 6
+
+    assert population.retired_count > 0
+    assert set(optimizer.performance_history) <= set(optimizer.strategies)
+
+def test_evolved_strategy_survives_its_first_cull():
+    population = StrategyPopulation(max_size=4, elite_count=1, max_offspring=1, seed=0)
+    optimizer = StrategyOptimizer(population=population)
+    for i in range(4):
+        optimizer.strategies[f's{i}'] = make_strategy(i, win_rate=0.5)
+        for _ in range(optimizer.evolve_window):
+            optimizer._record_performance(f's{i}', optimizer.strategies[f's{i}'].performance)
+
+    (child,) = [item['evolved_id'] for item in optimizer._evolve_strategies()]
+
+    # The child has no trades yet, so its first performance is all zeros
+    trades = [
+        {'strategy_id': f's{i}', 'profit': profit, 'investment': 100}
+        for i in range(4) for profit in (5, -2, 3)
+    ]
+    optimizer._update_performance({'trades': trades})
+    assert optimizer.strategies[child].performance['win_rate'] == 0.0
+
+    retired = optimizer._retire_strategies()
+    assert len(retired) == 1 and child not in retired
+    assert child in optimizer.strategies
+    assert population.archive_path is None
+
+def test_optimizer_archives_retired_strategies_by_default(tmp_path):
+    assert StrategyOptimizer().population.archive_path == ARCHIVE_PATH
+
+    path = str(tmp_path / 'archive.jsonl')
+    optimizer = StrategyOptimizer(archive_path=path)
+    optimizer.population.max_size = 2
+    optimizer.population.elite_count = 1
+    for i in range(3):
+        optimizer.strategies[f's{i}'] = make_strategy(i, win_rate=0.2 * (i + 1))
+        for _ in range(3):
+            optimizer._record_performance(f's{i}', optimizer.strategies[f's{i}'].performance)
+
+    assert optimizer._retire_strategies() == ['s0']
+    assert [record['id'] for record in read_archive(path)] == ['s0']